@@ -1,6 +1,6 @@
 # Core modules
 from .constants import *
-from .decoder import PacketInfo, DecodedPacket, decode_packet
+from .decoder import PacketInfo, DecodedPacket, decode_packet, decode_flow_key, release_packet
 from .pcap_writer import PcapWriter
 from .rotator import HourlyRotator
 from .capture import CaptureEngine
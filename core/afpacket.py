@@ -0,0 +1,353 @@
+"""
+AF_PACKET TPACKET_V3 RX ring
+- Kernel-mapped ring buffer (PACKET_RX_RING + mmap), no per-packet recv()
+- Block-based walk, batches borrow frame bytes from the ring (no copy)
+- Per-block refcount: a block returns to the kernel once every batch is retired
+- Promiscuous mode via PACKET_ADD_MEMBERSHIP
+- 802.1Q tags stripped by VLAN offload are spliced back in place (as libpcap)
+"""
+
+import mmap
+import select
+import socket
+import struct
+import logging
+from typing import Callable, Optional
+
+from .constants import (
+    DEFAULT_SNAPLEN, DEFAULT_BUFFER_SIZE, DEFAULT_PROMISC,
+    RING_BLOCK_SIZE, RING_RETIRE_TIMEOUT_MS
+)
+
+logger = logging.getLogger(__name__)
+
+# Kernel ABI constants (linux/if_packet.h, linux/if_ether.h)
+SOL_PACKET = 263
+PACKET_ADD_MEMBERSHIP = 1
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+PACKET_RESERVE = 12
+PACKET_MR_PROMISC = 1
+PACKET_OUTGOING = 4
+TPACKET_V3 = 2
+ETH_P_ALL = 0x0003
+ETH_P_8021Q = 0x8100
+
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+TP_STATUS_VLAN_VALID = 0x10
+TP_STATUS_VLAN_TPID_VALID = 0x40
+
+TPACKET_ALIGNMENT = 16
+TPACKET3_HDRLEN = 48            # TPACKET_ALIGN(sizeof(struct tpacket3_hdr))
+SOCKADDR_LL_LEN = 20
+VLAN_TAG_LEN = 4                # Headroom reserved before each frame for the tag
+
+# struct tpacket_req3
+_REQ3 = struct.Struct('IIIIIII')
+# struct tpacket_block_desc: block_status, num_pkts, offset_to_first_pkt
+_BLOCK_HDR = struct.Struct('III')
+_BLOCK_STATUS = struct.Struct('I')
+_BLOCK_HDR_OFFSET = 8
+# struct tpacket3_hdr: next_offset, sec, nsec, snaplen, len, status, mac, net
+_FRAME_HDR = struct.Struct('IIIIIIHH')
+# struct tpacket_hdr_variant1 (hv1, follows tp_net): vlan_tci, vlan_tpid
+_FRAME_VLAN = struct.Struct('IH')
+_FRAME_VLAN_OFFSET = 32
+_VLAN_TAG = struct.Struct('!HH')
+# struct sockaddr_ll (follows tpacket3_hdr): ifindex, pkttype
+_SLL_IFINDEX = struct.Struct('i')
+_SLL_IFINDEX_OFFSET = TPACKET3_HDRLEN + 4
+_SLL_PKTTYPE_OFFSET = TPACKET3_HDRLEN + 10
+# struct packet_mreq
+_MREQ = struct.Struct('iHH8s')
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) & ~(alignment - 1)
+
+
+class PacketRing:
+    """
+    TPACKET_V3 receive ring on an AF_PACKET socket
+
+    The kernel fills fixed-size blocks with variable-length frames and
+    hands a whole block over at once; user space walks the frames in place
+    with fill() and returns the block with release().
+    """
+
+    def __init__(
+        self,
+        interface: str,
+        snaplen: int = DEFAULT_SNAPLEN,
+        promisc: bool = DEFAULT_PROMISC,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        block_size: int = RING_BLOCK_SIZE,
+        retire_timeout_ms: int = RING_RETIRE_TIMEOUT_MS,
+    ):
+        """
+        Args:
+            interface: Interface to bind to ('any' = all interfaces)
+            snaplen: Max bytes exposed per frame
+            promisc: Enable promiscuous mode
+            buffer_size: Total ring size in bytes
+            block_size: Ring block size (multiple of page size)
+            retire_timeout_ms: Hand partially filled blocks over after this long
+        """
+        self.interface = interface
+        self.snaplen = snaplen
+        self.promisc = promisc
+        self.block_size = _align(max(block_size, mmap.PAGESIZE), mmap.PAGESIZE)
+        self.block_nr = max(2, buffer_size // self.block_size)
+        self.retire_timeout_ms = retire_timeout_ms
+
+        self._sock: Optional[socket.socket] = None
+        self._ring: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._poll = None
+        self._refs = [0] * self.block_nr        # Batches still borrowing each block
+        self._retired = [False] * self.block_nr # Walked, waiting for refs to drop
+        self._block_idx = 0
+        self._frames_left = -1      # Frames not yet consumed in current block (-1 = not started)
+        self._frame = 0             # Ring offset of next frame
+        self._lo_ifindex = -1
+
+    def open(self):
+        """Create socket, map the ring and bind to the interface"""
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        try:
+            sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            # Room in front of each frame to put an offloaded VLAN tag back
+            sock.setsockopt(SOL_PACKET, PACKET_RESERVE, VLAN_TAG_LEN)
+
+            frame_size = _align(
+                TPACKET3_HDRLEN + 32 + VLAN_TAG_LEN + self.snaplen, TPACKET_ALIGNMENT
+            )
+            frame_size = min(frame_size, self.block_size)
+            frame_nr = (self.block_size // frame_size) * self.block_nr
+            req = _REQ3.pack(
+                self.block_size,
+                self.block_nr,
+                frame_size,
+                frame_nr,
+                self.retire_timeout_ms,
+                0,      # tp_sizeof_priv
+                0,      # tp_feature_req_word
+            )
+            sock.setsockopt(SOL_PACKET, PACKET_RX_RING, req)
+
+            self._ring = mmap.mmap(
+                sock.fileno(),
+                self.block_size * self.block_nr,
+                mmap.MAP_SHARED,
+                mmap.PROT_READ | mmap.PROT_WRITE,
+            )
+
+            if self.interface != 'any':
+                sock.bind((self.interface, ETH_P_ALL))
+                if self.promisc:
+                    ifindex = socket.if_nametoindex(self.interface)
+                    mreq = _MREQ.pack(ifindex, PACKET_MR_PROMISC, 0, b'')
+                    sock.setsockopt(SOL_PACKET, PACKET_ADD_MEMBERSHIP, mreq)
+
+            try:
+                self._lo_ifindex = socket.if_nametoindex('lo')
+            except OSError:
+                self._lo_ifindex = -1
+        except Exception:
+            if self._ring is not None:
+                self._ring.close()
+                self._ring = None
+            sock.close()
+            raise
+
+        self._sock = sock
+        self._view = memoryview(self._ring)
+        self._poll = select.poll()
+        self._poll.register(sock.fileno(), select.POLLIN | select.POLLERR)
+        self._block_idx = 0
+        self._frames_left = -1
+
+        logger.info(
+            f"PACKET_RX_RING on {self.interface}: "
+            f"{self.block_nr} x {self.block_size} bytes"
+        )
+
+    @property
+    def socket(self) -> Optional[socket.socket]:
+        return self._sock
+
+    def wait(self, timeout_ms: int) -> bool:
+        """Block until the current ring block is ready, return True if it is"""
+        if self._ring is None:
+            return False
+
+        if self._retired[self._block_idx]:
+            # Wrapped around onto a block a consumer still borrows
+            return False
+
+        offset = self._block_idx * self.block_size
+        if _BLOCK_STATUS.unpack_from(self._ring, offset + _BLOCK_HDR_OFFSET)[0] & TP_STATUS_USER:
+            return True
+
+        self._poll.poll(timeout_ms)
+        return bool(
+            _BLOCK_STATUS.unpack_from(self._ring, offset + _BLOCK_HDR_OFFSET)[0] & TP_STATUS_USER
+        )
+
+    def fill(self, batch, next_stt: Callable[[], int]):
+        """
+        Add frames of the current (user-owned) block to batch
+
+        Stops when the batch is full or the block is exhausted and resumes
+        from the same frame on the next call; check block_done before
+        release(). Each kept frame is numbered with next_stt() (e.g. the
+        __next__ of an itertools.count).
+
+        Frame bytes are not copied: an empty batch borrows the ring and takes
+        a reference on the current block, packets are recorded as ring
+        offsets. A batch must not outlive its block's release() unless it
+        keeps its reference; retire() it when done.
+
+        Frames whose 802.1Q tag was stripped by VLAN offload (tp_vlan_tci /
+        TP_STATUS_VLAN_VALID) get it written back in place: the MAC addresses
+        move 4 bytes into the reserved headroom and the tag follows them.
+
+        This is the per-frame hot loop: everything it touches is bound to
+        locals and frames are appended to the batch columns inline.
+        """
+        ring = self._ring
+        if not batch.borrowed:
+            batch.borrow(self, self._view, self._block_idx)
+        if self._frames_left < 0:
+            base = self._block_idx * self.block_size
+            _, num_pkts, offset = _BLOCK_HDR.unpack_from(ring, base + _BLOCK_HDR_OFFSET)
+            self._frames_left = num_pkts
+            self._frame = base + offset
+
+        frames_left = self._frames_left
+        frame = self._frame
+        unpack_frame = _FRAME_HDR.unpack_from
+        unpack_ifindex = _SLL_IFINDEX.unpack_from
+        unpack_vlan = _FRAME_VLAN.unpack_from
+        snaplen = self.snaplen
+        lo_ifindex = self._lo_ifindex
+
+        i = batch.count
+        capacity = batch.capacity
+        b_stt = batch.stt
+        b_ts_sec = batch.ts_sec
+        b_ts_usec = batch.ts_usec
+        b_caplen = batch.caplen
+        b_origlen = batch.origlen
+        b_offsets = batch.offsets
+        nbytes = batch.nbytes
+
+        while frames_left and i < capacity:
+            frames_left -= 1
+            next_offset, sec, nsec, tp_snaplen, tp_len, status, mac, _ = unpack_frame(ring, frame)
+
+            # Loopback delivers every packet twice (out + in); keep one
+            if (ring[frame + _SLL_PKTTYPE_OFFSET] == PACKET_OUTGOING and
+                    unpack_ifindex(ring, frame + _SLL_IFINDEX_OFFSET)[0] == lo_ifindex):
+                frame += next_offset
+                continue
+
+            if status & TP_STATUS_VLAN_VALID or unpack_vlan(ring, frame + _FRAME_VLAN_OFFSET)[0]:
+                mac, tp_snaplen, tp_len = self._insert_vlan_tag(frame, status, mac, tp_snaplen, tp_len)
+
+            caplen = tp_snaplen if tp_snaplen < snaplen else snaplen
+
+            b_stt[i] = next_stt()
+            b_ts_sec[i] = sec
+            b_ts_usec[i] = nsec // 1000
+            b_caplen[i] = caplen
+            b_origlen[i] = tp_len
+            b_offsets[i] = frame + mac
+            nbytes += caplen
+            i += 1
+
+            frame += next_offset
+
+        batch.count = i
+        batch.nbytes = nbytes
+        self._frames_left = frames_left
+        self._frame = frame
+
+    def _insert_vlan_tag(self, frame: int, status: int, mac: int, tp_snaplen: int, tp_len: int):
+        """
+        Splice the offloaded 802.1Q tag back after the MAC addresses of the
+        frame at ring offset frame; returns the new (mac, snaplen, len)
+        """
+        tci, tpid = _FRAME_VLAN.unpack_from(self._ring, frame + _FRAME_VLAN_OFFSET)
+        # Needs the PACKET_RESERVE headroom and both MAC addresses captured
+        if mac - VLAN_TAG_LEN < TPACKET3_HDRLEN + SOCKADDR_LL_LEN or tp_snaplen < 12:
+            return mac, tp_snaplen, tp_len
+        if not status & TP_STATUS_VLAN_TPID_VALID:
+            tpid = ETH_P_8021Q
+
+        ring = self._ring
+        start = frame + mac
+        new_start = start - VLAN_TAG_LEN
+        ring[new_start:new_start + 12] = ring[start:start + 12]
+        _VLAN_TAG.pack_into(ring, new_start + 12, tpid, tci & 0xFFFF)
+        return mac - VLAN_TAG_LEN, tp_snaplen + VLAN_TAG_LEN, tp_len + VLAN_TAG_LEN
+
+    @property
+    def block_done(self) -> bool:
+        """True once fill() has consumed every frame of the current block"""
+        return self._frames_left == 0
+
+    def hold(self, block: int):
+        """Take a reference on block (called by PacketBatch.borrow)"""
+        self._refs[block] += 1
+
+    def unhold(self, block: int):
+        """Drop a reference; hand block back if it was already released"""
+        self._refs[block] -= 1
+        if not self._refs[block] and self._retired[block]:
+            self._give_back(block)
+
+    def release(self):
+        """Done walking the current block: retire it and advance"""
+        idx = self._block_idx
+        if self._refs[idx]:
+            self._retired[idx] = True
+        else:
+            self._give_back(idx)
+        self._block_idx = (idx + 1) % self.block_nr
+        self._frames_left = -1
+
+    def _give_back(self, block: int):
+        self._retired[block] = False
+        if self._ring is not None:
+            _BLOCK_STATUS.pack_into(
+                self._ring, block * self.block_size + _BLOCK_HDR_OFFSET, TP_STATUS_KERNEL
+            )
+
+    def close(self):
+        """Unmap the ring and close the socket"""
+        if self._poll is not None and self._sock is not None:
+            try:
+                self._poll.unregister(self._sock.fileno())
+            except (KeyError, ValueError):
+                pass
+            self._poll = None
+
+        if self._view is not None:
+            try:
+                self._view.release()
+            except BufferError:
+                pass
+            self._view = None
+
+        if self._ring is not None:
+            try:
+                self._ring.close()
+            except BufferError:
+                logger.warning("Ring still referenced, leaving unmap to GC")
+            self._ring = None
+
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,239 @@
+"""
+Packet Batch - fixed-capacity SoA container
+- Parallel typed arrays for per-packet metadata
+- Frame bytes either owned (one contiguous buffer) or borrowed from a ring block
+- Handed between threads as a unit instead of per-packet objects
+- DecodedBatch: flow fields (addresses, ports, protocol) of a batch, same layout
+"""
+
+import struct
+from array import array
+from typing import Iterator, List, Optional, Sequence
+
+from .constants import DEFAULT_BATCH_SIZE, ETHERTYPE_IP, PROTO_TCP, PROTO_UDP
+from .decoder import PacketInfo
+
+_ADDR_PAIR = struct.Struct('!II')
+_PORT_PAIR = struct.Struct('!HH')
+
+
+class PacketBatch:
+    """
+    Batch of captured packets stored column-wise
+
+    Column i of every array describes packet i; its bytes live in
+    buf[offsets[i]:offsets[i] + caplen[i]].
+
+    A batch filled by PacketRing.fill() borrows buf from the mmap'd ring and
+    holds a reference on the ring block; call retire() once every consumer
+    is done so the block can go back to the kernel. detach() makes an owned
+    copy for consumers that outlive the block (the UI queue).
+    """
+
+    __slots__ = (
+        'capacity', 'stt', 'ts_sec', 'ts_usec', 'caplen', 'origlen',
+        'offsets', 'buf', 'nbytes', 'count', '_ring', '_block',
+    )
+
+    def __init__(self, capacity: int = DEFAULT_BATCH_SIZE):
+        self.capacity = capacity
+        self.stt = array('q', bytes(8 * capacity))
+        self.ts_sec = array('I', bytes(4 * capacity))
+        self.ts_usec = array('I', bytes(4 * capacity))
+        self.caplen = array('I', bytes(4 * capacity))
+        self.origlen = array('I', bytes(4 * capacity))
+        self.offsets = array('Q', bytes(8 * capacity))
+        self.buf = bytearray()
+        self.nbytes = 0
+        self.count = 0
+        self._ring = None
+        self._block = -1
+
+    def append(self, stt: int, ts_sec: int, ts_usec: int, caplen: int, origlen: int, data) -> bool:
+        """Append one packet (data is copied), return True when batch is full"""
+        i = self.count
+        self.stt[i] = stt
+        self.ts_sec[i] = ts_sec
+        self.ts_usec[i] = ts_usec
+        self.caplen[i] = caplen
+        self.origlen[i] = origlen
+        self.offsets[i] = len(self.buf)
+        self.buf += data
+        self.nbytes += caplen
+        self.count = i + 1
+        return self.count >= self.capacity
+
+    def borrow(self, ring, view: memoryview, block: int):
+        """Point buf at ring memory and take a reference on block"""
+        self.buf = view
+        self._ring = ring
+        self._block = block
+        ring.hold(block)
+
+    @property
+    def borrowed(self) -> bool:
+        return self._ring is not None
+
+    def retire(self):
+        """Drop the ring block reference (no-op for owned batches)"""
+        ring = self._ring
+        if ring is not None:
+            self._ring = None
+            self.buf = bytearray()
+            ring.unhold(self._block)
+
+    def sample(self, rate: int) -> Sequence[int]:
+        """Rows whose packet number is a multiple of rate (all rows if rate <= 1)"""
+        if rate <= 1:
+            return range(self.count)
+        stt = self.stt
+        mask = rate - 1
+        if not rate & mask:
+            # Power of two: mask test instead of modulo
+            return [i for i in range(self.count) if not stt[i] & mask]
+        return [i for i in range(self.count) if not stt[i] % rate]
+
+    def detach(self, rows: Optional[Sequence[int]] = None) -> 'PacketBatch':
+        """Owned copy of this batch (or of the given rows), frames compacted into one buffer"""
+        if rows is None:
+            rows = range(self.count)
+        n = len(rows)
+        copy = PacketBatch(max(n, 1))
+        stt, ts_sec, ts_usec = self.stt, self.ts_sec, self.ts_usec
+        caplen, origlen, offsets = self.caplen, self.origlen, self.offsets
+        c_stt, c_ts_sec, c_ts_usec = copy.stt, copy.ts_sec, copy.ts_usec
+        c_caplen, c_origlen, c_offsets = copy.caplen, copy.origlen, copy.offsets
+
+        src = memoryview(self.buf)
+        dst = copy.buf
+        try:
+            for j, i in enumerate(rows):
+                c_stt[j] = stt[i]
+                c_ts_sec[j] = ts_sec[i]
+                c_ts_usec[j] = ts_usec[i]
+                c_caplen[j] = caplen[i]
+                c_origlen[j] = origlen[i]
+                c_offsets[j] = len(dst)
+                start = offsets[i]
+                dst += src[start:start + caplen[i]]
+        finally:
+            src.release()
+
+        copy.nbytes = len(dst)
+        copy.count = n
+        return copy
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def data(self, i: int) -> memoryview:
+        """Zero-copy view of packet i bytes"""
+        start = self.offsets[i]
+        return memoryview(self.buf)[start:start + self.caplen[i]]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[PacketInfo]:
+        """Per-packet view for consumers that want PacketInfo objects"""
+        return self.iter_rows(range(self.count))
+
+    def iter_rows(self, rows: Sequence[int]) -> Iterator[PacketInfo]:
+        """PacketInfo (owned bytes) for the given rows only"""
+        buf = memoryview(self.buf)
+        offsets = self.offsets
+        caplen = self.caplen
+        try:
+            for i in rows:
+                start = offsets[i]
+                yield PacketInfo(
+                    stt=self.stt[i],
+                    ts_sec=self.ts_sec[i],
+                    ts_usec=self.ts_usec[i],
+                    caplen=caplen[i],
+                    origlen=self.origlen[i] or caplen[i],
+                    data=bytes(buf[start:start + caplen[i]])
+                )
+        finally:
+            buf.release()
+
+
+class DecodedBatch:
+    """
+    Flow fields of a PacketBatch stored column-wise
+
+    Row i describes packet i of the source batch. Only untagged Ethernet +
+    IPv4 is decoded here: ethertype[i] is ETHERTYPE_IP for those rows and
+    0 for everything else (decode those with decode_packet). Addresses are
+    host-order ints (ipv4_to_str() formats them); ports are 0 unless the
+    transport is a complete TCP/UDP header, as in decode_packet.
+    """
+
+    __slots__ = (
+        'count', 'ethertype', 'proto', 'src_ip', 'dst_ip',
+        'sport', 'dport', 'ts_ns', 'caplen',
+    )
+
+    def __init__(self, capacity: int):
+        self.count = 0
+        self.ethertype = array('H', bytes(2 * capacity))
+        self.proto = array('B', bytes(capacity))
+        self.src_ip = array('I', bytes(4 * capacity))
+        self.dst_ip = array('I', bytes(4 * capacity))
+        self.sport = array('H', bytes(2 * capacity))
+        self.dport = array('H', bytes(2 * capacity))
+        self.ts_ns = array('q', bytes(8 * capacity))
+        self.caplen = array('I', bytes(4 * capacity))
+
+    @classmethod
+    def from_batch(cls, batch: PacketBatch) -> 'DecodedBatch':
+        """Decode the flow fields of every packet in batch"""
+        n = batch.count
+        out = cls(n)
+        out.count = n
+        out.caplen[:] = batch.caplen[:n]
+        ts_sec, ts_usec, ts_ns = batch.ts_sec, batch.ts_usec, out.ts_ns
+        for i in range(n):
+            ts_ns[i] = ts_sec[i] * 1_000_000_000 + ts_usec[i] * 1000
+
+        ethertype, proto = out.ethertype, out.proto
+        src_ip, dst_ip = out.src_ip, out.dst_ip
+        sport, dport = out.sport, out.dport
+        offsets, caplen = batch.offsets, batch.caplen
+        buf = memoryview(batch.buf)
+        try:
+            for i in range(n):
+                start = offsets[i]
+                length = caplen[i]
+                if length < 34 or buf[start + 12] != 0x08 or buf[start + 13] != 0x00:
+                    continue
+                version_ihl = buf[start + 14]
+                ihl = (version_ihl & 0x0F) * 4
+                if version_ihl >> 4 != 4 or length < 14 + ihl:
+                    continue
+
+                ethertype[i] = ETHERTYPE_IP
+                p = proto[i] = buf[start + 23]
+                src_ip[i], dst_ip[i] = _ADDR_PAIR.unpack_from(buf, start + 26)
+                l4 = 14 + ihl
+                if (p == PROTO_TCP and length >= l4 + 20) or \
+                        (p == PROTO_UDP and length >= l4 + 8):
+                    sport[i], dport[i] = _PORT_PAIR.unpack_from(buf, start + l4)
+        finally:
+            buf.release()
+        return out
+
+    def select(self, proto: Optional[int] = None, port: Optional[int] = None) -> List[int]:
+        """Rows of IPv4 packets matching proto and (source or destination) port"""
+        ethertype, protos = self.ethertype, self.proto
+        sport, dport = self.sport, self.dport
+        return [
+            i for i in range(self.count)
+            if ethertype[i] == ETHERTYPE_IP
+            and (proto is None or protos[i] == proto)
+            and (port is None or sport[i] == port or dport[i] == port)
+        ]
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,201 @@
+"""
+Classic BPF filters for AF_PACKET sockets
+- Expressions compiled once with libpcap (ctypes, pcap_compile_nopcap)
+- "[tcp|udp] port N" built directly as a pre-baked program, no libpcap needed
+- Programs attached/replaced with SO_ATTACH_FILTER, removed with SO_DETACH_FILTER
+"""
+
+import ctypes
+import ctypes.util
+import socket
+import re
+import logging
+from typing import List, Optional, Tuple
+
+from .constants import DEFAULT_SNAPLEN, PCAP_LINKTYPE_ETHERNET
+
+logger = logging.getLogger(__name__)
+
+# asm-generic/socket.h
+SO_ATTACH_FILTER = 26
+SO_DETACH_FILTER = 27
+
+BpfProgram = List[Tuple[int, int, int, int]]
+
+# Classic BPF opcodes (linux/filter.h)
+BPF_LDH_ABS = 0x28      # A = half[k]
+BPF_LDB_ABS = 0x30      # A = byte[k]
+BPF_LDH_IND = 0x48      # A = half[X + k]
+BPF_LDX_MSH = 0xb1      # X = 4 * (byte[k] & 0xf)
+BPF_JEQ_K = 0x15
+BPF_JSET_K = 0x45
+BPF_RET_K = 0x06
+
+_PORT_FILTER_RE = re.compile(r'^\s*(?:(tcp|udp)\s+)?port\s+(\d{1,5})\s*$')
+# Protocols tcpdump tests for a bare "port N": TCP, UDP, SCTP
+_PORT_PROTOS = {'tcp': (6,), 'udp': (17,), None: (6, 17, 132)}
+
+
+class _BpfInsn(ctypes.Structure):
+    _fields_ = [
+        ('code', ctypes.c_ushort),
+        ('jt', ctypes.c_ubyte),
+        ('jf', ctypes.c_ubyte),
+        ('k', ctypes.c_uint32),
+    ]
+
+
+class _BpfProgram(ctypes.Structure):
+    # struct bpf_program (libpcap) and struct sock_fprog (kernel) share this layout
+    _fields_ = [
+        ('bf_len', ctypes.c_uint),
+        ('bf_insns', ctypes.POINTER(_BpfInsn)),
+    ]
+
+
+_libpcap = None
+
+
+def _load_libpcap():
+    """Load libpcap once (raises ImportError if missing)"""
+    global _libpcap
+    if _libpcap is not None:
+        return _libpcap
+
+    names = [ctypes.util.find_library('pcap'), 'libpcap.so.1', 'libpcap.so.0.8', 'libpcap.so']
+    for name in names:
+        if not name:
+            continue
+        try:
+            lib = ctypes.CDLL(name)
+        except OSError:
+            continue
+
+        lib.pcap_compile_nopcap.argtypes = [
+            ctypes.c_int, ctypes.c_int, ctypes.POINTER(_BpfProgram),
+            ctypes.c_char_p, ctypes.c_int, ctypes.c_uint32,
+        ]
+        lib.pcap_compile_nopcap.restype = ctypes.c_int
+        lib.pcap_freecode.argtypes = [ctypes.POINTER(_BpfProgram)]
+        lib.pcap_freecode.restype = None
+        _libpcap = lib
+        return lib
+
+    raise ImportError("libpcap is required for BPF filters. Install with: apt install libpcap0.8")
+
+
+def _assemble(insns: list) -> BpfProgram:
+    """
+    Resolve labels: insns holds (code, jt, jf, k) tuples where jt/jf may be
+    label names, and bare strings that mark the position of a label
+    """
+    labels = {}
+    body = []
+    for insn in insns:
+        if isinstance(insn, str):
+            labels[insn] = len(body)
+        else:
+            body.append(insn)
+
+    program = []
+    for pc, (code, jt, jf, k) in enumerate(body):
+        if isinstance(jt, str):
+            jt = labels[jt] - pc - 1
+        if isinstance(jf, str):
+            jf = labels[jf] - pc - 1
+        program.append((code, jt, jf, k))
+    return program
+
+
+def port_filter(expression: str, snaplen: int = DEFAULT_SNAPLEN) -> Optional[BpfProgram]:
+    """
+    Pre-baked program for "[tcp|udp] port N" on Ethernet, None for anything else
+    Same checks as libpcap's output: IPv6 (no extension headers) and
+    unfragmented IPv4 with variable IHL, source or destination port
+    """
+    match = _PORT_FILTER_RE.match(expression.lower())
+    if not match:
+        return None
+    port = int(match.group(2))
+    if port > 0xffff:
+        return None
+    protos = _PORT_PROTOS[match.group(1)]
+
+    insns = [
+        (BPF_LDH_ABS, 0, 0, 12),                    # ethertype
+        (BPF_JEQ_K, 'v6', 'chk4', 0x86dd),
+        'v6',
+        (BPF_LDB_ABS, 0, 0, 20),                    # ip6 next header
+    ]
+    for i, proto in enumerate(protos):
+        last = i == len(protos) - 1
+        insns.append((BPF_JEQ_K, 'v6ports', 'drop' if last else 0, proto))
+    insns += [
+        'v6ports',
+        (BPF_LDH_ABS, 0, 0, 54),                    # sport
+        (BPF_JEQ_K, 'accept', 0, port),
+        (BPF_LDH_ABS, 0, 0, 56),                    # dport
+        (BPF_JEQ_K, 'accept', 'drop', port),
+        'chk4',
+        (BPF_JEQ_K, 0, 'drop', 0x0800),
+        (BPF_LDB_ABS, 0, 0, 23),                    # ip protocol
+    ]
+    for i, proto in enumerate(protos):
+        last = i == len(protos) - 1
+        insns.append((BPF_JEQ_K, 'v4frag', 'drop' if last else 0, proto))
+    insns += [
+        'v4frag',
+        (BPF_LDH_ABS, 0, 0, 20),                    # flags + fragment offset
+        (BPF_JSET_K, 'drop', 0, 0x1fff),
+        (BPF_LDX_MSH, 0, 0, 14),                    # X = IP header length
+        (BPF_LDH_IND, 0, 0, 14),                    # sport
+        (BPF_JEQ_K, 'accept', 0, port),
+        (BPF_LDH_IND, 0, 0, 16),                    # dport
+        (BPF_JEQ_K, 'accept', 'drop', port),
+        'accept',
+        (BPF_RET_K, 0, 0, snaplen),
+        'drop',
+        (BPF_RET_K, 0, 0, 0),
+    ]
+    return _assemble(insns)
+
+
+def compile_filter(
+    expression: str,
+    snaplen: int = DEFAULT_SNAPLEN,
+    linktype: int = PCAP_LINKTYPE_ETHERNET,
+) -> BpfProgram:
+    """Compile a tcpdump-style expression to (code, jt, jf, k) instructions"""
+    if linktype == PCAP_LINKTYPE_ETHERNET:
+        program = port_filter(expression, snaplen)
+        if program is not None:
+            return program
+
+    lib = _load_libpcap()
+    prog = _BpfProgram()
+    if lib.pcap_compile_nopcap(snaplen, linktype, ctypes.byref(prog),
+                               expression.encode(), 1, 0xffffffff) < 0:
+        raise ValueError(f"Invalid BPF filter: {expression!r}")
+
+    try:
+        return [
+            (insn.code, insn.jt, insn.jf, insn.k)
+            for insn in prog.bf_insns[:prog.bf_len]
+        ]
+    finally:
+        lib.pcap_freecode(ctypes.byref(prog))
+
+
+def attach_filter(sock: socket.socket, program: BpfProgram):
+    """Attach program to sock; replaces any filter already attached atomically"""
+    insns = (_BpfInsn * len(program))(*program)
+    fprog = _BpfProgram(len(program), insns)
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, bytes(fprog))
+
+
+def detach_filter(sock: socket.socket):
+    """Remove the socket filter (no-op if none is attached)"""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_DETACH_FILTER, 0)
+    except OSError:
+        pass
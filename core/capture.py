@@ -1,91 +1,137 @@
 """
-Capture Engine using Scapy AsyncSniffer
-- libpcap backend for performance
+Capture Engine using AF_PACKET TPACKET_V3 ring
+- Kernel-mapped ring, frames walked in place
 - Statistics tracking
 - Pause/Resume support
 - Thread-safe packet queue
 """
 
+import os
+import fcntl
+import itertools
+import socket
+import struct
 import time
 import threading
 import queue
 import logging
-from dataclasses import dataclass, field
-from typing import Callable, Optional
+from array import array
+from typing import Callable, Iterator, List, Optional, Set
 from pathlib import Path
 
-from .decoder import PacketInfo, decode_packet_scapy
+from .afpacket import PacketRing
+from .batch import PacketBatch
+from .spsc import SPSCRing
+from .netlink import LinkStats
+from .bpf import BpfProgram, compile_filter, attach_filter, detach_filter
+from .decoder import PacketInfo
 from .rotator import HourlyRotator
 from .constants import (
     DEFAULT_SNAPLEN, DEFAULT_BUFFER_SIZE, DEFAULT_PROMISC,
-    DEFAULT_QUEUE_SIZE, STATS_UPDATE_INTERVAL
+    DEFAULT_QUEUE_SIZE, DEFAULT_BATCH_SIZE, STATS_UPDATE_INTERVAL,
+    RING_RETIRE_TIMEOUT_MS, CPU_PROFILES, DEFAULT_CPU_PROFILE, INTERFACE_CACHE_TTL
 )
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# CaptureStats field slots in its counter array
+(_PACKETS, _BYTES, _DROPPED, _QUEUE_DROPPED, _START_TIME, _LAST_UPDATE,
+ _PPS, _BPS, _PREV_PACKETS, _PREV_BYTES, _PREV_TIME,
+ _INITIAL_KERNEL_DROPS, _CURRENT_KERNEL_DROPS, _NUM_FIELDS) = range(14)
+
+
+def _stat_field(index: int, doc: str) -> property:
+    """Attribute shim over one slot of CaptureStats._v"""
+    def fget(self) -> int:
+        return self._v[index]
+    
+    def fset(self, value: int):
+        self._v[index] = value
+    
+    return property(fget, fset, doc=doc)
+
+
 class CaptureStats:
-    """Capture statistics"""
-    packets: int = 0
-    bytes: int = 0
-    dropped: int = 0           # Drops since capture started
-    queue_dropped: int = 0
-    start_time: float = 0.0
-    last_update: float = 0.0
-    
-    # Rate calculations
-    pps: float = 0.0          # Packets per second
-    bps: float = 0.0          # Bytes per second
-    
-    # Previous values for rate calc
-    _prev_packets: int = 0
-    _prev_bytes: int = 0
-    _prev_time: float = 0.0
-    
-    # Baseline for kernel drops (set at capture start)
-    _initial_kernel_drops: int = 0
-    _current_kernel_drops: int = 0
+    """
+    Capture statistics in one contiguous int64 array
+    Fields are properties over fixed slots; times are time.monotonic_ns()
+    """
+    
+    __slots__ = ('_v',)
+    
+    dropped = _stat_field(_DROPPED, "Drops since capture started")
+    queue_dropped = _stat_field(_QUEUE_DROPPED, "Packets the UI queue had no room for")
+    start_time = _stat_field(_START_TIME, "Capture start (ns)")
+    last_update = _stat_field(_LAST_UPDATE, "Last rate update (ns)")
+    pps = _stat_field(_PPS, "Packets per second")
+    bps = _stat_field(_BPS, "Bytes per second")
+    _prev_packets = _stat_field(_PREV_PACKETS, "Packets at last rate update")
+    _prev_bytes = _stat_field(_PREV_BYTES, "Bytes at last rate update")
+    _prev_time = _stat_field(_PREV_TIME, "Time of last rate update (ns)")
+    _initial_kernel_drops = _stat_field(_INITIAL_KERNEL_DROPS, "Kernel drop baseline (-1 = not read yet)")
+    _current_kernel_drops = _stat_field(_CURRENT_KERNEL_DROPS, "Latest kernel drop counter")
+    
+    def __init__(self):
+        self._v = array('q', bytes(8 * _NUM_FIELDS))
+    
+    @property
+    def packets(self) -> int:
+        return self._v[_PACKETS]
+    
+    @property
+    def bytes(self) -> int:
+        return self._v[_BYTES]
+    
+    def add(self, packets: int, nbytes: int):
+        """
+        Count packets/bytes (single writer: the capture thread)
+        Both slots are stored by one slice assignment, so a reader on another
+        thread never sees packets from one batch and bytes from the next
+        """
+        v = self._v
+        v[_PACKETS:_BYTES + 1] = array('q', (v[_PACKETS] + packets, v[_BYTES] + nbytes))
+    
+    def snapshot(self) -> tuple:
+        """Consistent (packets, bytes) pair"""
+        return tuple(self._v[_PACKETS:_BYTES + 1])
     
     def update_rates(self):
         """Update PPS and BPS rates"""
-        now = time.time()
-        elapsed = now - self._prev_time
+        v = self._v
+        now = time.monotonic_ns()
+        elapsed = now - v[_PREV_TIME]
         
         if elapsed > 0:
-            self.pps = (self.packets - self._prev_packets) / elapsed
-            self.bps = (self.bytes - self._prev_bytes) / elapsed
+            packets, nbytes = self.snapshot()
+            v[_PPS] = (packets - v[_PREV_PACKETS]) * 1_000_000_000 // elapsed
+            v[_BPS] = (nbytes - v[_PREV_BYTES]) * 1_000_000_000 // elapsed
             
-            self._prev_packets = self.packets
-            self._prev_bytes = self.bytes
-            self._prev_time = now
+            v[_PREV_PACKETS] = packets
+            v[_PREV_BYTES] = nbytes
+            v[_PREV_TIME] = now
         
-        self.last_update = now
+        v[_LAST_UPDATE] = now
         
         # Update dropped = kernel drops since start + queue drops
-        self.dropped = max(0, self._current_kernel_drops - self._initial_kernel_drops)
+        if v[_INITIAL_KERNEL_DROPS] >= 0:
+            v[_DROPPED] = max(0, v[_CURRENT_KERNEL_DROPS] - v[_INITIAL_KERNEL_DROPS])
     
     def reset(self):
         """Reset all stats"""
-        self.packets = 0
-        self.bytes = 0
-        self.dropped = 0
-        self.queue_dropped = 0
-        self.start_time = time.time()
-        self.last_update = self.start_time
-        self.pps = 0.0
-        self.bps = 0.0
-        self._prev_packets = 0
-        self._prev_bytes = 0
-        self._prev_time = self.start_time
+        v = self._v
+        v[:] = array('q', bytes(8 * _NUM_FIELDS))
+        now = time.monotonic_ns()
+        v[_START_TIME] = now
+        v[_LAST_UPDATE] = now
+        v[_PREV_TIME] = now
         # Will be set by _update_drop_stats on first call
-        self._initial_kernel_drops = -1  # -1 = not set yet
-        self._current_kernel_drops = 0
+        v[_INITIAL_KERNEL_DROPS] = -1
 
 
 class CaptureEngine:
     """
-    Packet capture engine using Scapy
+    Packet capture engine on an AF_PACKET RX ring
     Manages capture lifecycle, stats, and packet routing
     """
     
@@ -99,6 +145,12 @@ class CaptureEngine:
         queue_size: int = DEFAULT_QUEUE_SIZE,
         packet_callback: Optional[Callable[[PacketInfo], None]] = None,
         rotator: Optional[HourlyRotator] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cpu_profile: str = DEFAULT_CPU_PROFILE,
+        cpu_affinity: Optional[List[int]] = None,
+        nic_numa_node: Optional[int] = None,
+        ui_sample_rate: int = 1,
+        ui_queue: bool = True,
     ):
         """
         Args:
@@ -107,153 +159,334 @@ class CaptureEngine:
             snaplen: Max bytes to capture per packet
             promisc: Enable promiscuous mode
             buffer_size: Kernel buffer size
-            queue_size: Packet queue size for UI
+            queue_size: Packet queue size for UI (in packets)
             packet_callback: Callback for each packet (for UI)
             rotator: HourlyRotator for file writing
+            batch_size: Packets per batch handed to rotator/UI
+            cpu_profile: Key of CPU_PROFILES (thread pinning policy)
+            cpu_affinity: CPUs for the capture thread (overrides NUMA pick)
+            nic_numa_node: NUMA node of the NIC (None = read from /sys)
+            ui_sample_rate: Hand only 1 in N packets to callback/UI queue (rotator sees all)
+            ui_queue: Fill the UI packet queue (False when running headless)
         """
         self.interface = interface
         self.bpf_filter = bpf_filter
+        self._bpf_program: Optional[BpfProgram] = None
         self.snaplen = snaplen
         self.promisc = promisc
         self.buffer_size = buffer_size
         self.queue_size = queue_size
         self.packet_callback = packet_callback
+        self._callback_ok = True     # Cleared on the first callback failure
         self.rotator = rotator
+        self.batch_size = batch_size
+        self.cpu_profile = CPU_PROFILES.get(cpu_profile, CPU_PROFILES[DEFAULT_CPU_PROFILE])
+        self.cpu_affinity = cpu_affinity
+        self.nic_numa_node = nic_numa_node
+        self.ui_sample_rate = ui_sample_rate
+        self.ui_queue = ui_queue
+        
+        self._capture_cpus: Optional[Set[int]] = None
         
-        self._sniffer = None
-        self._packet_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._ring: Optional[PacketRing] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        # SPSC ring (capture thread -> UI thread) of PacketBatch objects
+        self._packet_queue = SPSCRing(max(1, queue_size // batch_size))
+        self._pending: Iterator[PacketInfo] = iter(())
         self._stats = CaptureStats()
-        self._packet_stt = 0
+        # Packet numbers; next() on a count is a single C call, no lock needed
+        self._stt_counter = itertools.count(1)
         
         self._running = False
         self._paused = False
         self._stop_event = threading.Event()
-        self._stats_thread: Optional[threading.Thread] = None
         
-        self._lock = threading.Lock()
+        # Drop counter source, kept open: rtnetlink, else a sysfs/procfs fd
+        self._link_stats: Optional[LinkStats] = None
+        self._drop_fd = -1
+        self._drop_from_sysfs = False
+        self._proc_row = interface.encode() + b':'
     
     def setup(self):
-        """Initialize Scapy sniffer"""
-        try:
-            from scapy.all import AsyncSniffer, conf
-            
-            # Use libpcap backend if available
+        """Open the AF_PACKET ring and attach the BPF filter"""
+        ring = PacketRing(
+            interface=self.interface,
+            snaplen=self.snaplen,
+            promisc=self.promisc,
+            buffer_size=self.buffer_size,
+        )
+        ring.open()
+        
+        if self.bpf_filter:
             try:
-                conf.use_pcap = True
+                # Compiled once, reused when the ring is reopened
+                if self._bpf_program is None:
+                    self._bpf_program = compile_filter(self.bpf_filter, self.snaplen)
+                attach_filter(ring.socket, self._bpf_program)
             except Exception:
-                pass
-            
-            # Create AsyncSniffer
-            self._sniffer = AsyncSniffer(
-                iface=self.interface,
-                prn=self._on_packet,
-                store=False,
-                promisc=self.promisc,
-                filter=self.bpf_filter if self.bpf_filter else None,
+                ring.close()
+                raise
+        
+        self._ring = ring
+        self._open_drop_source()
+        logger.info(f"Capture engine setup on {self.interface}")
+    
+    def update_filter(self, bpf_filter: str):
+        """
+        Swap the BPF filter without stopping capture
+        The new program replaces the old one atomically; '' removes it
+        """
+        program = compile_filter(bpf_filter, self.snaplen) if bpf_filter else None
+        
+        ring = self._ring
+        if ring is not None and ring.socket is not None:
+            if program is None:
+                detach_filter(ring.socket)
+            else:
+                attach_filter(ring.socket, program)
+        
+        self.bpf_filter = bpf_filter
+        self._bpf_program = program
+        logger.info(f"BPF filter set to: {bpf_filter or '(none)'}")
+    
+    def _open_drop_source(self):
+        """Open the drop counter source once (netlink, sysfs, /proc/net/dev)"""
+        self._close_drop_source()
+        
+        link_stats = LinkStats(self.interface)
+        try:
+            link_stats.open()
+            if link_stats.rx_dropped() is not None:
+                self._link_stats = link_stats
+                return
+        except OSError:
+            pass
+        link_stats.close()
+        
+        try:
+            self._drop_fd = os.open(
+                f'/sys/class/net/{self.interface}/statistics/rx_dropped', os.O_RDONLY
             )
-            logger.info(f"Capture engine setup on {self.interface}")
+            self._drop_from_sysfs = True
+            return
+        except OSError:
+            pass
+        
+        try:
+            self._drop_fd = os.open('/proc/net/dev', os.O_RDONLY)
+        except OSError:
+            self._drop_fd = -1
+        self._drop_from_sysfs = False
+    
+    def _close_drop_source(self):
+        if self._link_stats is not None:
+            self._link_stats.close()
+            self._link_stats = None
+        if self._drop_fd >= 0:
+            os.close(self._drop_fd)
+            self._drop_fd = -1
+    
+    def _plan_affinity(self):
+        """Pick the CPU set for the capture thread"""
+        self._capture_cpus = None
+        
+        if not hasattr(os, 'sched_setaffinity'):
+            return
+        
+        allowed = os.sched_getaffinity(0)
+        
+        if self.cpu_affinity:
+            self._capture_cpus = set(self.cpu_affinity) & allowed or None
+        elif self.cpu_profile.get('pin_capture'):
+            node = self.nic_numa_node
+            if node is None:
+                node = get_numa_node(self.interface)
             
-        except ImportError:
-            raise ImportError("Scapy is required. Install with: pip install scapy")
+            # Prefer the NIC's NUMA node, last core there (core 0 takes most housekeeping IRQs)
+            candidates = (get_node_cpus(node) & allowed) if node >= 0 else set()
+            if not candidates:
+                candidates = allowed
+            if len(allowed) > 1:
+                self._capture_cpus = {max(candidates)}
     
-    def _on_packet(self, pkt):
-        """Callback for each captured packet"""
-        if self._paused:
+    def _pin_current_thread(self, cpus: Optional[Set[int]], name: str):
+        """Pin calling thread to cpus (no-op if None)"""
+        if not cpus:
             return
+        try:
+            os.sched_setaffinity(0, cpus)
+            logger.info(f"{name} thread pinned to CPUs {sorted(cpus)}")
+        except OSError as e:
+            logger.warning(f"Cannot pin {name} thread: {e}")
+    
+    def _capture_loop(self):
+        """Capture thread: walk ring blocks, fill batches, dispatch batches"""
+        self._pin_current_thread(self._capture_cpus, "Capture")
+        
+        ring = self._ring
+        stop_is_set = self._stop_event.is_set
+        timeout_ms = RING_RETIRE_TIMEOUT_MS
+        batch = PacketBatch(self.batch_size)
+        next_stt = self._stt_counter.__next__
+        
+        # Stats run here on a timer instead of on their own thread; the ring
+        # wait timeout guarantees a tick even when no traffic arrives
+        monotonic_ns = time.monotonic_ns
+        stats_interval_ns = int(STATS_UPDATE_INTERVAL * 1_000_000_000)
+        next_stats_ns = 0
         
+        while not stop_is_set():
+            try:
+                now = monotonic_ns()
+                if now >= next_stats_ns:
+                    next_stats_ns = now + stats_interval_ns
+                    self._stats.update_rates()
+                    self._update_drop_stats()
+                
+                if not ring.wait(timeout_ms):
+                    continue
+                
+                if self._paused:
+                    ring.release()
+                    continue
+                
+                while True:
+                    ring.fill(batch, next_stt)
+                    if batch.full:
+                        self._on_batch(batch)
+                        batch = PacketBatch(self.batch_size)
+                    if ring.block_done:
+                        break
+                
+                # Batches borrow the block: flush the tail before releasing it
+                if batch.count:
+                    self._on_batch(batch)
+                    batch = PacketBatch(self.batch_size)
+                
+                ring.release()
+            except Exception as e:
+                logger.error(f"Capture loop error: {e}")
+                time.sleep(0.1)
+    
+    def _on_batch(self, batch: PacketBatch):
+        """Dispatch one filled batch to stats, rotator, callback and queue"""
         try:
-            # Get packet info
-            ts = float(pkt.time)
-            ts_sec = int(ts)
-            ts_usec = int((ts % 1) * 1e6)
-            data = bytes(pkt)
-            
-            with self._lock:
-                self._packet_stt += 1
-                stt = self._packet_stt
-            
-            pkt_info = PacketInfo(
-                stt=stt,
-                ts_sec=ts_sec,
-                ts_usec=ts_usec,
-                caplen=len(data),
-                origlen=len(data),
-                data=data
-            )
-            
             # Update stats
-            self._stats.packets += 1
-            self._stats.bytes += len(data)
+            self._stats.add(batch.count, batch.nbytes)
             
             # Write to rotator (PCAP file)
             if self.rotator:
                 try:
-                    self.rotator.write_packet_info(pkt_info)
+                    self.rotator.write_batch(batch)
                 except Exception as e:
                     logger.error(f"Rotator write error: {e}")
             
-            # Call packet callback (for UI)
-            if self.packet_callback:
+            # Nobody to show packets to (headless, or UI lagging with the
+            # queue full): stop here, no sampling, copy or PacketInfo
+            ring = self._packet_queue
+            callback = self.packet_callback if self._callback_ok else None
+            if callback is None and (not self.ui_queue or ring.full()):
+                if self.ui_queue:
+                    rate = self._ui_sample_rate
+                    self._stats.queue_dropped += batch.count if rate == 1 else len(batch.sample(rate))
+                return
+            
+            # Callback and UI only see sampled packets
+            rows = batch.sample(self._ui_sample_rate)
+            if not rows:
+                return
+            
+            # The UI outlives the ring block, so it gets an owned copy
+            ui_batch = batch.detach(rows) if batch.borrowed or len(rows) < batch.count else batch
+            
+            # Call packet callback (for UI), one PacketInfo view per packet.
+            # One handler for the whole batch; a failing callback is disabled
+            # instead of raising on every packet
+            if callback is not None:
                 try:
-                    self.packet_callback(pkt_info)
-                except Exception:
-                    pass  # Don't let callback errors crash capture
+                    for pkt_info in ui_batch:
+                        callback(pkt_info)
+                except Exception as e:
+                    self._callback_ok = False
+                    logger.error(f"Packet callback disabled after error: {e}")
             
-            # Add to queue (for UI display)
-            try:
-                self._packet_queue.put_nowait(pkt_info)
-            except queue.Full:
-                self._stats.queue_dropped += 1
+            # Hand the whole batch to the UI queue in one operation
+            if self.ui_queue and not ring.try_push(ui_batch):
+                self._stats.queue_dropped += len(rows)
         
         except Exception as e:
-            logger.error(f"Packet processing error: {e}")
+            logger.error(f"Batch processing error: {e}")
+        finally:
+            batch.retire()
     
-    def _stats_loop(self):
-        """Background thread for updating stats"""
-        while not self._stop_event.is_set():
-            self._stats.update_rates()
-            self._update_drop_stats()
-            time.sleep(STATS_UPDATE_INTERVAL)
+    @property
+    def ui_sample_rate(self) -> int:
+        return self._ui_sample_rate
+    
+    @ui_sample_rate.setter
+    def ui_sample_rate(self, rate: int):
+        self._ui_sample_rate = max(1, int(rate))
     
     def _update_drop_stats(self):
-        """Read drop stats from /proc/net/dev"""
+        """Read rx_dropped (IFLA_STATS64, sysfs integer or the /proc/net/dev row)"""
+        fd = self._drop_fd
+        
         try:
-            with open('/proc/net/dev', 'r') as f:
-                for line in f:
-                    if self.interface in line:
-                        parts = line.split()
-                        if len(parts) >= 5:
-                            # Column 4 is rx_drop (absolute from kernel)
-                            kernel_drops = int(parts[4])
-                            
-                            # Set initial baseline on first read
-                            if self._stats._initial_kernel_drops < 0:
-                                self._stats._initial_kernel_drops = kernel_drops
-                            
-                            self._stats._current_kernel_drops = kernel_drops
-                        break
-        except Exception:
-            pass
+            if self._link_stats is not None:
+                kernel_drops = self._link_stats.rx_dropped()
+                if kernel_drops is None:
+                    return
+            elif fd < 0:
+                return
+            elif self._drop_from_sysfs:
+                kernel_drops = int(os.pread(fd, 32, 0))
+            else:
+                data = os.pread(fd, 65536, 0)
+                row = self._proc_row
+                start = data.find(row)
+                # Names are right-aligned: the match must start the row's name field
+                while start > 0 and data[start - 1] not in b' \n':
+                    start = data.find(row, start + 1)
+                if start < 0:
+                    return
+                start += len(row)
+                end = data.find(b'\n', start)
+                # Columns after "iface:": bytes packets errs drop ...
+                parts = data[start:end if end >= 0 else len(data)].split(None, 4)
+                if len(parts) < 4:
+                    return
+                kernel_drops = int(parts[3])
+        except (OSError, ValueError):
+            return
+        
+        # Set initial baseline on first read
+        if self._stats._initial_kernel_drops < 0:
+            self._stats._initial_kernel_drops = kernel_drops
+        
+        self._stats._current_kernel_drops = kernel_drops
     
     def start(self):
         """Start capturing"""
         if self._running:
             return
         
-        if self._sniffer is None:
+        if self._ring is None:
             self.setup()
         
         self._running = True
         self._paused = False
         self._stop_event.clear()
         self._stats.reset()
+        self._callback_ok = True
+        self._plan_affinity()
         
-        # Start stats thread
-        self._stats_thread = threading.Thread(target=self._stats_loop, daemon=True)
-        self._stats_thread.start()
-        
-        # Start sniffer
-        self._sniffer.start()
+        # Start capture thread
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop,
+            daemon=True,
+            name="CaptureRing"
+        )
+        self._capture_thread.start()
         logger.info(f"Capture started on {self.interface}")
     
     def stop(self):
@@ -264,16 +497,17 @@ class CaptureEngine:
         self._running = False
         self._stop_event.set()
         
-        # Stop sniffer
-        if self._sniffer:
+        # Stop capture thread, then unmap the ring
+        if self._capture_thread and self._capture_thread.is_alive():
+            self._capture_thread.join(timeout=2.0)
+        
+        if self._ring:
             try:
-                self._sniffer.stop()
+                self._ring.close()
             except Exception as e:
-                logger.error(f"Error stopping sniffer: {e}")
-        
-        # Wait for stats thread
-        if self._stats_thread and self._stats_thread.is_alive():
-            self._stats_thread.join(timeout=2.0)
+                logger.error(f"Error closing capture ring: {e}")
+            self._ring = None
+        self._close_drop_source()
         
         # Flush rotator
         if self.rotator:
@@ -299,6 +533,11 @@ class CaptureEngine:
             self.pause()
         return self._paused
     
+    def planned_capture_cpus(self) -> Set[int]:
+        """CPUs the capture thread will be pinned to (empty = not pinned)"""
+        self._plan_affinity()
+        return set(self._capture_cpus or ())
+    
     @property
     def is_running(self) -> bool:
         return self._running
@@ -312,52 +551,82 @@ class CaptureEngine:
         return self._stats
     
     @property
-    def packet_queue(self) -> queue.Queue:
+    def packet_queue(self) -> SPSCRing:
         return self._packet_queue
     
-    def get_packet(self, timeout: float = 0.1) -> Optional[PacketInfo]:
-        """Get packet from queue"""
+    def get_batch(self, timeout: float = 0.1) -> Optional[PacketBatch]:
+        """Get next packet batch from queue"""
         try:
             return self._packet_queue.get(timeout=timeout)
         except queue.Empty:
             return None
     
+    def get_packet(self, timeout: float = 0.1) -> Optional[PacketInfo]:
+        """Get packet from queue (unpacks batches one packet at a time)"""
+        pkt_info = next(self._pending, None)
+        if pkt_info is None:
+            batch = self.get_batch(timeout)
+            if batch is None:
+                return None
+            self._pending = iter(batch)
+            pkt_info = next(self._pending, None)
+        return pkt_info
+    
     def clear_queue(self):
         """Clear packet queue"""
-        while not self._packet_queue.empty():
-            try:
-                self._packet_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._pending = iter(())
+        self._packet_queue.clear()
     
     def get_status(self) -> dict:
         """Get capture status"""
-        uptime = time.time() - self._stats.start_time if self._stats.start_time else 0
+        start = self._stats.start_time
+        uptime = (time.monotonic_ns() - start) / 1e9 if start else 0
+        packets, nbytes = self._stats.snapshot()
         
         return {
             "interface": self.interface,
             "running": self._running,
             "paused": self._paused,
             "uptime": uptime,
-            "packets": self._stats.packets,
-            "bytes": self._stats.bytes,
+            "packets": packets,
+            "bytes": nbytes,
             "dropped": self._stats.dropped,
             "queue_dropped": self._stats.queue_dropped,
             "pps": self._stats.pps,
             "bps": self._stats.bps,
-            "queue_size": self._packet_queue.qsize(),
+            "queue_size": self._packet_queue.size,
         }
 
 
+# TTL cache for interface lookups called at UI refresh rate: key -> (expires_at, result)
+_iface_cache: dict = {}
+
+# One AF_INET socket for SIOCGIFADDR, opened on first use and kept for the process
+_ioctl_sock: Optional[socket.socket] = None
+
+
+def _cache_get(key):
+    entry = _iface_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_put(key, result):
+    _iface_cache[key] = (time.monotonic() + INTERFACE_CACHE_TTL, result)
+
+
 def get_interfaces() -> list:
-    """Get list of available network interfaces - FAST version using /sys"""
+    """Get list of available network interfaces - FAST version using /sys (cached)"""
+    cached = _cache_get('interfaces')
+    if cached is not None:
+        return list(cached)
+    
     interfaces = []
     
     # Use /sys/class/net directly (fast, no scapy import)
     try:
-        net_path = Path('/sys/class/net')
-        if net_path.exists():
-            interfaces = [d.name for d in net_path.iterdir() if d.is_dir()]
+        interfaces = [e.name for e in os.scandir('/sys/class/net') if e.is_dir()]
     except Exception:
         pass
     
@@ -365,7 +634,36 @@ def get_interfaces() -> list:
     if len(interfaces) > 1 and 'lo' in interfaces:
         interfaces = [i for i in interfaces if i != 'lo']
     
-    return sorted(interfaces)
+    interfaces.sort()
+    _cache_put('interfaces', interfaces)
+    return list(interfaces)
+
+
+def get_numa_node(interface: str) -> int:
+    """NUMA node of the interface's device (-1 = unknown / virtual)"""
+    try:
+        return int(Path(f'/sys/class/net/{interface}/device/numa_node').read_text().strip())
+    except (OSError, ValueError):
+        return -1
+
+
+def get_node_cpus(node: int) -> Set[int]:
+    """CPUs of a NUMA node, parsed from cpulist like '0-3,8-11'"""
+    cpus: Set[int] = set()
+    try:
+        cpulist = Path(f'/sys/devices/system/node/node{node}/cpulist').read_text().strip()
+    except OSError:
+        return cpus
+    
+    for part in cpulist.split(','):
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-')
+            cpus.update(range(int(lo), int(hi) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
 
 
 def validate_interface(interface: str) -> bool:
@@ -373,8 +671,29 @@ def validate_interface(interface: str) -> bool:
     return interface in get_interfaces() or interface == 'any'
 
 
+def _get_ipv4(interface: str) -> Optional[str]:
+    """IPv4 address via SIOCGIFADDR on the shared socket"""
+    global _ioctl_sock
+    try:
+        if _ioctl_sock is None:
+            _ioctl_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        ip_bytes = fcntl.ioctl(
+            _ioctl_sock.fileno(),
+            0x8915,  # SIOCGIFADDR
+            struct.pack('256s', interface.encode('utf-8')[:15])
+        )[20:24]
+        return socket.inet_ntoa(ip_bytes)
+    except Exception:
+        return None
+
+
 def get_interface_info(interface: str) -> dict:
-    """Get interface information - FAST version using /sys only"""
+    """Get interface information - FAST version using /sys only (cached)"""
+    key = ('info', interface)
+    cached = _cache_get(key)
+    if cached is not None:
+        return dict(cached)
+    
     info = {
         "name": interface,
         "exists": False,
@@ -401,24 +720,12 @@ def get_interface_info(interface: str) -> dict:
         if addr_file.exists():
             info["mac"] = addr_file.read_text().strip()
         
-        # Get IPv4 from /proc/net/fib_trie or socket (fast, no subprocess)
-        try:
-            import socket
-            import fcntl
-            import struct
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            ip_bytes = fcntl.ioctl(
-                sock.fileno(),
-                0x8915,  # SIOCGIFADDR
-                struct.pack('256s', interface.encode('utf-8')[:15])
-            )[20:24]
-            info["ipv4"] = socket.inet_ntoa(ip_bytes)
-            sock.close()
-        except Exception:
-            info["ipv4"] = None
+        # Get IPv4 via ioctl (fast, no subprocess)
+        info["ipv4"] = _get_ipv4(interface)
     
     except Exception as e:
         logger.error(f"Error getting interface info: {e}")
     
-    return info
+    _cache_put(key, info)
+    return dict(info)
 
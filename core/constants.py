@@ -118,7 +118,13 @@ DEFAULT_PROMISC = True          # Promiscuous mode on
 DEFAULT_RETENTION_DAYS = 7      # Keep PCAP files for 7 days
 DEFAULT_MAX_MEMORY_MB = 500     # Max memory usage
 DEFAULT_QUEUE_SIZE = 10000      # Packet queue size
+DEFAULT_BATCH_SIZE = 256        # Packets per capture batch
 DEFAULT_UI_CACHE_SIZE = 5000    # UI packet cache size
+MAX_UI_SAMPLE_RATE = 64         # UI shows at least 1 in 64 packets
+
+# AF_PACKET ring
+RING_BLOCK_SIZE = 262144        # 256KB per TPACKET_V3 block
+RING_RETIRE_TIMEOUT_MS = 100    # Hand partial blocks to user space after 100ms
 
 # Snaplen options
 SNAPLEN_OPTIONS = {
@@ -155,6 +161,19 @@ BUFFER_PROFILES = {
     },
 }
 
+# CPU pinning profiles
+CPU_PROFILES = {
+    "off": {
+        "pin_capture": False,
+        "desc": "Tắt - Kernel tự điều phối"
+    },
+    "numa": {
+        "pin_capture": True,       # Capture thread on a core of the NIC's NUMA node
+        "desc": "NUMA - Ghim capture gần NIC"
+    },
+}
+DEFAULT_CPU_PROFILE = "numa"
+
 # PCAP file header constants
 PCAP_MAGIC = 0xa1b2c3d4          # Standard pcap magic number
 PCAP_VERSION_MAJOR = 2
@@ -164,4 +183,5 @@ PCAP_LINKTYPE_ETHERNET = 1
 # Time constants
 STATS_UPDATE_INTERVAL = 2.0     # Update stats every 2 seconds
 UI_REFRESH_INTERVAL = 0.1       # UI refresh rate (10 FPS)
+INTERFACE_CACHE_TTL = 2.0       # Seconds interface list/info lookups are cached
 
@@ -3,8 +3,7 @@ Packet Decoder - Parse raw bytes into structured data
 Supports: Ethernet, IP, IPv6, TCP, UDP, ICMP, ARP
 """
 
-from dataclasses import dataclass, field
-from typing import Optional
+from typing import NamedTuple, Optional, Union
 import struct
 import socket
 
@@ -14,28 +13,46 @@ from .constants import (
     tcp_flags_str, ICMP_TYPE_NAMES, ARP_OP_NAMES, WELL_KNOWN_PORTS
 )
 
-
-@dataclass
-class PacketInfo:
-    """Basic packet info for queue/display"""
+# Header layouts, compiled once: one unpack_from call per header
+_U16_UNPACK = struct.Struct('!H').unpack_from
+_ETH_UNPACK = struct.Struct('!6s6sH').unpack_from
+_IPV4_UNPACK = struct.Struct('!BBHHHBBHII').unpack_from
+_IPV6_UNPACK = struct.Struct('!IHBB16s16s').unpack_from
+_TCP_UNPACK = struct.Struct('!HHIIBBHHH').unpack_from
+_UDP_UNPACK = struct.Struct('!HHHH').unpack_from
+_ICMP_UNPACK = struct.Struct('!BBH').unpack_from
+_ARP_UNPACK = struct.Struct('!HHBBH6sI6sI').unpack_from
+_ADDR_PAIR_UNPACK = struct.Struct('!II').unpack_from
+# Untagged Ethernet + IPv4 without options + TCP, the common frame: one unpack
+_ETH_IPV4_TCP_UNPACK = struct.Struct('!6s6sH' 'BBHHHBBHII' 'HHIIBBHHH').unpack_from
+
+# Display names for one-byte fields, indexed directly instead of dict.get()
+_TCP_FLAGS_256 = tuple(tcp_flags_str(i) for i in range(256))
+_PROTO_NAMES_256 = tuple(PROTO_NAMES.get(i, str(i)) for i in range(256))
+_ICMP_TYPE_NAMES_256 = tuple(ICMP_TYPE_NAMES.get(i, f"Type {i}") for i in range(256))
+
+
+class PacketInfo(NamedTuple):
+    """Basic packet info for queue/display (immutable, tuple-backed)"""
     stt: int                    # Packet sequence number
     ts_sec: int                 # Timestamp seconds
     ts_usec: int                # Timestamp microseconds
     caplen: int = 0             # Captured length
-    origlen: int = 0            # Original length
-    data: bytes = field(default_factory=bytes)  # Raw packet data
+    origlen: int = 0            # Original length (producers fill in caplen when unknown)
+    data: Union[bytes, memoryview] = b''   # Raw packet data (a view when read from a pcap file)
 
 
-@dataclass
-class EthernetHeader:
+class EthernetHeader(NamedTuple):
     dst_mac: str
     src_mac: str
     ethertype: int
-    ethertype_name: str = ""
+    
+    @property
+    def ethertype_name(self) -> str:
+        return ETHERTYPE_NAMES.get(self.ethertype, f"0x{self.ethertype:04x}")
 
 
-@dataclass
-class IPv4Header:
+class IPv4Header(NamedTuple):
     version: int
     ihl: int                    # Header length
     tos: int
@@ -48,11 +65,13 @@ class IPv4Header:
     checksum: int
     src_ip: str
     dst_ip: str
-    protocol_name: str = ""
+    
+    @property
+    def protocol_name(self) -> str:
+        return _PROTO_NAMES_256[self.protocol]
 
 
-@dataclass
-class IPv6Header:
+class IPv6Header(NamedTuple):
     version: int
     traffic_class: int
     flow_label: int
@@ -63,8 +82,7 @@ class IPv6Header:
     dst_ip: str
 
 
-@dataclass
-class TCPHeader:
+class TCPHeader(NamedTuple):
     src_port: int
     dst_port: int
     seq: int
@@ -75,27 +93,30 @@ class TCPHeader:
     window: int
     checksum: int
     urgent: int
-    flags_str: str = ""
+    
+    @property
+    def flags_str(self) -> str:
+        return _TCP_FLAGS_256[self.flags]
 
 
-@dataclass
-class UDPHeader:
+class UDPHeader(NamedTuple):
     src_port: int
     dst_port: int
     length: int
     checksum: int
 
 
-@dataclass
-class ICMPHeader:
+class ICMPHeader(NamedTuple):
     icmp_type: int
     code: int
     checksum: int
-    type_name: str = ""
+    
+    @property
+    def type_name(self) -> str:
+        return _ICMP_TYPE_NAMES_256[self.icmp_type]
 
 
-@dataclass
-class ARPHeader:
+class ARPHeader(NamedTuple):
     hw_type: int
     proto_type: int
     hw_size: int
@@ -105,34 +126,172 @@ class ARPHeader:
     sender_ip: str
     target_mac: str
     target_ip: str
-    op_name: str = ""
+    
+    @property
+    def op_name(self) -> str:
+        return ARP_OP_NAMES.get(self.opcode, f"Op {self.opcode}")
 
 
-@dataclass
 class DecodedPacket:
-    """Fully decoded packet with all layers"""
-    raw_data: bytes
-    ethernet: Optional[EthernetHeader] = None
-    ipv4: Optional[IPv4Header] = None
-    ipv6: Optional[IPv6Header] = None
-    tcp: Optional[TCPHeader] = None
-    udp: Optional[UDPHeader] = None
-    icmp: Optional[ICMPHeader] = None
-    arp: Optional[ARPHeader] = None
-    
-    # Computed summary fields
-    protocol_name: str = "UNKNOWN"
-    src_addr: str = ""
-    dst_addr: str = ""
-    src_port: int = 0
-    dst_port: int = 0
-    info_str: str = ""
-    payload: bytes = field(default_factory=bytes)
+    """
+    Fully decoded packet with all layers
+    protocol_name and info_str are built from the layers on first access,
+    so paths that never display them (storage, counting) skip the formatting;
+    payload is sliced from raw_data only when read
+    """
+    
+    __slots__ = (
+        'raw_data', 'ethernet', 'ipv4', 'ipv6', 'tcp', 'udp', 'icmp', 'arp',
+        'src_addr', 'dst_addr', 'src_port', 'dst_port', 'payload_offset',
+        '_protocol_name', '_info_str',
+    )
+    
+    def __init__(
+        self,
+        raw_data: bytes,
+        ethernet: Optional[EthernetHeader] = None,
+        ipv4: Optional[IPv4Header] = None,
+        ipv6: Optional[IPv6Header] = None,
+        tcp: Optional[TCPHeader] = None,
+        udp: Optional[UDPHeader] = None,
+        icmp: Optional[ICMPHeader] = None,
+        arp: Optional[ARPHeader] = None,
+        protocol_name: Optional[str] = None,
+        src_addr: str = "",
+        dst_addr: str = "",
+        src_port: int = 0,
+        dst_port: int = 0,
+        info_str: Optional[str] = None,
+        payload_offset: int = 0,    # Start of transport payload in raw_data, 0 = none
+    ):
+        self.raw_data = raw_data
+        self.ethernet = ethernet
+        self.ipv4 = ipv4
+        self.ipv6 = ipv6
+        self.tcp = tcp
+        self.udp = udp
+        self.icmp = icmp
+        self.arp = arp
+        self.src_addr = src_addr
+        self.dst_addr = dst_addr
+        self.src_port = src_port
+        self.dst_port = dst_port
+        self.payload_offset = payload_offset
+        self._protocol_name = protocol_name
+        self._info_str = info_str
+    
+    @property
+    def payload(self):
+        """Transport payload as a view of raw_data (b'' if not decoded)"""
+        offset = self.payload_offset
+        if not offset:
+            return b""
+        return memoryview(self.raw_data)[offset:]
+    
+    @property
+    def protocol_name(self) -> str:
+        name = self._protocol_name
+        if name is None:
+            name = self._protocol_name = self._format_protocol()
+        return name
+    
+    @protocol_name.setter
+    def protocol_name(self, value: str):
+        self._protocol_name = value
+    
+    @property
+    def info_str(self) -> str:
+        info = self._info_str
+        if info is None:
+            info = self._info_str = self._format_info()
+        return info
+    
+    @info_str.setter
+    def info_str(self, value: str):
+        self._info_str = value
+    
+    def _format_protocol(self) -> str:
+        if self.ipv4 is not None:
+            return self.ipv4.protocol_name
+        if self.ipv6 is not None:
+            if self.tcp is not None:
+                return "TCP"
+            if self.udp is not None:
+                return "UDP"
+            return "IPv6"
+        if self.arp is not None:
+            return "ARP"
+        return "UNKNOWN"
+    
+    def _format_info(self) -> str:
+        tcp = self.tcp
+        udp = self.udp
+        
+        if self.ipv4 is not None:
+            if tcp is not None:
+                port_info = _port_info(tcp.src_port, tcp.dst_port)
+                return f"{tcp.src_port} → {tcp.dst_port}{port_info} {tcp.flags_str} Seq={tcp.seq}"
+            if udp is not None:
+                port_info = _port_info(udp.src_port, udp.dst_port)
+                return f"{udp.src_port} → {udp.dst_port}{port_info} Len={udp.length}"
+            icmp = self.icmp
+            if icmp is not None:
+                return f"{icmp.type_name} (code={icmp.code})"
+        
+        elif self.ipv6 is not None:
+            if tcp is not None:
+                return f"{tcp.src_port} → {tcp.dst_port} {tcp.flags_str}"
+            if udp is not None:
+                return f"{udp.src_port} → {udp.dst_port}"
+        
+        elif self.arp is not None:
+            arp = self.arp
+            return f"{arp.op_name}: {arp.sender_ip} → {arp.target_ip}"
+        
+        return ""
+
+
+# Formatted address caches keyed by raw bytes (IPv4: the 32-bit address);
+# real traffic repeats a small set of hosts, so most lookups skip formatting
+_ADDR_CACHE_MAX = 65536
+_MAC_CACHE: dict = {}
+_IPV4_CACHE: dict = {}
+_IPV6_CACHE: dict = {}
+_OCTETS = tuple(str(i) for i in range(256))
 
 
 def mac_to_str(mac_bytes: bytes) -> str:
     """Convert 6-byte MAC to string"""
-    return ':'.join(f'{b:02x}' for b in mac_bytes)
+    s = _MAC_CACHE.get(mac_bytes)
+    if s is None:
+        if len(_MAC_CACHE) >= _ADDR_CACHE_MAX:
+            _MAC_CACHE.clear()
+        s = _MAC_CACHE[mac_bytes] = mac_bytes.hex(':')
+    return s
+
+
+def ipv4_to_str(addr: int) -> str:
+    """Convert IPv4 address (host-order int, as unpacked with '!I') to dotted string"""
+    s = _IPV4_CACHE.get(addr)
+    if s is None:
+        if len(_IPV4_CACHE) >= _ADDR_CACHE_MAX:
+            _IPV4_CACHE.clear()
+        octets = _OCTETS
+        s = _IPV4_CACHE[addr] = '.'.join((
+            octets[addr >> 24], octets[(addr >> 16) & 0xFF],
+            octets[(addr >> 8) & 0xFF], octets[addr & 0xFF],
+        ))
+    return s
+
+
+def ipv6_to_str(ip_bytes: bytes) -> str:
+    """Convert 16-byte IPv6 address to RFC 5952 string"""
+    s = _IPV6_CACHE.get(ip_bytes)
+    if s is None:
+        if len(_IPV6_CACHE) >= _ADDR_CACHE_MAX:
+            _IPV6_CACHE.clear()
+        s = _IPV6_CACHE[ip_bytes] = socket.inet_ntop(socket.AF_INET6, ip_bytes)
+    return s
 
 
 def decode_ethernet(data: bytes) -> tuple[Optional[EthernetHeader], int]:
@@ -140,9 +299,7 @@ def decode_ethernet(data: bytes) -> tuple[Optional[EthernetHeader], int]:
     if len(data) < 14:
         return None, 0
     
-    dst_mac = mac_to_str(data[0:6])
-    src_mac = mac_to_str(data[6:12])
-    ethertype = struct.unpack('!H', data[12:14])[0]
+    dst_mac, src_mac, ethertype = _ETH_UNPACK(data, 0)
     
     offset = 14
     
@@ -150,15 +307,10 @@ def decode_ethernet(data: bytes) -> tuple[Optional[EthernetHeader], int]:
     if ethertype == ETHERTYPE_VLAN:
         if len(data) < 18:
             return None, 0
-        ethertype = struct.unpack('!H', data[16:18])[0]
+        ethertype = _U16_UNPACK(data, 16)[0]
         offset = 18
     
-    return EthernetHeader(
-        dst_mac=dst_mac,
-        src_mac=src_mac,
-        ethertype=ethertype,
-        ethertype_name=ETHERTYPE_NAMES.get(ethertype, f"0x{ethertype:04x}")
-    ), offset
+    return EthernetHeader(mac_to_str(dst_mac), mac_to_str(src_mac), ethertype), offset
 
 
 def decode_ipv4(data: bytes) -> tuple[Optional[IPv4Header], int]:
@@ -166,39 +318,18 @@ def decode_ipv4(data: bytes) -> tuple[Optional[IPv4Header], int]:
     if len(data) < 20:
         return None, 0
     
-    version_ihl = data[0]
+    (version_ihl, tos, total_length, identification, flags_frag,
+     ttl, protocol, checksum, src, dst) = _IPV4_UNPACK(data, 0)
     version = (version_ihl >> 4) & 0x0F
     ihl = (version_ihl & 0x0F) * 4
     
     if version != 4 or len(data) < ihl:
         return None, 0
     
-    tos = data[1]
-    total_length = struct.unpack('!H', data[2:4])[0]
-    identification = struct.unpack('!H', data[4:6])[0]
-    flags_frag = struct.unpack('!H', data[6:8])[0]
-    flags = (flags_frag >> 13) & 0x07
-    fragment_offset = flags_frag & 0x1FFF
-    ttl = data[8]
-    protocol = data[9]
-    checksum = struct.unpack('!H', data[10:12])[0]
-    src_ip = socket.inet_ntoa(data[12:16])
-    dst_ip = socket.inet_ntoa(data[16:20])
-    
     return IPv4Header(
-        version=version,
-        ihl=ihl,
-        tos=tos,
-        total_length=total_length,
-        identification=identification,
-        flags=flags,
-        fragment_offset=fragment_offset,
-        ttl=ttl,
-        protocol=protocol,
-        checksum=checksum,
-        src_ip=src_ip,
-        dst_ip=dst_ip,
-        protocol_name=PROTO_NAMES.get(protocol, str(protocol))
+        version, ihl, tos, total_length, identification,
+        (flags_frag >> 13) & 0x07, flags_frag & 0x1FFF,
+        ttl, protocol, checksum, ipv4_to_str(src), ipv4_to_str(dst)
     ), ihl
 
 
@@ -207,29 +338,16 @@ def decode_ipv6(data: bytes) -> tuple[Optional[IPv6Header], int]:
     if len(data) < 40:
         return None, 0
     
-    first_word = struct.unpack('!I', data[0:4])[0]
+    first_word, payload_length, next_header, hop_limit, src, dst = _IPV6_UNPACK(data, 0)
     version = (first_word >> 28) & 0x0F
-    traffic_class = (first_word >> 20) & 0xFF
-    flow_label = first_word & 0xFFFFF
     
     if version != 6:
         return None, 0
     
-    payload_length = struct.unpack('!H', data[4:6])[0]
-    next_header = data[6]
-    hop_limit = data[7]
-    src_ip = socket.inet_ntop(socket.AF_INET6, data[8:24])
-    dst_ip = socket.inet_ntop(socket.AF_INET6, data[24:40])
-    
     return IPv6Header(
-        version=version,
-        traffic_class=traffic_class,
-        flow_label=flow_label,
-        payload_length=payload_length,
-        next_header=next_header,
-        hop_limit=hop_limit,
-        src_ip=src_ip,
-        dst_ip=dst_ip
+        version, (first_word >> 20) & 0xFF, first_word & 0xFFFFF,
+        payload_length, next_header, hop_limit,
+        ipv6_to_str(src), ipv6_to_str(dst)
     ), 40
 
 
@@ -238,30 +356,14 @@ def decode_tcp(data: bytes) -> tuple[Optional[TCPHeader], int]:
     if len(data) < 20:
         return None, 0
     
-    src_port = struct.unpack('!H', data[0:2])[0]
-    dst_port = struct.unpack('!H', data[2:4])[0]
-    seq = struct.unpack('!I', data[4:8])[0]
-    ack = struct.unpack('!I', data[8:12])[0]
-    data_offset_reserved = data[12]
+    (src_port, dst_port, seq, ack, data_offset_reserved, flags,
+     window, checksum, urgent) = _TCP_UNPACK(data, 0)
     data_offset = ((data_offset_reserved >> 4) & 0x0F) * 4
     reserved = data_offset_reserved & 0x0F
-    flags = data[13]
-    window = struct.unpack('!H', data[14:16])[0]
-    checksum = struct.unpack('!H', data[16:18])[0]
-    urgent = struct.unpack('!H', data[18:20])[0]
     
     return TCPHeader(
-        src_port=src_port,
-        dst_port=dst_port,
-        seq=seq,
-        ack=ack,
-        data_offset=data_offset,
-        reserved=reserved,
-        flags=flags,
-        window=window,
-        checksum=checksum,
-        urgent=urgent,
-        flags_str=tcp_flags_str(flags)
+        src_port, dst_port, seq, ack, data_offset, reserved,
+        flags, window, checksum, urgent
     ), data_offset
 
 
@@ -270,17 +372,7 @@ def decode_udp(data: bytes) -> tuple[Optional[UDPHeader], int]:
     if len(data) < 8:
         return None, 0
     
-    src_port = struct.unpack('!H', data[0:2])[0]
-    dst_port = struct.unpack('!H', data[2:4])[0]
-    length = struct.unpack('!H', data[4:6])[0]
-    checksum = struct.unpack('!H', data[6:8])[0]
-    
-    return UDPHeader(
-        src_port=src_port,
-        dst_port=dst_port,
-        length=length,
-        checksum=checksum
-    ), 8
+    return UDPHeader._make(_UDP_UNPACK(data, 0)), 8
 
 
 def decode_icmp(data: bytes) -> tuple[Optional[ICMPHeader], int]:
@@ -288,16 +380,7 @@ def decode_icmp(data: bytes) -> tuple[Optional[ICMPHeader], int]:
     if len(data) < 8:
         return None, 0
     
-    icmp_type = data[0]
-    code = data[1]
-    checksum = struct.unpack('!H', data[2:4])[0]
-    
-    return ICMPHeader(
-        icmp_type=icmp_type,
-        code=code,
-        checksum=checksum,
-        type_name=ICMP_TYPE_NAMES.get(icmp_type, f"Type {icmp_type}")
-    ), 8
+    return ICMPHeader._make(_ICMP_UNPACK(data, 0)), 8
 
 
 def decode_arp(data: bytes) -> tuple[Optional[ARPHeader], int]:
@@ -305,27 +388,13 @@ def decode_arp(data: bytes) -> tuple[Optional[ARPHeader], int]:
     if len(data) < 28:
         return None, 0
     
-    hw_type = struct.unpack('!H', data[0:2])[0]
-    proto_type = struct.unpack('!H', data[2:4])[0]
-    hw_size = data[4]
-    proto_size = data[5]
-    opcode = struct.unpack('!H', data[6:8])[0]
-    sender_mac = mac_to_str(data[8:14])
-    sender_ip = socket.inet_ntoa(data[14:18])
-    target_mac = mac_to_str(data[18:24])
-    target_ip = socket.inet_ntoa(data[24:28])
+    (hw_type, proto_type, hw_size, proto_size, opcode,
+     sender_mac, sender_ip, target_mac, target_ip) = _ARP_UNPACK(data, 0)
     
     return ARPHeader(
-        hw_type=hw_type,
-        proto_type=proto_type,
-        hw_size=hw_size,
-        proto_size=proto_size,
-        opcode=opcode,
-        sender_mac=sender_mac,
-        sender_ip=sender_ip,
-        target_mac=target_mac,
-        target_ip=target_ip,
-        op_name=ARP_OP_NAMES.get(opcode, f"Op {opcode}")
+        hw_type, proto_type, hw_size, proto_size, opcode,
+        mac_to_str(sender_mac), ipv4_to_str(sender_ip),
+        mac_to_str(target_mac), ipv4_to_str(target_ip)
     ), 28
 
 
@@ -334,235 +403,209 @@ def get_port_name(port: int) -> str:
     return WELL_KNOWN_PORTS.get(port, "")
 
 
+def _port_info(src_port: int, dst_port: int) -> str:
+    """' (NAME)' for the first well-known port of the pair, '' if neither is"""
+    name = get_port_name(src_port) or get_port_name(dst_port)
+    return f" ({name})" if name else ""
+
+
+# Recycled DecodedPacket shells (list.pop/append are atomic under the GIL)
+_POOL_MAX = 1024
+_POOL: list = []
+
+
+def _alloc_packet(data: bytes) -> DecodedPacket:
+    """Pooled shell (already reset by release_packet) or a new packet"""
+    if _POOL:
+        try:
+            packet = _POOL.pop()
+        except IndexError:
+            return DecodedPacket(data)
+        packet.raw_data = data
+        return packet
+    return DecodedPacket(data)
+
+
+def release_packet(packet: DecodedPacket):
+    """
+    Hand a DecodedPacket back for reuse by decode_packet
+    Only for callers that are done with it and kept no reference
+    """
+    if len(_POOL) < _POOL_MAX:
+        # Reset now: drops references to the frame and headers
+        DecodedPacket.__init__(packet, b"")
+        _POOL.append(packet)
+
+
+def _handle_ipv4(result: DecodedPacket, data: memoryview, offset: int):
+    """Layer 3-4 for EtherType IPv4"""
+    ipv4, ip_len = decode_ipv4(data[offset:])
+    if not ipv4:
+        return
+    result.ipv4 = ipv4
+    result.src_addr = ipv4.src_ip
+    result.dst_addr = ipv4.dst_ip
+    offset += ip_len
+    
+    # Layer 4: Transport
+    if ipv4.protocol == PROTO_TCP:
+        tcp, tcp_len = decode_tcp(data[offset:])
+        if tcp:
+            result.tcp = tcp
+            result.src_port = tcp.src_port
+            result.dst_port = tcp.dst_port
+            result.payload_offset = offset + tcp_len
+    
+    elif ipv4.protocol == PROTO_UDP:
+        udp, udp_len = decode_udp(data[offset:])
+        if udp:
+            result.udp = udp
+            result.src_port = udp.src_port
+            result.dst_port = udp.dst_port
+            result.payload_offset = offset + udp_len
+    
+    elif ipv4.protocol == PROTO_ICMP:
+        icmp, icmp_len = decode_icmp(data[offset:])
+        if icmp:
+            result.icmp = icmp
+            result.payload_offset = offset + icmp_len
+
+
+def _handle_ipv6(result: DecodedPacket, data: memoryview, offset: int):
+    """Layer 3-4 for EtherType IPv6"""
+    ipv6, ip_len = decode_ipv6(data[offset:])
+    if not ipv6:
+        return
+    result.ipv6 = ipv6
+    result.src_addr = ipv6.src_ip
+    result.dst_addr = ipv6.dst_ip
+    offset += ip_len
+    
+    # Parse transport layer based on next_header
+    if ipv6.next_header == PROTO_TCP:
+        tcp, tcp_len = decode_tcp(data[offset:])
+        if tcp:
+            result.tcp = tcp
+            result.src_port = tcp.src_port
+            result.dst_port = tcp.dst_port
+    
+    elif ipv6.next_header == PROTO_UDP:
+        udp, _ = decode_udp(data[offset:])
+        if udp:
+            result.udp = udp
+            result.src_port = udp.src_port
+            result.dst_port = udp.dst_port
+
+
+def _handle_arp(result: DecodedPacket, data: memoryview, offset: int):
+    """Layer 3 for EtherType ARP"""
+    arp, _ = decode_arp(data[offset:])
+    if arp:
+        result.arp = arp
+        result.src_addr = arp.sender_ip
+        result.dst_addr = arp.target_ip
+
+
+# EtherType -> layer 3 handler; other EtherTypes stop at Ethernet
+_L3_DISPATCH = {
+    ETHERTYPE_IP: _handle_ipv4,
+    ETHERTYPE_IPV6: _handle_ipv6,
+    ETHERTYPE_ARP: _handle_arp,
+}
+
+
+def _decode_eth_ipv4_tcp(result: DecodedPacket, data: bytes):
+    """
+    Fast path for untagged Ethernet + 20-byte IPv4 header + TCP
+    Same headers as the generic path, from one unpack_from and no slicing
+    """
+    (dst_mac, src_mac, ethertype,
+     version_ihl, tos, total_length, identification, flags_frag,
+     ttl, protocol, ip_checksum, src, dst,
+     src_port, dst_port, seq, ack, data_offset_reserved, flags,
+     window, checksum, urgent) = _ETH_IPV4_TCP_UNPACK(data, 0)
+    
+    result.ethernet = EthernetHeader(mac_to_str(dst_mac), mac_to_str(src_mac), ethertype)
+    
+    ipv4 = result.ipv4 = IPv4Header(
+        4, 20, tos, total_length, identification,
+        (flags_frag >> 13) & 0x07, flags_frag & 0x1FFF,
+        ttl, protocol, ip_checksum, ipv4_to_str(src), ipv4_to_str(dst)
+    )
+    result.src_addr = ipv4.src_ip
+    result.dst_addr = ipv4.dst_ip
+    
+    data_offset = ((data_offset_reserved >> 4) & 0x0F) * 4
+    result.tcp = TCPHeader(
+        src_port, dst_port, seq, ack, data_offset, data_offset_reserved & 0x0F,
+        flags, window, checksum, urgent
+    )
+    result.src_port = src_port
+    result.dst_port = dst_port
+    result.payload_offset = 34 + data_offset
+
+
 def decode_packet(data: bytes) -> DecodedPacket:
-    """Decode raw packet bytes into structured DecodedPacket"""
-    result = DecodedPacket(raw_data=data)
-    offset = 0
+    """
+    Decode raw packet bytes into structured DecodedPacket
+    Layers are handed memoryview slices: no per-layer copy of the frame
+    """
+    result = _alloc_packet(data)
+    
+    # Most traffic: EtherType IPv4, version 4 / IHL 5, protocol TCP
+    if len(data) >= 54 and data[23] == PROTO_TCP and data[14] == 0x45 \
+            and data[12] == 0x08 and data[13] == 0x00:
+        _decode_eth_ipv4_tcp(result, data)
+        return result
+    
+    data = memoryview(data)
     
     # Layer 2: Ethernet
     eth, eth_len = decode_ethernet(data)
     if not eth:
         return result
     result.ethernet = eth
-    offset = eth_len
     
     # Layer 3: Network
-    if eth.ethertype == ETHERTYPE_IP:
-        ipv4, ip_len = decode_ipv4(data[offset:])
-        if ipv4:
-            result.ipv4 = ipv4
-            result.src_addr = ipv4.src_ip
-            result.dst_addr = ipv4.dst_ip
-            result.protocol_name = ipv4.protocol_name
-            offset += ip_len
-            
-            # Layer 4: Transport
-            if ipv4.protocol == PROTO_TCP:
-                tcp, tcp_len = decode_tcp(data[offset:])
-                if tcp:
-                    result.tcp = tcp
-                    result.src_port = tcp.src_port
-                    result.dst_port = tcp.dst_port
-                    result.payload = data[offset + tcp_len:]
-                    
-                    # Build info string
-                    port_info = ""
-                    src_name = get_port_name(tcp.src_port)
-                    dst_name = get_port_name(tcp.dst_port)
-                    if src_name:
-                        port_info = f" ({src_name})"
-                    elif dst_name:
-                        port_info = f" ({dst_name})"
-                    
-                    result.info_str = f"{tcp.src_port} → {tcp.dst_port}{port_info} {tcp.flags_str} Seq={tcp.seq}"
-            
-            elif ipv4.protocol == PROTO_UDP:
-                udp, udp_len = decode_udp(data[offset:])
-                if udp:
-                    result.udp = udp
-                    result.src_port = udp.src_port
-                    result.dst_port = udp.dst_port
-                    result.payload = data[offset + udp_len:]
-                    
-                    port_info = ""
-                    src_name = get_port_name(udp.src_port)
-                    dst_name = get_port_name(udp.dst_port)
-                    if src_name:
-                        port_info = f" ({src_name})"
-                    elif dst_name:
-                        port_info = f" ({dst_name})"
-                    
-                    result.info_str = f"{udp.src_port} → {udp.dst_port}{port_info} Len={udp.length}"
-            
-            elif ipv4.protocol == PROTO_ICMP:
-                icmp, icmp_len = decode_icmp(data[offset:])
-                if icmp:
-                    result.icmp = icmp
-                    result.payload = data[offset + icmp_len:]
-                    result.info_str = f"{icmp.type_name} (code={icmp.code})"
-    
-    elif eth.ethertype == ETHERTYPE_IPV6:
-        ipv6, ip_len = decode_ipv6(data[offset:])
-        if ipv6:
-            result.ipv6 = ipv6
-            result.src_addr = ipv6.src_ip
-            result.dst_addr = ipv6.dst_ip
-            result.protocol_name = "IPv6"
-            offset += ip_len
-            
-            # Parse transport layer based on next_header
-            if ipv6.next_header == PROTO_TCP:
-                tcp, tcp_len = decode_tcp(data[offset:])
-                if tcp:
-                    result.tcp = tcp
-                    result.protocol_name = "TCP"
-                    result.src_port = tcp.src_port
-                    result.dst_port = tcp.dst_port
-                    result.info_str = f"{tcp.src_port} → {tcp.dst_port} {tcp.flags_str}"
-            
-            elif ipv6.next_header == PROTO_UDP:
-                udp, _ = decode_udp(data[offset:])
-                if udp:
-                    result.udp = udp
-                    result.protocol_name = "UDP"
-                    result.src_port = udp.src_port
-                    result.dst_port = udp.dst_port
-                    result.info_str = f"{udp.src_port} → {udp.dst_port}"
-    
-    elif eth.ethertype == ETHERTYPE_ARP:
-        arp, _ = decode_arp(data[offset:])
-        if arp:
-            result.arp = arp
-            result.protocol_name = "ARP"
-            result.src_addr = arp.sender_ip
-            result.dst_addr = arp.target_ip
-            result.info_str = f"{arp.op_name}: {arp.sender_ip} → {arp.target_ip}"
+    handler = _L3_DISPATCH.get(eth.ethertype)
+    if handler is not None:
+        handler(result, data, eth_len)
     
     return result
 
 
-def decode_packet_scapy(pkt) -> DecodedPacket:
-    """Decode using Scapy packet object - alternative method"""
-    try:
-        from scapy.layers.l2 import Ether, ARP
-        from scapy.layers.inet import IP, TCP, UDP, ICMP
-        from scapy.layers.inet6 import IPv6
-    except ImportError:
-        # Fallback to manual decoder
-        return decode_packet(bytes(pkt))
-    
-    data = bytes(pkt)
-    result = DecodedPacket(raw_data=data)
-    
-    # Ethernet
-    if Ether in pkt:
-        result.ethernet = EthernetHeader(
-            dst_mac=pkt[Ether].dst,
-            src_mac=pkt[Ether].src,
-            ethertype=pkt[Ether].type,
-            ethertype_name=ETHERTYPE_NAMES.get(pkt[Ether].type, "")
-        )
-    
-    # IPv4
-    if IP in pkt:
-        result.ipv4 = IPv4Header(
-            version=pkt[IP].version,
-            ihl=pkt[IP].ihl * 4,
-            tos=pkt[IP].tos,
-            total_length=pkt[IP].len,
-            identification=pkt[IP].id,
-            flags=int(pkt[IP].flags),
-            fragment_offset=pkt[IP].frag,
-            ttl=pkt[IP].ttl,
-            protocol=pkt[IP].proto,
-            checksum=pkt[IP].chksum or 0,
-            src_ip=pkt[IP].src,
-            dst_ip=pkt[IP].dst,
-            protocol_name=PROTO_NAMES.get(pkt[IP].proto, str(pkt[IP].proto))
-        )
-        result.src_addr = pkt[IP].src
-        result.dst_addr = pkt[IP].dst
-        result.protocol_name = result.ipv4.protocol_name
-    
-    # IPv6
-    if IPv6 in pkt:
-        result.ipv6 = IPv6Header(
-            version=pkt[IPv6].version,
-            traffic_class=pkt[IPv6].tc,
-            flow_label=pkt[IPv6].fl,
-            payload_length=pkt[IPv6].plen,
-            next_header=pkt[IPv6].nh,
-            hop_limit=pkt[IPv6].hlim,
-            src_ip=pkt[IPv6].src,
-            dst_ip=pkt[IPv6].dst
-        )
-        result.src_addr = pkt[IPv6].src
-        result.dst_addr = pkt[IPv6].dst
-        result.protocol_name = "IPv6"
-    
-    # TCP
-    if TCP in pkt:
-        flags = int(pkt[TCP].flags)
-        result.tcp = TCPHeader(
-            src_port=pkt[TCP].sport,
-            dst_port=pkt[TCP].dport,
-            seq=pkt[TCP].seq,
-            ack=pkt[TCP].ack,
-            data_offset=pkt[TCP].dataofs * 4 if pkt[TCP].dataofs else 20,
-            reserved=pkt[TCP].reserved,
-            flags=flags,
-            window=pkt[TCP].window,
-            checksum=pkt[TCP].chksum or 0,
-            urgent=pkt[TCP].urgptr,
-            flags_str=tcp_flags_str(flags)
-        )
-        result.protocol_name = "TCP"
-        result.src_port = pkt[TCP].sport
-        result.dst_port = pkt[TCP].dport
-        result.info_str = f"{pkt[TCP].sport} → {pkt[TCP].dport} {result.tcp.flags_str} Seq={pkt[TCP].seq}"
-    
-    # UDP
-    if UDP in pkt:
-        result.udp = UDPHeader(
-            src_port=pkt[UDP].sport,
-            dst_port=pkt[UDP].dport,
-            length=pkt[UDP].len,
-            checksum=pkt[UDP].chksum or 0
-        )
-        result.protocol_name = "UDP"
-        result.src_port = pkt[UDP].sport
-        result.dst_port = pkt[UDP].dport
-        result.info_str = f"{pkt[UDP].sport} → {pkt[UDP].dport} Len={pkt[UDP].len}"
-    
-    # ICMP
-    if ICMP in pkt:
-        result.icmp = ICMPHeader(
-            icmp_type=pkt[ICMP].type,
-            code=pkt[ICMP].code,
-            checksum=pkt[ICMP].chksum or 0,
-            type_name=ICMP_TYPE_NAMES.get(pkt[ICMP].type, f"Type {pkt[ICMP].type}")
-        )
-        result.protocol_name = "ICMP"
-        result.info_str = f"{result.icmp.type_name} (code={pkt[ICMP].code})"
-    
-    # ARP
-    if ARP in pkt:
-        result.arp = ARPHeader(
-            hw_type=pkt[ARP].hwtype,
-            proto_type=pkt[ARP].ptype,
-            hw_size=pkt[ARP].hwlen,
-            proto_size=pkt[ARP].plen,
-            opcode=pkt[ARP].op,
-            sender_mac=pkt[ARP].hwsrc,
-            sender_ip=pkt[ARP].psrc,
-            target_mac=pkt[ARP].hwdst,
-            target_ip=pkt[ARP].pdst,
-            op_name=ARP_OP_NAMES.get(pkt[ARP].op, f"Op {pkt[ARP].op}")
-        )
-        result.protocol_name = "ARP"
-        result.src_addr = pkt[ARP].psrc
-        result.dst_addr = pkt[ARP].pdst
-        result.info_str = f"{result.arp.op_name}: {pkt[ARP].psrc} → {pkt[ARP].pdst}"
+def decode_flow_key(data: bytes) -> Optional[tuple]:
+    """
+    Flow identity only: (src_ip, dst_ip, src_port, dst_port, protocol)
+    Reads untagged Ethernet + IPv4 in place, builds no header objects.
+    Ports are 0 when the transport is not TCP/UDP or is truncated (same as
+    decode_packet); None for anything that is not IPv4 - use decode_packet
+    """
+    if len(data) < 34 or data[12] != 0x08 or data[13] != 0x00:
+        return None
     
-    return result
+    version_ihl = data[14]
+    ihl = (version_ihl & 0x0F) * 4
+    if version_ihl >> 4 != 4 or len(data) < 14 + ihl:
+        return None
+    
+    protocol = data[23]
+    src_port = dst_port = 0
+    l4 = 14 + ihl
+    if (protocol == PROTO_TCP and len(data) >= l4 + 20) or \
+            (protocol == PROTO_UDP and len(data) >= l4 + 8):
+        src_port = (data[l4] << 8) | data[l4 + 1]
+        dst_port = (data[l4 + 2] << 8) | data[l4 + 3]
+    
+    src, dst = _ADDR_PAIR_UNPACK(data, 26)
+    return ipv4_to_str(src), ipv4_to_str(dst), src_port, dst_port, protocol
+
+
+def decode_packet_scapy(pkt) -> DecodedPacket:
+    """
+    Decode a Scapy packet object
+    Serialises it and runs the struct decoder above: same DecodedPacket
+    fields, without walking Scapy's layer objects per field
+    """
+    return decode_packet(bytes(pkt))
 
@@ -0,0 +1,132 @@
+"""
+Bulk pcap record walker
+- Scans record headers of a mapped pcap file into typed column arrays
+- Counts records without building any columns
+- Compiled with numba when it is installed, plain Python loop otherwise
+"""
+
+import struct
+from array import array
+from typing import Tuple
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+Columns = Tuple[array, array, array, array, array, int]
+
+_REC_HDR = struct.Struct('<IIII')
+_REC_HDR_BE = struct.Struct('>IIII')
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _u32(buf, i, big_endian):
+        b0 = np.int64(buf[i])
+        b1 = np.int64(buf[i + 1])
+        b2 = np.int64(buf[i + 2])
+        b3 = np.int64(buf[i + 3])
+        if big_endian:
+            return (b0 << 24) | (b1 << 16) | (b2 << 8) | b3
+        return (b3 << 24) | (b2 << 16) | (b1 << 8) | b0
+
+    @njit(cache=True)
+    def _skip_records(buf, pos, big_endian):
+        size = buf.shape[0]
+        k = 0
+        while pos + 16 <= size:
+            end = pos + 16 + _u32(buf, pos + 8, big_endian)
+            if end > size:
+                break
+            k += 1
+            pos = end
+        return k, pos
+
+    @njit(cache=True)
+    def _fill_records(buf, pos, big_endian, ts_sec, ts_usec, caplen, origlen, offsets):
+        for k in range(offsets.shape[0]):
+            ts_sec[k] = _u32(buf, pos, big_endian)
+            ts_usec[k] = _u32(buf, pos + 4, big_endian)
+            length = _u32(buf, pos + 8, big_endian)
+            caplen[k] = length
+            origlen[k] = _u32(buf, pos + 12, big_endian)
+            offsets[k] = pos + 16
+            pos += 16 + length
+        return pos
+
+
+def _walk_numba(view: memoryview, pos: int, big_endian: bool) -> Columns:
+    buf = np.frombuffer(view, dtype=np.uint8)
+    count = _skip_records(buf, pos, big_endian)[0]
+    ts_sec = np.empty(count, dtype=np.uint32)
+    ts_usec = np.empty(count, dtype=np.uint32)
+    caplen = np.empty(count, dtype=np.uint32)
+    origlen = np.empty(count, dtype=np.uint32)
+    offsets = np.empty(count, dtype=np.uint64)
+    end = _fill_records(buf, pos, big_endian, ts_sec, ts_usec, caplen, origlen, offsets)
+    del buf
+
+    # Hand back the same array.array columns as the Python walker
+    return (
+        array('I', ts_sec.tobytes()), array('I', ts_usec.tobytes()),
+        array('I', caplen.tobytes()), array('I', origlen.tobytes()),
+        array('Q', offsets.tobytes()), int(end),
+    )
+
+
+def _walk_python(view: memoryview, pos: int, big_endian: bool) -> Columns:
+    ts_sec, ts_usec = array('I'), array('I')
+    caplens, origlens, offsets = array('I'), array('I'), array('Q')
+    unpack_from = (_REC_HDR_BE if big_endian else _REC_HDR).unpack_from
+    size = len(view)
+    while pos + 16 <= size:
+        sec, usec, caplen, origlen = unpack_from(view, pos)
+        start = pos + 16
+        if start + caplen > size:
+            break
+        ts_sec.append(sec)
+        ts_usec.append(usec)
+        caplens.append(caplen)
+        origlens.append(origlen)
+        offsets.append(start)
+        pos = start + caplen
+    return ts_sec, ts_usec, caplens, origlens, offsets, pos
+
+
+def count_pcap(view: memoryview, pos: int, big_endian: bool = False) -> Tuple[int, int]:
+    """
+    (number of complete records from pos, end_pos), same walk as
+    walk_pcap() but with O(1) memory
+    """
+    if HAVE_NUMBA:
+        buf = np.frombuffer(view, dtype=np.uint8)
+        count, end = _skip_records(buf, pos, big_endian)
+        del buf
+        return int(count), int(end)
+
+    unpack_from = (_REC_HDR_BE if big_endian else _REC_HDR).unpack_from
+    size = len(view)
+    count = 0
+    while pos + 16 <= size:
+        end = pos + 16 + unpack_from(view, pos)[2]
+        if end > size:
+            break
+        count += 1
+        pos = end
+    return count, pos
+
+
+def walk_pcap(view: memoryview, pos: int, big_endian: bool = False) -> Columns:
+    """
+    Scan every complete record from pos to the end of view
+    Returns (ts_sec, ts_usec, caplen, origlen, offsets, end_pos); offsets
+    point at each record's frame bytes, a truncated tail record is left out
+    """
+    if HAVE_NUMBA:
+        return _walk_numba(view, pos, big_endian)
+    return _walk_python(view, pos, big_endian)
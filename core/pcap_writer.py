@@ -1,14 +1,18 @@
 """
 PCAP File Writer/Reader
 - Standard libpcap format
-- Batched writes for performance
+- Batched writes for performance (one writev per flush or PacketBatch)
+- Optional preallocated mmap writer (records copied straight into the mapping)
 - Thread-safe operations
 """
 
+import os
+import mmap
 import struct
 import threading
+from array import array
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Iterator, Optional, Tuple
 from dataclasses import dataclass
 
 from .constants import (
@@ -16,6 +20,8 @@ from .constants import (
     PCAP_LINKTYPE_ETHERNET, DEFAULT_SNAPLEN
 )
 from .decoder import PacketInfo
+from .batch import PacketBatch
+from .pcap_fastwalk import count_pcap, walk_pcap
 
 
 @dataclass
@@ -91,12 +97,45 @@ class PcapPacketHeader:
         )
 
 
+# pcap record header: ts_sec, ts_usec, caplen, origlen
+_REC_HDR = struct.Struct('<IIII')
+_REC_HDR_BE = struct.Struct('>IIII')
+
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+PCAP_PREALLOC_SIZE = 512 << 20  # MmapPcapWriter growth step (bytes)
+
+
+def _writev_all(fd: int, iov: list):
+    """writev() every buffer in iov, in IOV_MAX chunks, retrying short writes"""
+    pos = 0
+    total = len(iov)
+    while pos < total:
+        chunk = iov[pos:pos + IOV_MAX]
+        n = os.writev(fd, chunk)
+        for buf in chunk:
+            size = len(buf)
+            if n >= size:
+                n -= size
+                pos += 1
+                continue
+            # Short write: resume inside this buffer
+            iov[pos] = buf[n:]
+            break
+
+
 class PcapWriter:
     """
     PCAP file writer with batched writes
-    Thread-safe for multi-threaded capture
+    Thread-safe for multi-threaded capture: appends and close() serialise
+    on the writer's own lock, a write racing close() is dropped
     """
     
+    _file_mode = 'wb'
+    
     def __init__(self, filepath: str, snaplen: int = DEFAULT_SNAPLEN,
                  batch_size: int = 100, linktype: int = PCAP_LINKTYPE_ETHERNET):
         self.filepath = Path(filepath)
@@ -105,7 +144,7 @@ class PcapWriter:
         self.linktype = linktype
         
         self._file = None
-        self._buffer = bytearray()
+        self._iov: list = []            # pending header/payload pairs for writev
         self._packet_count = 0
         self._byte_count = 0
         self._pending_packets = 0
@@ -115,7 +154,7 @@ class PcapWriter:
     def open(self):
         """Open file and write global header"""
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        self._file = open(self.filepath, 'wb')
+        self._file = open(self.filepath, self._file_mode)
         
         # Write global header
         header = PcapGlobalHeader(snaplen=self.snaplen, linktype=self.linktype)
@@ -130,25 +169,24 @@ class PcapWriter:
         if self._closed or self._file is None:
             return
         
-        if origlen is None:
+        if not origlen:
             origlen = len(data)
         
         # Truncate if needed
         caplen = min(len(data), self.snaplen)
-        captured_data = data[:caplen]
-        
-        # Create packet header
-        pkt_header = PcapPacketHeader(
-            ts_sec=ts_sec,
-            ts_usec=ts_usec,
-            caplen=caplen,
-            origlen=origlen
-        )
+        if isinstance(data, bytes):
+            # Immutable: queue it as is, or a view of its first caplen bytes
+            captured_data = data if caplen == len(data) else memoryview(data)[:caplen]
+        else:
+            # Written later: keep an immutable copy, not a view of reused memory
+            captured_data = bytes(memoryview(data)[:caplen])
         
         with self._lock:
-            # Add to buffer
-            self._buffer.extend(pkt_header.to_bytes())
-            self._buffer.extend(captured_data)
+            if self._file is None:
+                # Closed while we were preparing (close() from another thread)
+                return
+            # Queue header + payload; flushed together by one writev()
+            self._iov += (_REC_HDR.pack(ts_sec, ts_usec, caplen, origlen), captured_data)
             self._pending_packets += 1
             self._packet_count += 1
             self._byte_count += caplen
@@ -159,14 +197,86 @@ class PcapWriter:
     
     def write_packet_info(self, pkt_info: PacketInfo):
         """Write PacketInfo object"""
-        origlen = pkt_info.origlen if pkt_info.origlen else len(pkt_info.data)
-        self.write_packet(pkt_info.ts_sec, pkt_info.ts_usec, pkt_info.data, origlen)
+        self.write_packet(pkt_info.ts_sec, pkt_info.ts_usec, pkt_info.data, pkt_info.origlen)
+    
+    def write_batch(self, batch):
+        """
+        Write a whole PacketBatch
+        Record headers go into one buffer (pack_into), payloads are written
+        straight from the batch: header/payload pairs handed to one writev()
+        """
+        self.write_batches((batch,))
+    
+    def write_batches(self, batches):
+        """
+        Write several PacketBatches with a single writev() sequence
+        Used by the rotator's writer thread to coalesce whatever queued up
+        while the previous write was in progress
+        """
+        if self._closed or self._file is None:
+            return
+        
+        n = sum(batch.count for batch in batches)
+        if not n:
+            return
+        
+        snaplen = self.snaplen
+        pack_into = _REC_HDR.pack_into
+        
+        headers = bytearray(_REC_HDR.size * n)
+        hdr_view = memoryview(headers)
+        srcs = []
+        iov = []
+        append = iov.append
+        
+        try:
+            written = 0
+            hdr = 0
+            for batch in batches:
+                ts_sec = batch.ts_sec
+                ts_usec = batch.ts_usec
+                origlen = batch.origlen
+                offsets = batch.offsets
+                caplens = batch.caplen
+                src = memoryview(batch.buf)
+                srcs.append(src)
+                for i in range(batch.count):
+                    start = offsets[i]
+                    caplen = caplens[i]
+                    if caplen > snaplen:
+                        caplen = snaplen
+                    pack_into(headers, hdr, ts_sec[i], ts_usec[i], caplen, origlen[i])
+                    append(hdr_view[hdr:hdr + 16])
+                    append(src[start:start + caplen])
+                    hdr += 16
+                    written += caplen
+            
+            with self._lock:
+                if self._file is None:
+                    return
+                # Keep record order with anything queued by write_packet()
+                self._flush_buffer()
+                self._write_iov(iov)
+                
+                self._packet_count += n
+                self._byte_count += written
+        finally:
+            for view in iov:
+                view.release()
+            hdr_view.release()
+            for src in srcs:
+                src.release()
+    
+    def _write_iov(self, iov: list):
+        """Write buffers in order after anything buffered in the file object (must hold lock)"""
+        self._file.flush()
+        _writev_all(self._file.fileno(), iov)
     
     def _flush_buffer(self):
-        """Flush buffer to disk (must hold lock)"""
-        if self._buffer and self._file:
-            self._file.write(self._buffer)
-            self._buffer.clear()
+        """Write queued packets with writev (must hold lock)"""
+        if self._iov and self._file:
+            self._write_iov(self._iov)
+            self._iov.clear()
             self._pending_packets = 0
     
     def flush(self):
@@ -204,65 +314,250 @@ class PcapWriter:
         return False
 
 
+class MmapPcapWriter(PcapWriter):
+    """
+    PcapWriter that preallocates the file (posix_fallocate, prealloc bytes
+    at a time), maps it shared and copies records straight into the mapping
+    instead of issuing write syscalls. close() trims the file to the bytes
+    written; until then (or after a crash) zero padding follows the last
+    record, so only use it where nobody reads the file while it is open.
+    """
+    
+    _file_mode = 'w+b'      # mmap needs a readable descriptor
+    
+    def __init__(self, filepath: str, snaplen: int = DEFAULT_SNAPLEN,
+                 batch_size: int = 100, linktype: int = PCAP_LINKTYPE_ETHERNET,
+                 prealloc: int = PCAP_PREALLOC_SIZE):
+        super().__init__(filepath, snaplen=snaplen, batch_size=batch_size, linktype=linktype)
+        self.prealloc = max(prealloc, mmap.PAGESIZE)
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        self._pos = 0
+    
+    def open(self):
+        """Open file, write global header and map the first preallocated chunk"""
+        super().open()
+        self._pos = self._file.tell()
+        self._grow(0)
+    
+    def _grow(self, need: int):
+        """Extend file and mapping so need more bytes fit after _pos"""
+        size = self._size + self.prealloc
+        while size < self._pos + need:
+            size += self.prealloc
+        
+        fd = self._file.fileno()
+        try:
+            os.posix_fallocate(fd, self._size, size - self._size)
+        except (AttributeError, OSError):
+            # No fallocate here (platform or filesystem): sparse extend
+            os.ftruncate(fd, size)
+        
+        if self._map is None:
+            self._map = mmap.mmap(fd, size)
+        else:
+            self._map.resize(size)
+        self._size = size
+    
+    def _write_iov(self, iov: list):
+        """Copy buffers into the mapping (must hold lock)"""
+        need = sum(len(buf) for buf in iov)
+        if self._pos + need > self._size:
+            self._grow(need)
+        
+        mm = self._map
+        pos = self._pos
+        for buf in iov:
+            end = pos + len(buf)
+            mm[pos:end] = buf
+            pos = end
+        self._pos = pos
+    
+    def close(self):
+        """Unmap and trim the file to the written length"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_buffer()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file:
+                os.ftruncate(self._file.fileno(), self._pos)
+                self._file.close()
+                self._file = None
+
+
 class PcapReader:
     """
     PCAP file reader
     Iterates over packets in file
+
+    The file is mmap'd read-only; records are parsed in place with one
+    precompiled Struct, and read_all_headers()/iter_views() hand out
+    memoryviews of the mapping instead of copying frame bytes.
+    With sequential=True the mapping is madvise()d MADV_SEQUENTIAL, so the
+    kernel reads ahead aggressively and drops pages behind the scan;
+    prefetch=True also asks (MADV_WILLNEED) for the whole file to be read
+    in at once, for callers that are about to walk every record.
+    An already mapped file can be passed as mapping= (shared by several
+    readers); the reader then parses it in place and never closes it.
     """
     
-    def __init__(self, filepath: str):
+    def __init__(
+        self,
+        filepath: str,
+        sequential: bool = True,
+        mapping: Optional[mmap.mmap] = None,
+        prefetch: bool = False,
+    ):
         self.filepath = Path(filepath)
+        self.sequential = sequential
+        self.prefetch = prefetch
+        self._shared_mmap = mapping
         self._file = None
+        self._mmap = None
+        self._view: Optional[memoryview] = None
+        self._pos = 0
+        self._rec_hdr = _REC_HDR
         self._header = None
         self._big_endian = False
         self._packet_stt = 0
     
     def open(self):
-        """Open file and read global header"""
-        self._file = open(self.filepath, 'rb')
-        header_data = self._file.read(24)
+        """Open file, map it and read global header"""
+        if self._shared_mmap is not None:
+            header_data = self._shared_mmap[:24]
+        else:
+            self._file = open(self.filepath, 'rb')
+            header_data = self._file.read(24)
         
         if len(header_data) < 24:
+            self.close()
             raise ValueError("Invalid PCAP file: too short")
         
-        self._header = PcapGlobalHeader.from_bytes(header_data)
+        try:
+            self._header = PcapGlobalHeader.from_bytes(header_data)
+        except ValueError:
+            self.close()
+            raise
         
         # Check endianness
         magic = struct.unpack('<I', header_data[0:4])[0]
         self._big_endian = (magic == 0xd4c3b2a1)
+        self._rec_hdr = _REC_HDR_BE if self._big_endian else _REC_HDR
+        
+        if self._shared_mmap is not None:
+            # Owner maps, advises and closes it
+            self._view = memoryview(self._shared_mmap)
+            self._pos = 24
+            return
+        
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.sequential and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        if self.prefetch and hasattr(mmap, 'MADV_WILLNEED'):
+            self._mmap.madvise(mmap.MADV_WILLNEED)
+        self._view = memoryview(self._mmap)
+        self._pos = 24
     
     @property
     def header(self) -> Optional[PcapGlobalHeader]:
         return self._header
     
     def read_packet(self) -> Optional[PacketInfo]:
-        """Read next packet, return None at EOF"""
-        if self._file is None:
+        """
+        Read next packet, return None at EOF
+        PacketInfo.data is a read-only view of the mapping, not a copy;
+        the mapping stays alive as long as any such view does
+        """
+        view = self._view
+        if view is None:
             return None
         
         # Read packet header
-        pkt_header_data = self._file.read(16)
-        if len(pkt_header_data) < 16:
+        pos = self._pos
+        if pos + 16 > len(view):
             return None
-        
-        pkt_header = PcapPacketHeader.from_bytes(pkt_header_data, self._big_endian)
+        ts_sec, ts_usec, caplen, origlen = self._rec_hdr.unpack_from(view, pos)
         
         # Read packet data
-        data = self._file.read(pkt_header.caplen)
-        if len(data) < pkt_header.caplen:
+        start = pos + 16
+        end = start + caplen
+        if end > len(view):
             return None
         
+        self._pos = end
         self._packet_stt += 1
         
         return PacketInfo(
             stt=self._packet_stt,
-            ts_sec=pkt_header.ts_sec,
-            ts_usec=pkt_header.ts_usec,
-            caplen=pkt_header.caplen,
-            origlen=pkt_header.origlen,
-            data=data
+            ts_sec=ts_sec,
+            ts_usec=ts_usec,
+            caplen=caplen,
+            origlen=origlen or caplen,
+            data=view[start:end]
         )
     
+    def read_all_headers(self) -> PacketBatch:
+        """
+        Parse every remaining record header in one pass into a PacketBatch
+        Columns are filled from the record headers; batch.buf is the file
+        mapping itself, so batch.data(i) is a zero-copy view of packet i.
+        The batch must not be used after the reader is closed.
+        """
+        view = self._view
+        if view is not None:
+            ts_sec, ts_usec, caplens, origlens, offsets, self._pos = walk_pcap(
+                view, self._pos, self._big_endian)
+        else:
+            ts_sec, ts_usec = array('I'), array('I')
+            caplens, origlens, offsets = array('I'), array('I'), array('Q')
+        first = self._packet_stt + 1
+        self._packet_stt += len(offsets)
+        stt = array('q', range(first, self._packet_stt + 1))
+        
+        count = len(stt)
+        batch = PacketBatch(0)
+        batch.capacity = count
+        batch.stt, batch.ts_sec, batch.ts_usec = stt, ts_sec, ts_usec
+        batch.caplen, batch.origlen, batch.offsets = caplens, origlens, offsets
+        batch.buf = view if view is not None else bytearray()
+        batch.nbytes = sum(caplens)
+        batch.count = count
+        return batch
+    
+    def skip_remaining(self) -> int:
+        """Advance past every remaining record, return how many; no columns built"""
+        view = self._view
+        if view is None:
+            return 0
+        count, self._pos = count_pcap(view, self._pos, self._big_endian)
+        self._packet_stt += count
+        return count
+    
+    def iter_views(self) -> Iterator[Tuple[Tuple[int, int, int, int], memoryview]]:
+        """
+        Yield ((ts_sec, ts_usec, caplen, origlen), payload view) per record
+        Views point into the mapping: copy (bytes(view)) anything kept
+        past close()
+        """
+        view = self._view
+        if view is None:
+            return
+        unpack_from = self._rec_hdr.unpack_from
+        size = len(view)
+        while self._pos + 16 <= size:
+            hdr = unpack_from(view, self._pos)
+            start = self._pos + 16
+            end = start + hdr[2]
+            if end > size:
+                break
+            self._pos = end
+            self._packet_stt += 1
+            yield hdr, view[start:end]
+    
     def __iter__(self) -> Iterator[PacketInfo]:
         """Iterate over all packets"""
         while True:
@@ -273,6 +568,17 @@ class PcapReader:
     
     def close(self):
         """Close file"""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views handed out by read_all_headers()/iter_views() are
+                # still alive; the mapping goes away with the last of them
+                pass
+            self._mmap = None
         if self._file:
             self._file.close()
             self._file = None
@@ -288,11 +594,8 @@ class PcapReader:
 
 def count_packets(filepath: str) -> int:
     """Count packets in PCAP file"""
-    count = 0
     with PcapReader(filepath) as reader:
-        for _ in reader:
-            count += 1
-    return count
+        return reader.skip_remaining()
 
 
 def get_pcap_info(filepath: str) -> dict:
@@ -302,18 +605,14 @@ def get_pcap_info(filepath: str) -> dict:
         return {"error": "File not found"}
     
     with PcapReader(filepath) as reader:
+        batch = reader.read_all_headers()
+        count = len(batch)
+        total_bytes = batch.nbytes
         first_ts = None
         last_ts = None
-        count = 0
-        total_bytes = 0
-        
-        for pkt in reader:
-            ts = pkt.ts_sec + pkt.ts_usec / 1e6
-            if first_ts is None:
-                first_ts = ts
-            last_ts = ts
-            count += 1
-            total_bytes += pkt.caplen
+        if count:
+            first_ts = batch.ts_sec[0] + batch.ts_usec[0] / 1e6
+            last_ts = batch.ts_sec[-1] + batch.ts_usec[-1] / 1e6
     
     return {
         "filepath": str(path),
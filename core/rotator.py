@@ -1,24 +1,50 @@
 """
 Hourly File Rotator
-- Auto rotate PCAP files at hour boundaries (HH:00:00)
+- Auto rotate PCAP files at hour boundaries (HH:00:00), by packet timestamp
 - Format: {interface}_{YYYY-MM-DD}_{HH}.pcap
 - Auto cleanup old files based on retention_days
 - Callback on rotation for triggering analysis
+- Optional writer thread: capture enqueues, disk writes happen off the capture path
+- Rotation swaps in a pre-opened file; the old one is closed in the background
+- Pre-opened files live under a temporary name (PART_SUFFIX) until swapped in
 """
 
 import os
+import shutil
 import threading
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, NamedTuple
 
-from .pcap_writer import PcapWriter
+from .pcap_writer import PcapWriter, MmapPcapWriter
 from .decoder import PacketInfo
+from .spsc import SPSCRing
 from .constants import DEFAULT_SNAPLEN, DEFAULT_RETENTION_DAYS
 
 logger = logging.getLogger(__name__)
 
+WRITER_QUEUE_SIZE = 1024        # Batches/packets in flight to the writer thread
+WRITER_SPIN = 64                # Empty polls before the writer thread sleeps
+WRITER_IDLE_WAIT = 0.1          # Writer thread sleep between wakeups (seconds)
+WRITER_COALESCE = 32            # Queued batches merged into one writev sequence
+FLUSH_DRAIN_TIMEOUT = 5.0       # flush() wait for the writer thread to catch up (seconds)
+FLUSH_DRAIN_POLL = 0.005        # flush() poll interval while waiting (seconds)
+
+ROTATE_CALLBACK_WORKERS = 2     # Threads running on_rotate callbacks
+ROTATE_CALLBACK_BACKLOG = 8     # Callbacks queued or running before a backlog warning
+
+PART_SUFFIX = '.part'           # Pre-opened next-hour file, renamed when swapped in
+
+
+class RotatorFileState(NamedTuple):
+    """Current file as seen by status readers, replaced whole on open/close"""
+    filepath: Optional[str] = None
+    hour: Optional[datetime] = None
+    next_rotate: Optional[datetime] = None
+
 
 class HourlyRotator:
     """
@@ -33,7 +59,10 @@ class HourlyRotator:
         snaplen: int = DEFAULT_SNAPLEN,
         retention_days: int = DEFAULT_RETENTION_DAYS,
         on_rotate: Optional[Callable[[str, str, str], None]] = None,
-        batch_size: int = 100
+        batch_size: int = 100,
+        threaded: bool = False,
+        queue_size: int = WRITER_QUEUE_SIZE,
+        preallocate: int = 0
     ):
         """
         Args:
@@ -41,8 +70,15 @@ class HourlyRotator:
             interface: Network interface name (used in filename)
             snaplen: Max packet capture length
             retention_days: Days to keep old files (0 = keep forever)
-            on_rotate: Callback(old_file, interface, time_window) when rotation occurs
+            on_rotate: Callback(old_file, interface, time_window) when rotation occurs,
+                run on a small thread pool so it never blocks writes
             batch_size: Packets per batch write
+            threaded: Hand writes to a dedicated writer thread; write_packet
+                and write_batch then only enqueue (single producer only)
+            queue_size: Writer thread queue capacity (entries, not packets)
+            preallocate: > 0 writes through MmapPcapWriter, growing each file
+                this many bytes at a time (the open hour's file is then
+                zero-padded until rotation trims it)
         """
         self.base_dir = Path(base_dir)
         self.interface = interface
@@ -50,17 +86,57 @@ class HourlyRotator:
         self.retention_days = retention_days
         self.on_rotate = on_rotate
         self.batch_size = batch_size
+        self.preallocate = preallocate
         
         self._current_writer: Optional[PcapWriter] = None
         self._current_filepath: Optional[Path] = None
+        self._current_filepath_str: Optional[str] = None  # str(_current_filepath), built once
         self._current_hour: Optional[datetime] = None
+        self._current_time_window: Optional[str] = None   # YYYY-MM-DD_HH of _current_hour
+        
+        # Published for lock-free status reads: one attribute load gives a
+        # consistent (file, hour, next rotation) even mid-rotation
+        self._state = RotatorFileState()
         self._next_rotate_time: Optional[datetime] = None
+        self._next_rotate_epoch = 0     # _next_rotate_time as epoch seconds
         
         self._lock = threading.Lock()
+        self._next_file: Optional[tuple] = None     # (hour, opened writer on a PART_SUFFIX name)
         self._packet_count = 0
         self._byte_count = 0
         self._file_count = 0
         self._closed = False
+        
+        # Writer thread: capture thread pushes, writer thread pops. Shutdown
+        # is a flag, not a queued sentinel: only the capture thread may push
+        self._queue: Optional[SPSCRing] = None
+        self._wakeup = threading.Event()
+        self._writer_stop = threading.Event()
+        self._writer_idle = False
+        self._queue_dropped = 0
+        self._queued_items = 0          # Written by the capture thread only
+        self._written_items = 0         # Written by the writer thread only
+        self._writer_thread: Optional[threading.Thread] = None
+        self._cleanup_thread: Optional[threading.Thread] = None
+        
+        # on_rotate callbacks: unbounded queue on a thread pool (one per hour,
+        # never dropped); a backlog past ROTATE_CALLBACK_BACKLOG is logged
+        self._cb_pool: Optional[ThreadPoolExecutor] = None
+        self._cb_lock = threading.Lock()
+        self._cb_pending = 0
+        if on_rotate:
+            self._cb_pool = ThreadPoolExecutor(
+                max_workers=ROTATE_CALLBACK_WORKERS, thread_name_prefix="rotate-cb"
+            )
+        # Rotation: old file closed and next hour's file opened off the write path
+        self._remove_stale_parts()
+        self._close_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rotate-close")
+        if threaded:
+            self._queue = SPSCRing(queue_size)
+            self._writer_thread = threading.Thread(
+                target=self._drain_loop, name="PcapWriter", daemon=True
+            )
+            self._writer_thread.start()
     
     def _get_hour_start(self, dt: datetime) -> datetime:
         """Get start of hour (HH:00:00)"""
@@ -75,8 +151,7 @@ class HourlyRotator:
         Generate filepath for given datetime
         Format: base_dir/YYYY-MM-DD/{interface}_{YYYY-MM-DD}_{HH}.pcap
         """
-        date_str = dt.strftime('%Y-%m-%d')
-        hour_str = dt.strftime('%H')
+        date_str, hour_str = dt.strftime('%Y-%m-%d %H').split()
         filename = f"{self.interface}_{date_str}_{hour_str}.pcap"
         
         date_dir = self.base_dir / date_str
@@ -86,115 +161,411 @@ class HourlyRotator:
         """Get time window string: YYYY-MM-DD_HH"""
         return dt.strftime('%Y-%m-%d_%H')
     
+    def _new_writer(self, filepath: Path) -> PcapWriter:
+        """Create and open a writer for filepath (directory created if needed)"""
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if self.preallocate > 0:
+            writer = MmapPcapWriter(
+                str(filepath),
+                snaplen=self.snaplen,
+                batch_size=self.batch_size,
+                prealloc=self.preallocate
+            )
+        else:
+            writer = PcapWriter(
+                str(filepath),
+                snaplen=self.snaplen,
+                batch_size=self.batch_size
+            )
+        writer.open()
+        return writer
+    
     def _open_new_file(self, dt: datetime):
-        """Open new PCAP file for given hour"""
+        """Open new PCAP file for given hour, taking the pre-opened one if it matches"""
         self._current_hour = self._get_hour_start(dt)
         self._next_rotate_time = self._get_next_hour(dt)
+        self._next_rotate_epoch = int(self._next_rotate_time.timestamp())
         self._current_filepath = self._get_filepath(dt)
+        self._current_filepath_str = filepath = str(self._current_filepath)
+        self._current_time_window = self._get_time_window(dt)
         
-        # Create directory if needed
-        self._current_filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Open new writer
-        self._current_writer = PcapWriter(
-            str(self._current_filepath),
-            snaplen=self.snaplen,
-            batch_size=self.batch_size
-        )
-        self._current_writer.open()
+        prepared, self._next_file = self._next_file, None
+        if prepared is not None and prepared[0] == self._current_hour:
+            self._current_writer = self._adopt_file(prepared[1], self._current_filepath)
+        else:
+            if prepared is not None:
+                # Packets skipped past the prepared hour
+                self._discard_file(prepared[1])
+            self._current_writer = self._new_writer(self._current_filepath)
         self._file_count += 1
+        self._state = RotatorFileState(
+            filepath, self._current_hour, self._next_rotate_time
+        )
+        
+        logger.info(f"Opened new PCAP: {filepath}")
         
-        logger.info(f"Opened new PCAP: {self._current_filepath}")
+        # Open the following hour's file now, so rotation is a rename + swap.
+        # Not with preallocate: that would reserve a whole chunk an hour early
+        if self.preallocate <= 0:
+            try:
+                self._close_pool.submit(self._prepare_next_file)
+            except RuntimeError:
+                pass    # Closing
+    
+    def _part_path(self, hour: datetime) -> Path:
+        """
+        Temporary path of a pre-opened file: hidden, in base_dir, so neither
+        the date directory nor a *.pcap name exists before its hour starts
+        """
+        return self.base_dir / f".{self._get_filepath(hour).name}{PART_SUFFIX}"
+    
+    def _prepare_next_file(self):
+        """Close pool: open the file for the hour after the current one"""
+        with self._lock:
+            hour = self._next_rotate_time
+            if self._closed or hour is None or self._next_file is not None:
+                return
+            try:
+                self._next_file = (hour, self._new_writer(self._part_path(hour)))
+            except OSError as e:
+                logger.warning(f"Could not pre-open next PCAP: {e}")
+    
+    def _adopt_file(self, writer: PcapWriter, filepath: Path) -> PcapWriter:
+        """Move a pre-opened file to its final name; fall back to a fresh file"""
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(writer.filepath, filepath)
+        except OSError as e:
+            logger.warning(f"Could not rename pre-opened PCAP: {e}")
+            self._discard_file(writer)
+            return self._new_writer(filepath)
+        writer.filepath = filepath
+        return writer
+    
+    def _discard_file(self, writer: PcapWriter):
+        """Close and remove a pre-opened file that never got a packet"""
+        try:
+            writer.close()
+            os.unlink(writer.filepath)
+        except OSError:
+            pass
+    
+    def _remove_stale_parts(self):
+        """Remove pre-opened files a crashed run left behind (this interface only)"""
+        prefix = f".{self.interface}_"
+        try:
+            with os.scandir(self.base_dir) as it:
+                stale = [
+                    entry.path for entry in it
+                    if entry.name.startswith(prefix) and entry.name.endswith(PART_SUFFIX)
+                ]
+        except OSError:
+            return
+        for path in stale:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _detach_current_file(self) -> tuple:
+        """Take the current file off the write path, return (writer, filepath)"""
+        writer = self._current_writer
+        if writer is None:
+            return None, None
+        old_path = self._current_filepath_str
+        self._current_writer = None
+        self._current_filepath = None
+        self._current_filepath_str = None
+        self._state = self._state._replace(filepath=None)
+        return writer, old_path
     
     def _close_current_file(self) -> Optional[str]:
         """Close current file, return filepath if closed"""
-        if self._current_writer:
-            self._current_writer.close()
-            old_path = str(self._current_filepath)
-            self._current_writer = None
-            self._current_filepath = None
-            return old_path
-        return None
+        writer, old_path = self._detach_current_file()
+        if writer is not None:
+            writer.close()
+        return old_path
     
     def _do_rotate(self, now: datetime):
-        """Perform rotation: close old, open new, trigger callback, cleanup"""
-        old_hour = self._current_hour
-        old_path = self._close_current_file()
+        """Perform rotation: swap to the new file, close old + callback in background, cleanup"""
+        old_window = self._current_time_window
+        old_writer, old_path = self._detach_current_file()
         
-        # Open new file
+        # Open new file (usually already opened by _prepare_next_file)
         self._open_new_file(now)
         
-        # Trigger callback
-        if old_path and self.on_rotate and old_hour:
+        # Flush/close the old file, then trigger callback, off the write path
+        if old_writer is not None:
             try:
-                time_window = self._get_time_window(old_hour)
-                self.on_rotate(old_path, self.interface, time_window)
-            except Exception as e:
-                logger.error(f"Rotation callback error: {e}")
+                self._close_pool.submit(self._finish_file, old_writer, old_path, old_window)
+            except RuntimeError:
+                # Pool already shut down
+                self._finish_file(old_writer, old_path, old_window)
         
-        # Cleanup old files
+        # Cleanup old files, off the write path
         if self.retention_days > 0:
-            self._cleanup_old_files()
+            self._start_cleanup(now)
+    
+    def _finish_file(self, writer: PcapWriter, old_path: str, time_window: Optional[str]):
+        """Close pool: close a rotated-out file, then queue on_rotate for it"""
+        try:
+            writer.close()
+        except Exception as e:
+            logger.error(f"Error closing {old_path}: {e}")
+            return
+        if self.on_rotate and time_window:
+            self._submit_callback(old_path, time_window)
+    
+    def _submit_callback(self, old_path: str, time_window: str):
+        """Queue on_rotate on the callback pool (warns when the backlog grows)"""
+        with self._cb_lock:
+            self._cb_pending += 1
+            pending = self._cb_pending
+        if pending > ROTATE_CALLBACK_BACKLOG:
+            logger.warning(f"Rotation callback backlog at {pending}, queueing: {old_path}")
+        try:
+            self._cb_pool.submit(self._run_callback, old_path, time_window)
+        except RuntimeError:
+            # Pool already shut down: run it here rather than lose it
+            self._run_callback(old_path, time_window)
+    
+    def _run_callback(self, old_path: str, time_window: str):
+        """Callback pool worker: run on_rotate, update the backlog count"""
+        try:
+            self.on_rotate(old_path, self.interface, time_window)
+        except Exception as e:
+            logger.error(f"Rotation callback error: {e}")
+        finally:
+            with self._cb_lock:
+                self._cb_pending -= 1
     
-    def _cleanup_old_files(self):
-        """Remove files older than retention_days"""
+    def _start_cleanup(self, now: datetime):
+        """Run _cleanup_old_files on a background thread (one at a time)"""
+        thread = self._cleanup_thread
+        if thread is not None and thread.is_alive():
+            return
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_old_files, args=(now,), name="PcapCleanup", daemon=True
+        )
+        self._cleanup_thread.start()
+    
+    def _cleanup_old_files(self, now: Optional[datetime] = None):
+        """Remove date directories older than retention_days before now (packet time)"""
         if self.retention_days <= 0:
             return
         
-        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        cutoff = (now or datetime.now()) - timedelta(days=self.retention_days)
         cutoff_date_str = cutoff.strftime('%Y-%m-%d')
         
         try:
-            for date_dir in self.base_dir.iterdir():
-                if not date_dir.is_dir():
-                    continue
-                
-                # Parse directory date
-                try:
-                    dir_date_str = date_dir.name
-                    if dir_date_str < cutoff_date_str:
-                        # Remove entire directory
-                        for f in date_dir.iterdir():
-                            f.unlink()
-                        date_dir.rmdir()
-                        logger.info(f"Cleaned up old directory: {date_dir}")
-                except (ValueError, OSError) as e:
-                    logger.warning(f"Cleanup error for {date_dir}: {e}")
-        except Exception as e:
+            with os.scandir(self.base_dir) as it:
+                old_dirs = [
+                    entry.path for entry in it
+                    if entry.name < cutoff_date_str and entry.is_dir(follow_symlinks=False)
+                ]
+        except OSError as e:
             logger.error(f"Cleanup error: {e}")
+            return
+        
+        for date_dir in old_dirs:
+            try:
+                shutil.rmtree(date_dir)
+                logger.info(f"Cleaned up old directory: {date_dir}")
+            except OSError as e:
+                logger.warning(f"Cleanup error for {date_dir}: {e}")
+    
+    def _enqueue(self, item) -> bool:
+        """Push item to the writer thread, waking it if it sleeps"""
+        if not self._queue.try_push(item):
+            return False
+        self._queued_items += 1
+        if self._writer_idle:
+            self._wakeup.set()
+        return True
+    
+    def _drain_loop(self):
+        """
+        Writer thread: pop queued packets/batches and write them
+        Polls the queue WRITER_SPIN times before sleeping on the event, so a
+        bursty producer rarely has to pay for a wakeup. Exits once
+        _writer_stop is set and the queue is empty
+        """
+        queue = self._queue
+        try_pop = queue.try_pop
+        wakeup = self._wakeup
+        stop_requested = self._writer_stop.is_set
+        
+        while True:
+            item = try_pop()
+            if item is None:
+                for _ in range(WRITER_SPIN):
+                    item = try_pop()
+                    if item is not None:
+                        break
+                else:
+                    # Idle flag before the re-check: a push after this point sets the event
+                    wakeup.clear()
+                    self._writer_idle = True
+                    # Stop read before the re-check: pushes made before stop was set are seen
+                    stopping = stop_requested()
+                    item = try_pop()
+                    if item is None:
+                        if stopping:
+                            self._writer_idle = False
+                            return
+                        wakeup.wait(WRITER_IDLE_WAIT)
+                    self._writer_idle = False
+                    if item is None:
+                        continue
+            
+            # Coalesce the batches that queued up behind this one
+            batches = []
+            while item is not None and not isinstance(item, tuple):
+                batches.append(item)
+                if len(batches) >= WRITER_COALESCE:
+                    item = None
+                    break
+                item = try_pop()
+            
+            try:
+                if batches:
+                    self._write_batches_now(batches)
+                if isinstance(item, tuple):
+                    self._write_packet_now(*item)
+            except Exception as e:
+                logger.error(f"Writer thread error: {e}")
+            finally:
+                self._written_items += len(batches) + (item is not None)
+    
+    def _stop_writer(self):
+        """
+        Ask the writer thread to stop and wait for it to drain the queue
+        Called after _closed is set, so write_packet/write_batch stop pushing;
+        the ring keeps its single producer (the capture thread)
+        """
+        thread = self._writer_thread
+        if thread is None:
+            return
+        self._writer_stop.set()
+        self._wakeup.set()
+        thread.join()
+        self._writer_thread = None
     
     def write_packet(self, ts_sec: int, ts_usec: int, data: bytes, origlen: int = None):
         """
         Write packet, rotating file if hour boundary crossed
+        Threaded: data is copied and queued, the writer thread does the rest
         """
         if self._closed:
             return
+        if self._queue is not None:
+            if not self._enqueue((ts_sec, ts_usec, bytes(data), origlen)):
+                self._queue_dropped += 1
+            return
+        self._write_packet_now(ts_sec, ts_usec, data, origlen)
+    
+    def _write_packet_now(self, ts_sec: int, ts_usec: int, data: bytes, origlen: int = None):
+        """
+        Write packet on the calling thread
+        Fast path (file open, packet before the next hour) takes no rotator
+        lock: PcapWriter serialises its own appends against close()
+        """
+        writer = self._current_writer
+        if writer is None or ts_sec >= self._next_rotate_epoch:
+            writer = self._handle_rotate(ts_sec)
+            if writer is None:
+                return
         
+        writer.write_packet(ts_sec, ts_usec, data, origlen)
+        self._packet_count += 1
+        self._byte_count += len(data)
+    
+    def _handle_rotate(self, ts_sec: int) -> Optional[PcapWriter]:
+        """
+        Open the first file or rotate for a packet at ts_sec, return the writer
+        The packet timestamp drives rotation, so replays land in their own hours
+        """
         with self._lock:
-            now = datetime.now()
-            
-            # Check if need to rotate
             if self._current_writer is None:
-                self._open_new_file(now)
-            elif now >= self._next_rotate_time:
-                self._do_rotate(now)
-            
-            # Write packet
-            if self._current_writer:
-                self._current_writer.write_packet(ts_sec, ts_usec, data, origlen)
-                self._packet_count += 1
-                self._byte_count += len(data)
+                # Closed (and the writer thread, if any, drained): no new file
+                if self._closed and self._writer_thread is None:
+                    return None
+                self._open_new_file(datetime.fromtimestamp(ts_sec))
+            elif ts_sec >= self._next_rotate_epoch:
+                self._do_rotate(datetime.fromtimestamp(ts_sec))
+            return self._current_writer
     
     def write_packet_info(self, pkt_info: PacketInfo):
         """Write PacketInfo object"""
-        origlen = pkt_info.origlen if pkt_info.origlen else len(pkt_info.data)
-        self.write_packet(pkt_info.ts_sec, pkt_info.ts_usec, pkt_info.data, origlen)
+        self.write_packet(pkt_info.ts_sec, pkt_info.ts_usec, pkt_info.data, pkt_info.origlen)
+    
+    def write_batch(self, batch):
+        """
+        Write a PacketBatch, rotating file if hour boundary crossed
+        Threaded: a batch borrowing ring memory is detached first, since the
+        ring block goes back to the kernel before the writer thread gets to it
+        """
+        if self._closed or not batch.count:
+            return
+        if self._queue is not None:
+            if not self._enqueue(batch.detach() if batch.borrowed else batch):
+                self._queue_dropped += batch.count
+            return
+        self._write_batch_now(batch)
+    
+    def _write_batch_now(self, batch):
+        """
+        Write a PacketBatch on the calling thread
+        Rotation is checked once per batch; same lock-free fast path as
+        _write_packet_now
+        """
+        self._write_batches_now((batch,))
+    
+    def _write_batches_now(self, batches):
+        """
+        Write PacketBatches as one writev sequence
+        A batch goes to the hour of its first packet; if the last batch
+        starts past the boundary they are written one by one instead
+        """
+        writer = self._current_writer
+        if writer is None or batches[-1].ts_sec[0] >= self._next_rotate_epoch:
+            if len(batches) > 1:
+                for batch in batches:
+                    self._write_batches_now((batch,))
+                return
+            writer = self._handle_rotate(batches[0].ts_sec[0])
+            if writer is None:
+                return
+        
+        writer.write_batches(batches)
+        self._packet_count += sum(batch.count for batch in batches)
+        self._byte_count += sum(batch.nbytes for batch in batches)
     
-    def flush(self):
-        """Force flush current file"""
+    def flush(self, timeout: float = FLUSH_DRAIN_TIMEOUT) -> bool:
+        """
+        Force flush current file
+        Threaded: first waits (up to timeout) for the writer thread to write
+        everything queued before the call. Returns False if it did not catch up
+        """
+        drained = self._wait_drained(timeout)
         with self._lock:
             if self._current_writer:
                 self._current_writer.flush()
+        return drained
+    
+    def _wait_drained(self, timeout: float) -> bool:
+        """Wait until the writer thread has written every item queued so far"""
+        thread = self._writer_thread
+        if thread is None:
+            return True
+        target = self._queued_items
+        deadline = time.monotonic() + timeout
+        while self._written_items < target:
+            if time.monotonic() >= deadline or not thread.is_alive():
+                return False
+            self._wakeup.set()
+            time.sleep(FLUSH_DRAIN_POLL)
+        return True
     
     def force_rotate(self):
         """Force rotation now (for graceful shutdown)"""
@@ -203,35 +574,47 @@ class HourlyRotator:
                 self._do_rotate(datetime.now())
     
     def close(self):
-        """Close current file"""
+        """
+        Close current file (threaded: after the writer thread drains its queue)
+        Stop the capture producer first; later writes are dropped, not queued
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_writer()
+        
+        # Rotated-out files finish closing (and queue their callbacks) first
+        self._close_pool.shutdown(wait=True)
+        
         with self._lock:
-            if self._closed:
-                return
-            self._closed = True
             
-            old_hour = self._current_hour
+            old_window = self._current_time_window
             old_path = self._close_current_file()
+            prepared, self._next_file = self._next_file, None
             
             # Trigger final callback
-            if old_path and self.on_rotate and old_hour:
-                try:
-                    time_window = self._get_time_window(old_hour)
-                    self.on_rotate(old_path, self.interface, time_window)
-                except Exception as e:
-                    logger.error(f"Final rotation callback error: {e}")
+            if old_path and self.on_rotate and old_window:
+                self._submit_callback(old_path, old_window)
+        
+        if prepared is not None:
+            self._discard_file(prepared[1])
+        
+        # Let queued callbacks (the final one included) finish
+        if self._cb_pool is not None:
+            self._cb_pool.shutdown(wait=True)
     
     @property
     def current_filepath(self) -> Optional[str]:
         """Get current PCAP file path"""
-        return str(self._current_filepath) if self._current_filepath else None
+        return self._state.filepath
     
     @property
     def current_hour(self) -> Optional[datetime]:
-        return self._current_hour
+        return self._state.hour
     
     @property
     def next_rotate_time(self) -> Optional[datetime]:
-        return self._next_rotate_time
+        return self._state.next_rotate
     
     @property
     def packet_count(self) -> int:
@@ -245,15 +628,22 @@ class HourlyRotator:
     def file_count(self) -> int:
         return self._file_count
     
+    @property
+    def queue_dropped(self) -> int:
+        """Packets dropped because the writer thread queue was full"""
+        return self._queue_dropped
+    
     def get_status(self) -> dict:
-        """Get rotator status"""
+        """Get rotator status (no lock: reads the published file state)"""
+        state = self._state
         return {
-            "current_file": self.current_filepath,
-            "current_hour": self._current_hour.isoformat() if self._current_hour else None,
-            "next_rotate": self._next_rotate_time.isoformat() if self._next_rotate_time else None,
+            "current_file": state.filepath,
+            "current_hour": state.hour.isoformat() if state.hour else None,
+            "next_rotate": state.next_rotate.isoformat() if state.next_rotate else None,
             "packet_count": self._packet_count,
             "byte_count": self._byte_count,
             "file_count": self._file_count,
+            "queue_dropped": self._queue_dropped,
         }
     
     def __enter__(self):
@@ -268,6 +658,7 @@ def list_pcap_files(base_dir: str, interface: str = None,
                     date: str = None) -> List[dict]:
     """
     List PCAP files in base directory
+    One scandir pass per directory; each file is stat'ed once
     
     Args:
         base_dir: Base directory to search
@@ -275,61 +666,70 @@ def list_pcap_files(base_dir: str, interface: str = None,
         date: Filter by date YYYY-MM-DD (optional)
     
     Returns:
-        List of file info dicts
+        List of file info dicts, sorted by path (date directory, file name)
     """
-    base_path = Path(base_dir)
-    if not base_path.exists():
+    try:
+        with os.scandir(base_dir) as it:
+            date_dirs = [
+                entry for entry in it
+                if entry.is_dir() and (not date or entry.name == date)
+            ]
+    except OSError:
         return []
     
     results = []
     
-    for date_dir in sorted(base_path.iterdir()):
-        if not date_dir.is_dir():
-            continue
-        
-        # Filter by date
-        if date and date_dir.name != date:
+    for date_dir in date_dirs:
+        try:
+            with os.scandir(date_dir.path) as it:
+                for entry in it:
+                    name = entry.name
+                    # Skips pre-opened PART_SUFFIX files and other temporaries
+                    if name.startswith('.') or not name.endswith('.pcap'):
+                        continue
+                    
+                    # Parse filename: {interface}_{date}_{hour}.pcap
+                    parts = name[:-5].split('_')
+                    if len(parts) < 3:
+                        continue
+                    file_interface = '_'.join(parts[:-2])
+                    
+                    # Filter by interface
+                    if interface and file_interface != interface:
+                        continue
+                    
+                    st = entry.stat()
+                    results.append({
+                        "filepath": entry.path,
+                        "interface": file_interface,
+                        "date": parts[-2],
+                        "hour": parts[-1],
+                        "size_bytes": st.st_size,
+                        "mtime": datetime.fromtimestamp(st.st_mtime).isoformat(),
+                    })
+        except OSError:
             continue
-        
-        for pcap_file in sorted(date_dir.glob('*.pcap')):
-            # Parse filename: {interface}_{date}_{hour}.pcap
-            parts = pcap_file.stem.split('_')
-            if len(parts) >= 3:
-                file_interface = '_'.join(parts[:-2])
-                file_date = parts[-2]
-                file_hour = parts[-1]
-                
-                # Filter by interface
-                if interface and file_interface != interface:
-                    continue
-                
-                results.append({
-                    "filepath": str(pcap_file),
-                    "interface": file_interface,
-                    "date": file_date,
-                    "hour": file_hour,
-                    "size_bytes": pcap_file.stat().st_size,
-                    "mtime": datetime.fromtimestamp(pcap_file.stat().st_mtime).isoformat(),
-                })
     
+    # Same order as walking sorted directories and sorted file names
+    results.sort(key=lambda r: r["filepath"])
     return results
 
 
 def get_available_dates(base_dir: str) -> List[str]:
     """Get list of available dates in base directory"""
-    base_path = Path(base_dir)
-    if not base_path.exists():
+    try:
+        with os.scandir(base_dir) as it:
+            names = [entry.name for entry in it if entry.is_dir()]
+    except OSError:
         return []
     
     dates = []
-    for date_dir in sorted(base_path.iterdir()):
-        if date_dir.is_dir():
-            try:
-                # Validate date format
-                datetime.strptime(date_dir.name, '%Y-%m-%d')
-                dates.append(date_dir.name)
-            except ValueError:
-                pass
+    for name in sorted(names):
+        try:
+            # Validate date format
+            datetime.strptime(name, '%Y-%m-%d')
+            dates.append(name)
+        except ValueError:
+            pass
     
     return dates
-
@@ -0,0 +1,125 @@
+"""
+Single-Producer/Single-Consumer ring buffer
+- Power-of-two capacity, index masking instead of modulo
+- No locks: producer only writes tail, consumer only writes head
+- queue.Queue-compatible shims for existing callers
+"""
+
+import queue
+import time
+from typing import Any, Optional
+
+
+class SPSCRing:
+    """
+    Bounded lock-free ring between exactly one producer thread and one
+    consumer thread
+
+    Head/tail are free-running counters; each is written by one side only,
+    and a slot is published by storing the item before advancing tail.
+    None cannot be stored (it marks an empty slot).
+    """
+
+    def __init__(self, capacity: int):
+        cap = 1
+        while cap < capacity:
+            cap <<= 1
+
+        self._capacity = cap
+        self._mask = cap - 1
+        self._slots = [None] * cap
+        self._head = 0      # Next slot to read (consumer-owned)
+        self._tail = 0      # Next slot to write (producer-owned)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def size(self) -> int:
+        """Items in the ring; wait-free read of the two counters, may be stale by one"""
+        return self._tail - self._head
+
+    def try_push(self, item: Any) -> bool:
+        """Producer: enqueue item, return False if ring is full"""
+        tail = self._tail
+        if tail - self._head >= self._capacity:
+            return False
+        self._slots[tail & self._mask] = item
+        self._tail = tail + 1
+        return True
+
+    def try_pop(self) -> Optional[Any]:
+        """Consumer: dequeue item, return None if ring is empty"""
+        head = self._head
+        if head == self._tail:
+            return None
+        idx = head & self._mask
+        item = self._slots[idx]
+        self._slots[idx] = None
+        self._head = head + 1
+        return item
+
+    def clear(self) -> int:
+        """
+        Consumer: drop everything published so far, return how many items
+        Head jumps straight to tail; only the dropped slots are nulled so an
+        item the producer is publishing concurrently is left alone.
+        """
+        head = self._head
+        tail = self._tail
+        n = tail - head
+        if not n:
+            return 0
+
+        cap = self._capacity
+        start = head & self._mask
+        end = start + n
+        if end <= cap:
+            self._slots[start:end] = [None] * n
+        else:
+            self._slots[start:] = [None] * (cap - start)
+            self._slots[:end - cap] = [None] * (end - cap)
+        self._head = tail
+        return n
+
+    # queue.Queue compatibility
+
+    def put_nowait(self, item: Any):
+        if not self.try_push(item):
+            raise queue.Full
+
+    def get_nowait(self) -> Any:
+        item = self.try_pop()
+        if item is None:
+            raise queue.Empty
+        return item
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Consumer: dequeue, polling until timeout if empty"""
+        item = self.try_pop()
+        if item is not None or not block:
+            if item is None:
+                raise queue.Empty
+            return item
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(0.001)
+            item = self.try_pop()
+            if item is not None:
+                return item
+            if deadline is not None and time.monotonic() >= deadline:
+                raise queue.Empty
+
+    def qsize(self) -> int:
+        return self._tail - self._head
+
+    def empty(self) -> bool:
+        return self._tail == self._head
+
+    def full(self) -> bool:
+        return self._tail - self._head >= self._capacity
+
+    def __len__(self) -> int:
+        return self._tail - self._head
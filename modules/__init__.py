@@ -1,4 +1,8 @@
 # Analysis modules
-from .base import BaseModule
+from .base import BaseModule, analysis_module
 from .runner import ModuleRunner
 
+# Subpackages that contain analysis modules; discover_modules() imports only
+# these (delete to fall back to scanning the directory)
+__modules__ = ["dummy"]
+
@@ -3,20 +3,84 @@ Base Module - Abstract base class for analysis modules
 - Defines interface for analysis plugins
 - Provides common utilities
 - Output format specifications
+- JSON encoded with orjson when installed, stdlib json otherwise
 """
 
+import sys
 import json
+import mmap
 import logging
+from json.encoder import encode_basestring
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Type
+
+try:
+    import orjson
+    # Non-str dict keys (e.g. int ports in details) become strings, as in json.dumps
+    _ORJSON_OPT = orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    _ORJSON_OPT = 0
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:
+    def mypyc_attr(*attrs, **kwattrs):  # type: ignore[misc]
+        """No-op stand-in when mypy_extensions is not installed"""
+        return lambda cls: cls
 
 logger = logging.getLogger(__name__)
 
+# Output file buffer: detections are written in 1 MiB chunks
+JSONL_BUFFER_SIZE = 1 << 20
+
+# Slotted dataclasses need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _orjson_dumps(obj: Any, option: int = 0) -> Optional[bytes]:
+    """
+    orjson.dumps, or None where orjson cannot encode obj (e.g. ints past
+    64 bits) and the caller falls back to stdlib json
+    """
+    try:
+        return orjson.dumps(obj, option=_ORJSON_OPT | option)
+    except TypeError:
+        return None
+
 
-@dataclass
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 JSON (orjson if available; both paths give the same bytes)"""
+    if orjson is not None:
+        data = _orjson_dumps(obj)
+        if data is not None:
+            return data
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps_line(obj: Any) -> bytes:
+    """dumps_bytes() plus the trailing newline of a JSONL record"""
+    if orjson is not None:
+        data = _orjson_dumps(obj, orjson.OPT_APPEND_NEWLINE)
+        if data is not None:
+            return data
+    return (json.dumps(obj, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+# Fixed Detection fields, pre-encoded: the stdlib fallback formats records
+# into this instead of building a dict for json.dumps (orjson on the dict
+# is faster still, so it keeps the dict path)
+_DETECTION_FIELDS = frozenset(('stt', 'ts_sec', 'label', 'src', 'dst', 'sport', 'dport', 'proto'))
+_DETECTION_TEMPLATE = (
+    '{"stt":%d,"ts_sec":%d,"label":%s,"src":%s,"dst":%s,'
+    '"sport":%d,"dport":%d,"proto":%s'
+)
+
+
+@dataclass(**_SLOTS)
 class Detection:
     """Single detection/finding from analysis"""
     stt: int                    # Packet sequence number
@@ -43,10 +107,37 @@ class Detection:
         }
     
     def to_json_line(self) -> str:
-        return json.dumps(self.to_dict(), ensure_ascii=False)
+        return self.to_jsonl()[:-1].decode('utf-8')
+    
+    def to_json_bytes(self) -> bytes:
+        return self.to_jsonl()[:-1]
+    
+    def to_jsonl(self) -> bytes:
+        """JSONL record: compact JSON object plus newline"""
+        details = self.details
+        if orjson is not None or not _DETECTION_FIELDS.isdisjoint(details):
+            return dumps_line(self.to_dict())
+        
+        text = _DETECTION_TEMPLATE % (
+            self.stt, self.ts_sec, encode_basestring(self.label),
+            encode_basestring(self.src), encode_basestring(self.dst),
+            self.sport, self.dport, encode_basestring(self.proto),
+        )
+        parts = [text]
+        for key, value in details.items():
+            kind = type(value) if type(key) is str else None
+            if kind is int:
+                parts.append(',%s:%d' % (encode_basestring(key), value))
+            elif kind is str:
+                parts.append(',%s:%s' % (encode_basestring(key), encode_basestring(value)))
+            else:
+                # Other keys/values: the full encoder ('{"k":v}' -> ',"k":v')
+                parts.append(',' + json.dumps({key: value}, ensure_ascii=False, separators=(',', ':'))[1:-1])
+        parts.append('}\n')
+        return ''.join(parts).encode('utf-8')
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Summary:
     """Analysis summary for a time window"""
     module_name: str
@@ -93,9 +184,16 @@ class Summary:
         }
     
     def to_json(self, indent: int = 2) -> str:
-        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+        data = self.to_dict()
+        if orjson is not None and indent == 2:
+            encoded = _orjson_dumps(data, orjson.OPT_INDENT_2)
+            if encoded is not None:
+                return encoded.decode('utf-8')
+        return json.dumps(data, indent=indent, ensure_ascii=False)
 
 
+# Compiled with mypyc (setup.py SNIFF_MYPYC=1), modules still subclass it
+@mypyc_attr(allow_interpreted_subclasses=True)
 class BaseModule(ABC):
     """
     Abstract base class for analysis modules
@@ -104,6 +202,9 @@ class BaseModule(ABC):
     Implement the `name` property and `analyze()` method.
     """
     
+    # True if analyze() takes pcap_mmap= (the job's shared read-only mapping)
+    accepts_pcap_mmap = False
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -130,6 +231,7 @@ class BaseModule(ABC):
         output_dir: str,
         interface: str,
         time_window: str,
+        pcap_mmap: Optional[mmap.mmap] = None,
     ) -> Summary:
         """
         Analyze a PCAP file and write results
@@ -139,6 +241,8 @@ class BaseModule(ABC):
             output_dir: Directory to write output files
             interface: Network interface name
             time_window: Time window string (YYYY-MM-DD_HH)
+            pcap_mmap: pcap_path already mapped by the runner, shared by all
+                modules of the job; only passed if accepts_pcap_mmap is True
         
         Returns:
             Summary object with analysis results
@@ -170,8 +274,15 @@ class BaseModule(ABC):
         summary_path = output_dir / f"{basename}.summary.json"
         
         try:
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                f.write(summary.to_json())
+            data = summary.to_dict()
+            encoded = _orjson_dumps(data, orjson.OPT_INDENT_2) if orjson is not None else None
+            if encoded is not None:
+                with open(summary_path, 'wb') as f:
+                    f.write(encoded)
+            else:
+                # Stream into the file buffer instead of building the whole string
+                with open(summary_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             logger.info(f"Wrote summary: {summary_path}")
         except Exception as e:
             logger.error(f"Error writing summary: {e}")
@@ -184,9 +295,8 @@ class BaseModule(ABC):
         index_path = output_dir / f"{basename}.index.jsonl"
         
         try:
-            with open(index_path, 'w', encoding='utf-8') as f:
-                for det in detections:
-                    f.write(det.to_json_line() + '\n')
+            with open(index_path, 'wb', buffering=JSONL_BUFFER_SIZE) as f:
+                f.writelines(det.to_jsonl() for det in detections)
             logger.info(f"Wrote {len(detections)} detections: {index_path}")
         except Exception as e:
             logger.error(f"Error writing detections: {e}")
@@ -197,7 +307,7 @@ class BaseModule(ABC):
         interface: str,
         time_window: str,
         summary: Summary,
-        detections: List[Detection] = None,
+        detections: Optional[List[Detection]] = None,
     ):
         """
         Write all output files for this analysis
@@ -218,6 +328,17 @@ class BaseModule(ABC):
         return f"<{self.__class__.__name__} name={self.name} version={self.version}>"
 
 
+# Module classes registered with @analysis_module, in definition order
+_REGISTRY: List[Type[BaseModule]] = []
+
+
+def analysis_module(cls: Type[BaseModule]) -> Type[BaseModule]:
+    """Class decorator: register cls for ModuleRunner.discover_modules()"""
+    if cls not in _REGISTRY:
+        _REGISTRY.append(cls)
+    return cls
+
+
 def read_summary(filepath: str) -> Optional[Summary]:
     """Read summary from JSON file"""
     try:
@@ -245,37 +366,46 @@ def read_summary(filepath: str) -> Optional[Summary]:
         return None
 
 
-def read_detections(filepath: str) -> List[Detection]:
-    """Read detections from JSONL file"""
-    detections = []
+def iter_detection_dicts(filepath: str) -> Iterator[dict]:
+    """
+    Yield each detection of a JSONL file as a plain dict, lazily
+    (orjson.loads when available); lines that are not JSON objects are skipped
+    """
+    loads = orjson.loads if orjson is not None else json.loads
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(filepath, 'rb') as f:
             for line in f:
-                line = line.strip()
-                if not line:
+                if not line.strip():
                     continue
-                
                 try:
-                    data = json.loads(line)
-                    det = Detection(
-                        stt=data.get('stt', 0),
-                        ts_sec=data.get('ts_sec', 0),
-                        label=data.get('label', ''),
-                        src=data.get('src', ''),
-                        dst=data.get('dst', ''),
-                        sport=data.get('sport', 0),
-                        dport=data.get('dport', 0),
-                        proto=data.get('proto', ''),
-                        details={k: v for k, v in data.items() 
-                                if k not in ('stt', 'ts_sec', 'label', 'src', 'dst', 'sport', 'dport', 'proto')}
-                    )
-                    detections.append(det)
-                except json.JSONDecodeError:
+                    data = loads(line)
+                except ValueError:
                     continue
+                if type(data) is dict:
+                    yield data
+    except OSError as e:
+        logger.error(f"Error reading detections {filepath}: {e}")
+
+
+def read_detections(filepath: str) -> List[Detection]:
+    """Read detections from JSONL file"""
+    detections = []
     
+    try:
+        for data in iter_detection_dicts(filepath):
+            detections.append(Detection(
+                stt=data.get('stt', 0),
+                ts_sec=data.get('ts_sec', 0),
+                label=data.get('label', ''),
+                src=data.get('src', ''),
+                dst=data.get('dst', ''),
+                sport=data.get('sport', 0),
+                dport=data.get('dport', 0),
+                proto=data.get('proto', ''),
+                details={k: v for k, v in data.items() if k not in _DETECTION_FIELDS}
+            ))
     except Exception as e:
         logger.error(f"Error reading detections {filepath}: {e}")
     
     return detections
-
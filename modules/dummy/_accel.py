@@ -0,0 +1,102 @@
+"""
+Dummy module accelerators
+- Per-source flow statistics over DecodedBatch columns
+- Compiled with numba when it is installed, NumPy or plain Python otherwise
+"""
+
+from collections import Counter
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+from core.batch import DecodedBatch
+from core.constants import ETHERTYPE_IP
+
+HAVE_NUMBA = np is not None and njit is not None
+
+# (src_ip, unique non-zero dst ports, packets) per IPv4 source
+SourceStats = List[Tuple[int, int, int]]
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _scan_flows(ethertype, srcs, dports):
+        n = srcs.shape[0]
+        keys = np.empty(n, dtype=np.uint64)
+        k = 0
+        for i in range(n):
+            if ethertype[i] == ETHERTYPE_IP:
+                keys[k] = (np.uint64(srcs[i]) << np.uint64(16)) | np.uint64(dports[i])
+                k += 1
+        keys = np.sort(keys[:k])
+
+        # Sorted keys: one run per source, equal keys adjacent
+        out_src = np.empty(k, dtype=np.uint32)
+        out_ports = np.zeros(k, dtype=np.int64)
+        out_pkts = np.zeros(k, dtype=np.int64)
+        m = -1
+        for j in range(k):
+            key = keys[j]
+            src = np.uint32(key >> np.uint64(16))
+            if m < 0 or src != out_src[m]:
+                m += 1
+                out_src[m] = src
+            elif key == keys[j - 1]:
+                out_pkts[m] += 1
+                continue
+            out_pkts[m] += 1
+            if key & np.uint64(0xFFFF):
+                out_ports[m] += 1
+        m += 1
+        return out_src[:m], out_ports[:m], out_pkts[:m]
+
+
+def _scan_flows_numpy(ethertype, srcs, dports) -> SourceStats:
+    ipv4 = ethertype == ETHERTYPE_IP
+    srcs = srcs[ipv4]
+    ports = dports[ipv4]
+    uniq_srcs, pkts = np.unique(srcs, return_counts=True)
+
+    keys = np.unique((srcs[ports != 0].astype(np.uint64) << 16) | ports[ports != 0])
+    scan_srcs, scan_counts = np.unique(keys >> 16, return_counts=True)
+    fanout = np.zeros(len(uniq_srcs), dtype=np.int64)
+    fanout[np.searchsorted(uniq_srcs, scan_srcs)] = scan_counts
+    return list(zip(uniq_srcs.tolist(), fanout.tolist(), pkts.tolist()))
+
+
+def _scan_flows_python(flows: DecodedBatch) -> SourceStats:
+    pkts = Counter()
+    keys = set()
+    for ethertype, src, port in zip(flows.ethertype, flows.src_ip, flows.dport):
+        if ethertype == ETHERTYPE_IP:
+            pkts[src] += 1
+            if port:
+                keys.add((src << 16) | port)
+    fanout = Counter(key >> 16 for key in keys)
+    return [(src, fanout[src], pkts[src]) for src in sorted(pkts)]
+
+
+def scan_flows(flows: DecodedBatch) -> SourceStats:
+    """
+    (src_ip, unique dst ports, packets) for every IPv4 source in flows,
+    in ascending address order; port 0 is not counted as a destination port
+    """
+    n = flows.count
+    if np is None:
+        return _scan_flows_python(flows)
+
+    ethertype = np.frombuffer(flows.ethertype, dtype=np.uint16, count=n)
+    srcs = np.frombuffer(flows.src_ip, dtype=np.uint32, count=n)
+    dports = np.frombuffer(flows.dport, dtype=np.uint16, count=n)
+    if HAVE_NUMBA:
+        out_src, out_ports, out_pkts = _scan_flows(ethertype, srcs, dports)
+        return list(zip(out_src.tolist(), out_ports.tolist(), out_pkts.tolist()))
+    return _scan_flows_numpy(ethertype, srcs, dports)
@@ -6,17 +6,109 @@ Dummy Analysis Module - Example module for testing
 """
 
 import time
+import mmap
+import socket
 import logging
 from collections import Counter
-from typing import List
+from heapq import nlargest
+from operator import itemgetter
+from typing import List, Optional, Tuple, Union
 
-from ..base import BaseModule, Summary, Detection
+from ..base import BaseModule, Summary, Detection, analysis_module
+from ._accel import scan_flows
 from core.pcap_writer import PcapReader
-from core.decoder import decode_packet
+from core.batch import DecodedBatch
+from core.decoder import decode_packet, release_packet, ipv4_to_str
+from core.constants import ETHERTYPE_IP, PROTO_NAMES
 
 logger = logging.getLogger(__name__)
 
+# Destination ports per source: a set while small, then a 64 Kibit bitmap
+# (8 KiB bytearray, one byte OR per port) once a source fans out this far
+PORT_BITMAP_PROMOTE = 512
+_PORT_BITMAP_BYTES = 65536 // 8
+_POPCOUNT = bytes(bin(i).count('1') for i in range(256))
 
+
+def _addr_str(addr: Union[int, str]) -> str:
+    """Address counter key as text (int keys are IPv4)"""
+    return ipv4_to_str(addr) if type(addr) is int else addr
+
+
+def _ipv4_string_keys(mapping: dict):
+    """
+    (dotted-quad key, int key) for the IPv4 string keys in mapping: rows
+    decode_packet handled (e.g. VLAN tagged IPv4), keyed like the flow columns
+    """
+    for addr in [key for key in mapping if type(key) is str]:
+        try:
+            key = int.from_bytes(socket.inet_pton(socket.AF_INET, addr), 'big')
+        except OSError:
+            continue
+        yield addr, key
+
+
+def _fold_ipv4_strings(counts: Counter):
+    """Move dotted-quad string keys onto int keys, in place"""
+    for addr, key in _ipv4_string_keys(counts):
+        counts[key] += counts.pop(addr)
+
+
+def _port_bitmap(ports: Union[set, bytearray]) -> bytearray:
+    """Ports as a 64 Kibit bitmap (a bitmap is returned as is)"""
+    if type(ports) is bytearray:
+        return ports
+    bits = bytearray(_PORT_BITMAP_BYTES)
+    for port in ports:
+        bits[port >> 3] |= 1 << (port & 7)
+    return bits
+
+
+def _add_port(port_sets: dict, src, port: int):
+    """Record destination port for src, promoting its set to a bitmap when large"""
+    ports = port_sets.get(src)
+    if ports is None:
+        port_sets[src] = {port}
+    elif type(ports) is set:
+        ports.add(port)
+        if len(ports) >= PORT_BITMAP_PROMOTE:
+            port_sets[src] = _port_bitmap(ports)
+    else:
+        ports[port >> 3] |= 1 << (port & 7)
+
+
+def _merge_ports(a: Union[set, bytearray], b: Union[set, bytearray]) -> Union[set, bytearray]:
+    """Union of two port sets/bitmaps (may reuse a)"""
+    if type(a) is set and type(b) is set:
+        a |= b
+        return a if len(a) < PORT_BITMAP_PROMOTE else _port_bitmap(a)
+    merged = int.from_bytes(_port_bitmap(a), 'little') | int.from_bytes(_port_bitmap(b), 'little')
+    return bytearray(merged.to_bytes(_PORT_BITMAP_BYTES, 'little'))
+
+
+def _port_count(ports: Union[set, bytearray]) -> int:
+    """Unique ports in a set/bitmap"""
+    if type(ports) is set:
+        return len(ports)
+    return sum(ports.translate(_POPCOUNT))
+
+
+def _fold_ipv4_port_sets(port_sets: dict):
+    """Same as _fold_ipv4_strings for {src: ports}, merging port sets/bitmaps"""
+    for addr, key in _ipv4_string_keys(port_sets):
+        ports = port_sets.pop(addr)
+        if key in port_sets:
+            port_sets[key] = _merge_ports(port_sets[key], ports)
+        else:
+            port_sets[key] = ports
+
+
+def _top_addresses(counts: Counter, n: int = 10) -> List[Tuple[str, int]]:
+    """Top n (address, count), O(N log n); only the winners are formatted"""
+    return [(_addr_str(addr), count) for addr, count in nlargest(n, counts.items(), key=itemgetter(1))]
+
+
+@analysis_module
 class DummyModule(BaseModule):
     """
     Example analysis module
@@ -39,75 +131,115 @@ class DummyModule(BaseModule):
     def version(self) -> str:
         return "1.0.0"
     
+    accepts_pcap_mmap = True
+    
     def analyze(
         self,
         pcap_path: str,
         output_dir: str,
         interface: str,
         time_window: str,
+        pcap_mmap: Optional[mmap.mmap] = None,
     ) -> Summary:
         """Analyze PCAP file"""
         start_time = time.time()
         
         # Initialize counters
         proto_counts = Counter()
-        src_counts = Counter()
+        src_counts = Counter()   # IPv4 keyed by int until the summary
         dst_counts = Counter()
-        src_dst_port_pairs = {}  # {src_ip: set(dst_ports)}
+        src_port_sets = {}       # {src: dst ports (set or bitmap)}, non-IPv4 rows only
+        port_fanout = {}         # {src: unique dst ports}
+        flows = None
         
         # Results
         detections: List[Detection] = []
+        label_counts = Counter({"port-scan": 0, "high-rate-source": 0})
         total_packets = 0
         analyzed_packets = 0
         errors = []
         
         try:
-            with PcapReader(pcap_path) as reader:
-                for pkt_info in reader:
-                    total_packets += 1
-                    
+            with PcapReader(pcap_path, mapping=pcap_mmap) as reader:
+                batch = reader.read_all_headers()
+                flows = DecodedBatch.from_batch(batch)
+                total_packets = len(batch)
+                
+                ethertypes, protos = flows.ethertype, flows.proto
+                dst_ips = flows.dst_ip
+                
+                for i in range(total_packets):
                     try:
-                        decoded = decode_packet(pkt_info.data)
+                        if ethertypes[i] == ETHERTYPE_IP:
+                            # IPv4 fast path: flow columns, no header objects
+                            proto_num = protos[i]
+                            proto = PROTO_NAMES.get(proto_num, str(proto_num))
+                            src = dst = None    # Sources via scan_flows, destinations by int key
+                            dst_counts[dst_ips[i]] += 1
+                            dst_port = 0
+                        else:
+                            decoded = decode_packet(batch.data(i))
+                            proto = decoded.protocol_name or "UNKNOWN"
+                            src = decoded.src_addr
+                            dst = decoded.dst_addr
+                            dst_port = decoded.dst_port
+                            release_packet(decoded)
                         analyzed_packets += 1
                         
                         # Count protocol
-                        proto = decoded.protocol_name or "UNKNOWN"
                         proto_counts[proto] += 1
                         
                         # Count sources/destinations
-                        if decoded.src_addr:
-                            src_counts[decoded.src_addr] += 1
-                        if decoded.dst_addr:
-                            dst_counts[decoded.dst_addr] += 1
+                        if src:
+                            src_counts[src] += 1
+                        if dst:
+                            dst_counts[dst] += 1
                         
                         # Track port pairs for port scan detection
-                        if decoded.src_addr and decoded.dst_port:
-                            if decoded.src_addr not in src_dst_port_pairs:
-                                src_dst_port_pairs[decoded.src_addr] = set()
-                            src_dst_port_pairs[decoded.src_addr].add(decoded.dst_port)
+                        if src and dst_port:
+                            _add_port(src_port_sets, src, dst_port)
                     
                     except Exception as e:
                         if len(errors) < 10:  # Limit error logging
-                            errors.append(f"Packet {pkt_info.stt}: {str(e)}")
+                            errors.append(f"Packet {batch.stt[i]}: {str(e)}")
+                
+                for src_ip, unique_ports, packets in scan_flows(flows):
+                    src_counts[src_ip] += packets
+                    port_fanout[src_ip] = unique_ports
         
         except Exception as e:
             logger.error(f"Error reading PCAP: {e}")
             errors.append(f"PCAP read error: {str(e)}")
         
+        # Addresses stay int-keyed; only reported ones are formatted
+        _fold_ipv4_strings(src_counts)
+        _fold_ipv4_strings(dst_counts)
+        _fold_ipv4_port_sets(src_port_sets)
+        
+        # A source seen on both paths: add its column ports so the union is counted
+        shared = port_fanout.keys() & src_port_sets.keys()
+        if shared and flows is not None:
+            for ethertype, src_ip, dst_port in zip(flows.ethertype, flows.src_ip, flows.dport):
+                if ethertype == ETHERTYPE_IP and dst_port and src_ip in shared:
+                    _add_port(src_port_sets, src_ip, dst_port)
+        for src_ip, ports in src_port_sets.items():
+            port_fanout[src_ip] = _port_count(ports)
+        
         # Detect port scans (source hitting many ports)
         PORT_SCAN_THRESHOLD = 20
-        for src_ip, ports in src_dst_port_pairs.items():
-            if len(ports) >= PORT_SCAN_THRESHOLD:
+        for src_ip, unique_ports in port_fanout.items():
+            if unique_ports >= PORT_SCAN_THRESHOLD:
                 det = Detection(
                     stt=0,
                     ts_sec=int(start_time),
                     label="port-scan",
-                    src=src_ip,
+                    src=_addr_str(src_ip),
                     dst="multiple",
-                    dport=len(ports),
+                    dport=unique_ports,
                     proto="TCP",
-                    details={"unique_ports": len(ports)}
+                    details={"unique_ports": unique_ports}
                 )
+                label_counts[det.label] += 1
                 detections.append(det)
         
         # Detect high-rate sources (simple DoS indicator)
@@ -118,9 +250,10 @@ class DummyModule(BaseModule):
                     stt=0,
                     ts_sec=int(start_time),
                     label="high-rate-source",
-                    src=src_ip,
+                    src=_addr_str(src_ip),
                     details={"packet_count": count}
                 )
+                label_counts[det.label] += 1
                 detections.append(det)
         
         end_time = time.time()
@@ -134,12 +267,9 @@ class DummyModule(BaseModule):
             total_packets=total_packets,
             analyzed_packets=analyzed_packets,
             total_hits=len(detections),
-            labels={
-                "port-scan": sum(1 for d in detections if d.label == "port-scan"),
-                "high-rate-source": sum(1 for d in detections if d.label == "high-rate-source"),
-            },
-            top_sources=src_counts.most_common(10),
-            top_destinations=dst_counts.most_common(10),
+            labels=dict(label_counts),
+            top_sources=_top_addresses(src_counts),
+            top_destinations=_top_addresses(dst_counts),
             start_time=start_time,
             end_time=end_time,
             duration_sec=end_time - start_time,
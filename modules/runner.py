@@ -1,35 +1,85 @@
 """
 Module Runner - Executes analysis modules on PCAP files
-- Queue-based job management
+- Queue-based job management: per-worker deques with work stealing
 - Worker threads for parallel execution
 - Auto-discovery of modules
 """
 
-import queue
+import os
+import sys
+import mmap
+import heapq
+import itertools
 import threading
 import logging
 import importlib
-import pkgutil
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Dict, Type
+from typing import ClassVar, List, Optional, Dict, Sequence, Set, Tuple, Type
 from dataclasses import dataclass
 import time
 
-from .base import BaseModule, Summary
+from .base import BaseModule, Summary, _REGISTRY, _SLOTS
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _cached_import(name: str):
+    """Import a module, skipping the import machinery if already loaded"""
+    mod = sys.modules.get(name)
+    if mod is None:
+        mod = importlib.import_module(name)
+    return mod
+
+
+def _scan_module_classes(mod) -> List[Type[BaseModule]]:
+    """BaseModule subclasses among a module's attributes (unregistered modules)"""
+    classes = []
+    for attr_name in dir(mod):
+        attr = getattr(mod, attr_name)
+        if (isinstance(attr, type) and 
+            issubclass(attr, BaseModule) and 
+            attr is not BaseModule):
+            classes.append(attr)
+    return classes
+
+
+# Module instances of a pool process, built on first use
+_process_modules: Dict[Type[BaseModule], BaseModule] = {}
+
+
+def _run_module(
+    cls: Type[BaseModule],
+    pcap_path: str,
+    output_dir: str,
+    interface: str,
+    time_window: str,
+) -> Summary:
+    """Run one module in a pool process (top level so it pickles)"""
+    module = _process_modules.get(cls)
+    if module is None:
+        module = _process_modules[cls] = cls()
+    return module.analyze(
+        pcap_path=pcap_path,
+        output_dir=output_dir,
+        interface=interface,
+        time_window=time_window,
+    )
+
+
+@dataclass(frozen=True, **_SLOTS)
 class AnalysisJob:
-    """Analysis job to be processed"""
+    """
+    Analysis job to be processed
+    Immutable; queues order jobs by (priority, seq, job) tuples, never
+    by comparing jobs
+    """
     pcap_path: str
     interface: str
     time_window: str
     priority: int = 0  # Lower = higher priority
-    
-    def __lt__(self, other):
-        return self.priority < other.priority
 
 
 class ModuleRunner:
@@ -40,92 +90,181 @@ class ModuleRunner:
     - Runs modules in worker threads
     """
     
+    # module_name -> BaseModule subclasses found in it, shared by all runners
+    _discovered: ClassVar[Dict[str, List[Type[BaseModule]]]] = {}
+    
     def __init__(
         self,
         output_dir: str,
-        enabled_modules: List[str] = None,
-        num_workers: int = 2,
-        max_queue_size: int = 100,
+        enabled_modules: Optional[List[str]] = None,
+        num_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        pin_workers: bool = True,
+        exclude_cpus: Optional[Set[int]] = None,
+        prefetch: bool = True,
+        module_processes: Optional[int] = None,
     ):
         """
         Args:
             output_dir: Base directory for module output
             enabled_modules: List of module names to enable (None = all)
-            num_workers: Number of worker threads
-            max_queue_size: Max jobs in queue
+            num_workers: Number of worker threads (None = one per usable CPU)
+            max_queue_size: Max jobs in queue (None = 3 per worker, at least 100)
+            pin_workers: Pin each worker to one usable CPU (Linux only)
+            exclude_cpus: CPUs workers are never pinned to (e.g. the capture
+                thread's); settable until start()
+            prefetch: Advise sequential readahead on each job's PCAP mapping
+                and warm the page cache with the next queued PCAP
+            module_processes: Processes to fan a job's modules out to when more
+                than one is enabled (None = one per usable CPU, 0 = run them
+                in the worker thread)
         """
         self.output_dir = Path(output_dir)
-        self.enabled_module_names = enabled_modules
-        self.num_workers = num_workers
+        self._enabled_module_names = enabled_modules
+        self._enabled_cache: Optional[Tuple[BaseModule, ...]] = None
+        
+        # CPUs this process may run on (affinity/cgroup aware where supported)
+        if hasattr(os, 'sched_getaffinity'):
+            self._cpus = sorted(os.sched_getaffinity(0))
+        else:
+            self._cpus = list(range(os.cpu_count() or 1))
+        self.num_workers = num_workers if num_workers else max(1, len(self._cpus))
+        self.pin_workers = pin_workers
+        self.exclude_cpus: Set[int] = set(exclude_cpus or ())
+        self.prefetch = prefetch
+        if module_processes is None:
+            module_processes = len(self._cpus)
+        self.module_processes = module_processes if module_processes > 1 else 0
+        self._module_pool: Optional[ProcessPoolExecutor] = None
+        if max_queue_size is None:
+            max_queue_size = max(100, 3 * self.num_workers)
         
         # Module registry
         self._modules: Dict[str, BaseModule] = {}
         
-        # Job queue (priority queue)
-        self._job_queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=max_queue_size)
+        # Job queues: one deque per worker (idle workers steal from the
+        # tail of a sibling's), plus a heap lane for priority != 0 jobs:
+        # urgent (< 0) ones run before any deque, deferred (> 0) ones after.
+        # Only the first job per PCAP is queued; later ones for the same file
+        # wait in _pending and run with it over a single mapping
+        self.max_queue_size = max_queue_size
+        self._cv = threading.Condition()
+        self._queues: List[deque] = [deque() for _ in range(self.num_workers)]
+        self._priority_lane: list = []      # heap of (priority, seq, job)
+        self._seq = itertools.count()
+        self._pending: Dict[str, List[AnalysisJob]] = {}
+        self._queued = 0                    # jobs waiting in deques + lane
+        self._in_flight = 0                 # queued + running, for stop(wait=True)
         
         # Worker threads
         self._workers: List[threading.Thread] = []
         self._running = False
-        self._stop_event = threading.Event()
+        self._stopping = False              # guarded by _cv; workers block until set
         
-        # Stats
-        self._jobs_completed = 0
-        self._jobs_failed = 0
-        self._lock = threading.Lock()
+        # Stats: every worker thread owns a [completed, failed] pair, reached
+        # through thread-local storage and written only by that thread, so
+        # counting needs no lock; readers sum all pairs, including those of
+        # workers from earlier start()/stop() cycles
+        self._tls = threading.local()
+        self._worker_stats: List[List[int]] = []
+        self._lock = threading.Lock()       # module pool creation/shutdown
     
     def register_module(self, module: BaseModule):
         """Register a module"""
         self._modules[module.name] = module
-        logger.info(f"Registered module: {module.name}")
+        self._enabled_cache = None
+        logger.info("Registered module: %s", module.name)
     
-    def discover_modules(self, package_path: str = None):
+    def discover_modules(self, package_path: Optional[str] = None):
         """
         Discover and register modules from a package
-        Looks for classes that inherit from BaseModule
+        Imports each subpackage listed in the package's __modules__
+        manifest (or, without one, every subpackage) and registers the
+        classes it decorated with @analysis_module
         """
+        manifest = None
         if package_path is None:
             # Default: look in modules/ directory
-            package_path = str(Path(__file__).parent)
+            package_path = os.path.dirname(__file__)
+            manifest = getattr(sys.modules.get(__package__), '__modules__', None)
         
-        # Import all submodules
-        package = Path(package_path)
+        if manifest is not None:
+            names = list(manifest)
+        else:
+            # One readdir; DirEntry.is_dir() comes from d_type, no stat per entry
+            with os.scandir(package_path) as it:
+                entries = sorted(
+                    (entry.name, entry.path) for entry in it
+                    if not entry.name.startswith('_') and entry.is_dir()
+                )
+            names = [
+                name for name, path in entries
+                if os.path.exists(os.path.join(path, '__init__.py'))
+            ]
         
-        for item in package.iterdir():
-            if item.is_dir() and (item / '__init__.py').exists():
-                module_name = item.name
-                
-                # Skip special directories
-                if module_name.startswith('_'):
-                    continue
-                
-                try:
+        # Import the subpackages
+        for module_name in names:
+            try:
+                classes = self._discovered.get(module_name)
+                if classes is None:
                     # Try to import the module
-                    mod = importlib.import_module(f'modules.{module_name}')
+                    full_name = f'modules.{module_name}'
+                    mod = _cached_import(full_name)
                     
-                    # Look for BaseModule subclasses
-                    for attr_name in dir(mod):
-                        attr = getattr(mod, attr_name)
-                        if (isinstance(attr, type) and 
-                            issubclass(attr, BaseModule) and 
-                            attr is not BaseModule):
-                            # Instantiate and register
-                            instance = attr()
-                            self.register_module(instance)
+                    prefix = full_name + '.'
+                    classes = []
+                    for cls in _REGISTRY:
+                        owner: str = getattr(cls, '__module__', '')
+                        if owner == full_name or owner.startswith(prefix):
+                            classes.append(cls)
+                    if not classes:
+                        # Deprecated: scan attributes of unregistered modules
+                        classes = _scan_module_classes(mod)
+                        if classes:
+                            logger.warning(
+                                "Module %s does not use @analysis_module, "
+                                "falling back to attribute scan", module_name
+                            )
+                    self._discovered[module_name] = classes
                 
-                except Exception as e:
-                    logger.warning(f"Error loading module {module_name}: {e}")
+                # Instantiate and register
+                for cls in classes:
+                    self.register_module(cls())
+            
+            except Exception as e:
+                logger.warning("Error loading module %s: %s", module_name, e)
     
-    def get_enabled_modules(self) -> List[BaseModule]:
-        """Get list of enabled modules"""
-        if self.enabled_module_names is None:
-            return list(self._modules.values())
-        
-        return [
-            self._modules[name] 
-            for name in self.enabled_module_names 
-            if name in self._modules
-        ]
+    @property
+    def enabled_module_names(self) -> Optional[List[str]]:
+        return self._enabled_module_names
+    
+    @enabled_module_names.setter
+    def enabled_module_names(self, names: Optional[List[str]]):
+        self._enabled_module_names = names
+        self._enabled_cache = None
+    
+    def _resolve_enabled_modules(self) -> Tuple[BaseModule, ...]:
+        """Resolve enabled names to modules, warning about unknown ones"""
+        if self._enabled_module_names is None:
+            resolved = tuple(self._modules.values())
+        else:
+            missing = [name for name in self._enabled_module_names if name not in self._modules]
+            if missing:
+                logger.warning("Unknown modules enabled: %s", ', '.join(missing))
+            resolved = tuple(
+                self._modules[name]
+                for name in self._enabled_module_names
+                if name in self._modules
+            )
+        self._enabled_cache = resolved
+        return resolved
+    
+    def get_enabled_modules(self) -> Tuple[BaseModule, ...]:
+        """Get enabled modules (resolved at start, again after registry changes)"""
+        cached = self._enabled_cache
+        if cached is not None:
+            return cached
+        return self._resolve_enabled_modules()
     
     def get_available_modules(self) -> List[str]:
         """Get list of available module names"""
@@ -148,69 +287,274 @@ class ModuleRunner:
             priority=priority
         )
         
+        with self._cv:
+            group = self._pending.get(pcap_path)
+            if group is not None:
+                for queued in group:
+                    if queued.interface == interface and queued.time_window == time_window:
+                        logger.info("Analysis already queued: %s", pcap_path)
+                        return
+            
+            if self._queued >= self.max_queue_size:
+                logger.warning("Analysis queue full, dropping: %s", pcap_path)
+                return
+            
+            if group is not None:
+                group.append(job)
+                self._queued += 1
+                self._in_flight += 1
+                logger.info("Queued analysis: %s (batched)", pcap_path)
+                return
+            
+            self._pending[pcap_path] = [job]
+            if priority:
+                heapq.heappush(self._priority_lane, (priority, next(self._seq), job))
+            else:
+                min(self._queues, key=len).append(job)
+            self._queued += 1
+            self._in_flight += 1
+            self._cv.notify()
+        
+        logger.info("Queued analysis: %s", pcap_path)
+    
+    def _take_jobs(self, worker_id: int) -> Optional[List[AnalysisJob]]:
+        """
+        Jobs of the next PCAP for worker_id, or None if nothing is queued
+        (must hold _cv)
+        """
+        lane = self._priority_lane
+        if lane and lane[0][0] < 0:
+            job = heapq.heappop(lane)[2]
+        else:
+            queues = self._queues
+            own = queues[worker_id % len(queues)]
+            if own:
+                job = own.popleft()
+            else:
+                # Steal the newest job of the busiest sibling
+                victim = max(queues, key=len)
+                if victim:
+                    job = victim.pop()
+                elif lane:
+                    job = heapq.heappop(lane)[2]
+                else:
+                    return None
+        jobs = self._pending.pop(job.pcap_path)
+        self._queued -= len(jobs)
+        return jobs
+    
+    def _peek_next_path(self, worker_id: int) -> Optional[str]:
+        """PCAP worker_id will most likely take next (must hold _cv)"""
+        lane = self._priority_lane
+        if lane and lane[0][0] < 0:
+            return lane[0][2].pcap_path
+        own = self._queues[worker_id % len(self._queues)]
+        return own[0].pcap_path if own else None
+    
+    def _prefetch_pcap(self, pcap_path: str):
+        """Start kernel readahead of a queued PCAP into the page cache"""
         try:
-            self._job_queue.put_nowait(job)
-            logger.info(f"Queued analysis: {pcap_path}")
-        except queue.Full:
-            logger.warning(f"Analysis queue full, dropping: {pcap_path}")
+            fd = os.open(pcap_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError as e:
+            logger.debug("posix_fadvise failed for %s: %s", pcap_path, e)
+        finally:
+            os.close(fd)
+    
+    def _pin_worker(self, worker_id: int):
+        """Pin calling worker thread to one CPU, round-robin over the usable set minus exclude_cpus"""
+        if not self.pin_workers or len(self._cpus) < 2 or not hasattr(os, 'sched_setaffinity'):
+            return
+        cpus = [cpu for cpu in self._cpus if cpu not in self.exclude_cpus]
+        if not cpus:
+            return
+        cpu = cpus[worker_id % len(cpus)]
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            logger.warning("Cannot pin worker %d: %s", worker_id, e)
     
     def _worker_loop(self, worker_id: int):
         """Worker thread main loop"""
-        logger.info(f"Worker {worker_id} started")
+        self._tls.stats = stats = [0, 0]
+        self._worker_stats.append(stats)
+        self._pin_worker(worker_id)
+        logger.info("Worker %d started", worker_id)
         
-        while not self._stop_event.is_set():
+        # Bound once: the loop below runs per job for the runner's lifetime
+        cv = self._cv
+        wait = cv.wait
+        take_jobs = self._take_jobs
+        peek_next_path = self._peek_next_path if self.prefetch and hasattr(os, 'posix_fadvise') else None
+        prefetch_pcap = self._prefetch_pcap
+        process_jobs = self._process_jobs
+        while True:
             try:
-                # Get job with timeout (to check stop event)
-                try:
-                    job = self._job_queue.get(timeout=1.0)
-                except queue.Empty:
-                    continue
+                # Sleep until queue_analysis() or stop() notifies, no polling
+                jobs = next_path = None
+                with cv:
+                    while not self._stopping:
+                        jobs = take_jobs(worker_id)
+                        if jobs is not None:
+                            if peek_next_path is not None:
+                                next_path = peek_next_path(worker_id)
+                            break
+                        wait()
+                if jobs is None:
+                    break
                 
-                # Process job
-                self._process_job(job, worker_id)
+                # Warm the next PCAP while this one is analysed
+                if next_path is not None:
+                    prefetch_pcap(next_path)
                 
-                # Mark done
-                self._job_queue.task_done()
+                try:
+                    process_jobs(jobs, worker_id)
+                finally:
+                    with cv:
+                        self._in_flight -= len(jobs)
+                        if not self._in_flight:
+                            cv.notify_all()
                 
             except Exception as e:
-                logger.error(f"Worker {worker_id} error: {e}")
+                logger.error("Worker %d error: %s", worker_id, e)
         
-        logger.info(f"Worker {worker_id} stopped")
+        logger.info("Worker %d stopped", worker_id)
     
-    def _process_job(self, job: AnalysisJob, worker_id: int):
-        """Process a single analysis job"""
-        logger.info(f"Worker {worker_id} processing: {job.pcap_path}")
+    def _map_pcap(self, pcap_path: str) -> Optional[mmap.mmap]:
+        """
+        Map the PCAP read-only once per job, shared by every module that
+        accepts it; None for an empty file. The open is the existence
+        check: raises OSError if it cannot be opened.
+        """
+        fd = os.open(pcap_path, os.O_RDONLY)
+        try:
+            # fstat on the open fd: no second path lookup
+            size = os.fstat(fd).st_size
+            if not size:
+                # Empty file: nothing to map, modules open it themselves
+                return None
+            mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
         
-        # Check if file exists
-        if not Path(job.pcap_path).exists():
-            logger.warning(f"PCAP file not found: {job.pcap_path}")
-            with self._lock:
-                self._jobs_failed += 1
-            return
+        if self.prefetch and hasattr(mmap, 'MADV_WILLNEED'):
+            try:
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+                mm.madvise(mmap.MADV_WILLNEED)
+            except OSError as e:
+                logger.debug("madvise failed for %s: %s", pcap_path, e)
+        return mm
+    
+    def _get_module_pool(self) -> ProcessPoolExecutor:
+        """Process pool for module fan-out, created on first use"""
+        with self._lock:
+            if self._module_pool is None:
+                # forkserver: never fork() this multi-threaded process
+                methods = multiprocessing.get_all_start_methods()
+                ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else None)
+                self._module_pool = ProcessPoolExecutor(
+                    max_workers=self.module_processes, mp_context=ctx)
+            return self._module_pool
+    
+    def _process_job(self, job: AnalysisJob, pcap_mmap: Optional[mmap.mmap]):
+        """Run every enabled module on one job"""
+        log_info = logger.isEnabledFor(logging.INFO)
+        modules: Sequence[BaseModule] = self.get_enabled_modules()
+        perf_counter_ns = time.perf_counter_ns
+        pcap_path, interface, time_window = job.pcap_path, job.interface, job.time_window
+        output_dir = str(self.output_dir)
         
-        # Run enabled modules
-        for module in self.get_enabled_modules():
+        # CPU-bound modules run in parallel in pool processes; only
+        # @analysis_module classes are sent there (they can be re-imported)
+        if self.module_processes and len(modules) > 1:
+            pooled = [m for m in modules if type(m) in _REGISTRY]
+            if len(pooled) > 1:
+                self._run_pooled(job, pooled, log_info)
+                modules = [m for m in modules if type(m) not in _REGISTRY]
+        
+        for module in modules:
             try:
-                start_time = time.time()
+                start_ns = perf_counter_ns()
+                
+                extra = {}
+                if pcap_mmap is not None and module.accepts_pcap_mmap:
+                    extra['pcap_mmap'] = pcap_mmap
                 
                 summary = module.analyze(
-                    pcap_path=job.pcap_path,
-                    output_dir=str(self.output_dir),
-                    interface=job.interface,
-                    time_window=job.time_window
+                    pcap_path=pcap_path,
+                    output_dir=output_dir,
+                    interface=interface,
+                    time_window=time_window,
+                    **extra
                 )
                 
-                duration = time.time() - start_time
-                logger.info(
-                    f"Module {module.name} completed: "
-                    f"{summary.total_hits} hits in {duration:.2f}s"
-                )
+                if log_info:
+                    # Lazy %-formatting: nothing is built if no handler emits it
+                    logger.info(
+                        "Module %s completed: %d hits in %.2fms",
+                        module.name, summary.total_hits,
+                        (perf_counter_ns() - start_ns) / 1e6,
+                    )
                 
             except Exception as e:
-                logger.error(f"Module {module.name} failed: {e}")
+                logger.error("Module %s failed: %s", module.name, e)
+    
+    def _run_pooled(self, job: AnalysisJob, modules: List[BaseModule], log_info: bool):
+        """Run modules of one job concurrently in the process pool"""
+        start_ns = time.perf_counter_ns()
+        try:
+            pool = self._get_module_pool()
+            futures = {
+                pool.submit(
+                    _run_module, type(module), job.pcap_path, str(self.output_dir),
+                    job.interface, job.time_window,
+                ): module
+                for module in modules
+            }
+        except Exception as e:
+            logger.error("Module pool unavailable: %s", e)
+            return
         
-        with self._lock:
-            self._jobs_completed += 1
+        for future in as_completed(futures):
+            module = futures[future]
+            try:
+                summary = future.result()
+                if log_info:
+                    logger.info(
+                        "Module %s completed: %d hits in %.2fms",
+                        module.name, summary.total_hits,
+                        (time.perf_counter_ns() - start_ns) / 1e6,
+                    )
+            except Exception as e:
+                logger.error("Module %s failed: %s", module.name, e)
+    
+    def _process_jobs(self, jobs: List[AnalysisJob], worker_id: int):
+        """Process all queued jobs of one PCAP over a single mapping"""
+        pcap_path = jobs[0].pcap_path
+        logger.info("Worker %d processing: %s (%d jobs)", worker_id, pcap_path, len(jobs))
+        
+        # Check if file exists
+        try:
+            pcap_mmap = self._map_pcap(pcap_path)
+        except OSError:
+            logger.warning("PCAP file not found: %s", pcap_path)
+            self._tls.stats[1] += len(jobs)
+            return
+        
+        try:
+            for job in jobs:
+                self._process_job(job, pcap_mmap)
+                self._tls.stats[0] += 1
+        finally:
+            if pcap_mmap is not None:
+                try:
+                    pcap_mmap.close()
+                except BufferError:
+                    # A module kept views into it; unmapped with the last one
+                    pass
     
     def start(self):
         """Start worker threads"""
@@ -218,11 +562,15 @@ class ModuleRunner:
             return
         
         self._running = True
-        self._stop_event.clear()
+        with self._cv:
+            self._stopping = False
         
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Resolve enabled modules once, so unknown names show up now
+        self._resolve_enabled_modules()
+        
         # Start workers
         for i in range(self.num_workers):
             worker = threading.Thread(
@@ -234,7 +582,7 @@ class ModuleRunner:
             worker.start()
             self._workers.append(worker)
         
-        logger.info(f"ModuleRunner started with {self.num_workers} workers")
+        logger.info("ModuleRunner started with %d workers", self.num_workers)
     
     def stop(self, wait: bool = True, timeout: float = 10.0):
         """
@@ -248,34 +596,49 @@ class ModuleRunner:
             return
         
         self._running = False
-        self._stop_event.set()
         
         if wait:
-            # Wait for queue to empty
-            try:
-                self._job_queue.join()
-            except Exception:
-                pass
+            # Let workers drain queued and running jobs first
+            deadline = time.monotonic() + timeout
+            with self._cv:
+                while self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cv.wait(remaining)
+        
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
         
         # Wait for workers
         for worker in self._workers:
             worker.join(timeout=timeout / len(self._workers) if self._workers else timeout)
         
+        with self._lock:
+            pool, self._module_pool = self._module_pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+        
         self._workers.clear()
         logger.info("ModuleRunner stopped")
     
     @property
     def queue_size(self) -> int:
-        """Current queue size"""
-        return self._job_queue.qsize()
+        """
+        Current queue size
+        Plain int read without taking _cv: may lag a concurrent
+        enqueue/dequeue by one, never blocks the workers
+        """
+        return self._queued
     
     @property
     def jobs_completed(self) -> int:
-        return self._jobs_completed
+        return sum(stats[0] for stats in self._worker_stats)
     
     @property
     def jobs_failed(self) -> int:
-        return self._jobs_failed
+        return sum(stats[1] for stats in self._worker_stats)
     
     def get_status(self) -> dict:
         """Get runner status"""
@@ -283,8 +646,8 @@ class ModuleRunner:
             "running": self._running,
             "workers": len(self._workers),
             "queue_size": self.queue_size,
-            "jobs_completed": self._jobs_completed,
-            "jobs_failed": self._jobs_failed,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
             "enabled_modules": [m.name for m in self.get_enabled_modules()],
             "available_modules": self.get_available_modules(),
         }
@@ -292,7 +655,7 @@ class ModuleRunner:
 
 def create_runner(
     output_dir: str,
-    enabled_modules: List[str] = None,
+    enabled_modules: Optional[List[str]] = None,
     auto_discover: bool = True,
 ) -> ModuleRunner:
     """
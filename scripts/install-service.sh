@@ -75,7 +75,7 @@ if command -v pip3 &>/dev/null; then
     echo -e "${GREEN}  Done${NC}"
 else
     echo -e "${YELLOW}  Warning: pip3 not found, please install manually:${NC}"
-    echo "    pip3 install scapy"
+    echo "    pip3 install -r requirements.txt"
 fi
 
 # Step 4: Install systemd service
@@ -6,7 +6,7 @@
 # This script will:
 # - Install Python 3.8+ if needed
 # - Install pip3 if needed
-# - Install scapy
+# - Install libpcap (BPF filters)
 # - Install SNIFF
 # - Setup systemd service (optional)
 #
@@ -55,9 +55,11 @@ echo -e "${BLUE}[2/5] Updating package list...${NC}"
 case $OS in
     ubuntu|debian)
         apt-get update -qq
+        apt-get install -y libpcap0.8 -qq || true
         ;;
     centos|rhel|fedora)
         yum check-update -q || true
+        yum install -y libpcap -q || true
         ;;
     *)
         echo -e "${YELLOW}Warning: Unsupported OS, trying anyway...${NC}"
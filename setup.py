@@ -4,6 +4,7 @@ SNIFF - Network Packet Capture Tool
 Setup script for pip installation
 """
 
+import os
 from setuptools import setup, find_packages
 from pathlib import Path
 
@@ -11,6 +12,13 @@ from pathlib import Path
 readme_file = Path(__file__).parent / "README.md"
 long_description = readme_file.read_text(encoding="utf-8") if readme_file.exists() else ""
 
+# Optional AOT build: with SNIFF_MYPYC=1 the module runner and base module are
+# compiled with mypyc (needs mypy and a C compiler); pure Python otherwise
+ext_modules = []
+if os.environ.get("SNIFF_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["modules/runner.py", "modules/base.py"])
+
 setup(
     name="sniff-pcap",
     version="0.0.1",
@@ -26,14 +34,27 @@ setup(
     packages=find_packages(exclude=["tests", "*.tests", "*.tests.*"]),
     py_modules=['sniff'],  # Include sniff.py as a module
     include_package_data=True,
+    ext_modules=ext_modules,
     
     # Python version requirement
     python_requires=">=3.8",
     
-    # Dependencies
-    install_requires=[
-        "scapy>=2.5.0",
-    ],
+    # Dependencies: none from PyPI. Capture uses AF_PACKET directly; BPF
+    # filters other than "[tcp|udp] port N" load the system libpcap through
+    # ctypes (libpcap0.8 on Debian/Ubuntu, libpcap on RHEL/Fedora)
+    install_requires=[],
+    extras_require={
+        # decode_packet_scapy() for callers holding Scapy packet objects
+        "scapy": [
+            "scapy>=2.5.0",
+        ],
+        # Optional accelerators picked up at runtime when installed
+        "fast": [
+            "orjson>=3.6",
+            "numpy>=1.20",
+            "numba>=0.55",
+        ],
+    },
     
     # Entry points - this creates the 'sniff' command
     entry_points={
@@ -14,8 +14,10 @@ Usage:
 import os
 import sys
 import argparse
+import itertools
 import signal
 import logging
+import threading
 import time
 from pathlib import Path
 
@@ -24,10 +26,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from core.capture import CaptureEngine, get_interfaces, validate_interface
 from core.rotator import HourlyRotator
-from core.constants import BUFFER_PROFILES, DEFAULT_SNAPLEN, DEFAULT_PROMISC, DEFAULT_RETENTION_DAYS
+from core.constants import (
+    BUFFER_PROFILES, CPU_PROFILES, DEFAULT_CPU_PROFILE, MAX_UI_SAMPLE_RATE,
+    DEFAULT_SNAPLEN, DEFAULT_PROMISC, DEFAULT_RETENTION_DAYS, PROTO_NAMES
+)
 from ui.menu import MainMenu
 from ui.list_view import PacketListView
-from ui.colors import green, red, yellow, bold, show_cursor, clear_screen, success, error, info
+from ui.colors import green, red, yellow, bold, show_cursor, clear_screen, success, error, info, warning
 from modules.runner import create_runner
 
 # Default paths
@@ -54,6 +59,7 @@ class SniffApp:
         snaplen: int = DEFAULT_SNAPLEN,
         promisc: bool = DEFAULT_PROMISC,
         buffer_profile: str = "balanced",
+        cpu_profile: str = DEFAULT_CPU_PROFILE,
         retention_days: int = DEFAULT_RETENTION_DAYS,
         daemon: bool = False,
         enable_modules: bool = True,
@@ -64,6 +70,7 @@ class SniffApp:
         self.snaplen = snaplen
         self.promisc = promisc
         self.buffer_profile = buffer_profile
+        self.cpu_profile = cpu_profile
         self.retention_days = retention_days
         self.daemon = daemon
         self.enable_modules = enable_modules
@@ -76,7 +83,7 @@ class SniffApp:
         
         # State
         self._running = False
-        self._shutdown_requested = False
+        self._shutdown_event = threading.Event()   # Signal handler set, run_daemon chờ trên đó
     
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
@@ -86,8 +93,10 @@ class SniffApp:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, shutting down...")
-        self._shutdown_requested = True
-        self.stop()
+        self._shutdown_event.set()
+        if not self.daemon:
+            # Daemon tự stop khi run_daemon thức dậy; interactive cần stop ngay
+            self.stop()
     
     def _on_rotate(self, pcap_path: str, interface: str, time_window: str):
         """Callback when file rotates - queue for analysis"""
@@ -120,6 +129,7 @@ class SniffApp:
             snaplen=self.snaplen,
             retention_days=self.retention_days,
             on_rotate=self._on_rotate if self.module_runner else None,
+            threaded=True,      # Ghi đĩa ở luồng riêng, không chặn luồng capture
         )
         
         # Setup capture engine
@@ -131,11 +141,17 @@ class SniffApp:
             buffer_size=profile['buffer_size'],
             queue_size=profile['queue_size'],
             rotator=self.rotator,
+            cpu_profile=self.cpu_profile,
+            ui_queue=not self.daemon,   # Daemon không có UI đọc queue
         )
         
         # Setup capture engine
         self.capture.setup()
         
+        # Worker phân tích không pin vào CPU dành cho luồng capture
+        if self.module_runner:
+            self.module_runner.exclude_cpus = self.capture.planned_capture_cpus()
+        
         logger.info(f"Setup complete - Interface: {self.interface}, Data dir: {self.data_dir}")
     
     def start(self):
@@ -184,13 +200,15 @@ class SniffApp:
         """Wrapper để trả về stats dict tương thích với UI mới"""
         if self.capture:
             stats = self.capture.stats
+            packets, nbytes = stats.snapshot()
             return {
-                'packets': stats.packets,
+                'packets': packets,
                 'dropped': stats.dropped + stats.queue_dropped,
-                'bytes': stats.bytes,
+                'bytes': nbytes,
                 'pps': stats.pps,
                 'bps': stats.bps,
                 'paused': self.capture.is_paused,
+                'sample_rate': self.capture.ui_sample_rate,
             }
         return {}
     
@@ -212,6 +230,17 @@ class SniffApp:
             else:
                 self.capture.resume()
     
+    def _on_sample_rate(self) -> int:
+        """Callback khi nhấn R: tăng gấp đôi tỉ lệ lấy mẫu UI (quay về 1 sau mức tối đa)"""
+        if not self.capture:
+            return 1
+        
+        rate = self.capture.ui_sample_rate * 2
+        if rate > MAX_UI_SAMPLE_RATE:
+            rate = 1
+        self.capture.ui_sample_rate = rate
+        return rate
+    
     def _on_save_exit(self):
         """Callback khi nhấn S (save & exit)"""
         clear_screen()
@@ -219,7 +248,9 @@ class SniffApp:
         print(success("Đang lưu file..."))
         
         if self.rotator:
-            self.rotator.flush()
+            # Chờ writer thread ghi hết hàng đợi rồi mới báo đã lưu
+            if not self.rotator.flush():
+                print(warning("Writer chưa ghi xong hàng đợi, file có thể thiếu gói cuối"))
             current_file = self.rotator.current_filepath
             if current_file:
                 print(info(f"File đã lưu: {current_file}"))
@@ -253,6 +284,7 @@ class SniffApp:
             file_info_callback=self._get_file_info,
             on_pause=self._on_pause,
             on_save_exit=self._on_save_exit,
+            on_sample_rate=self._on_sample_rate,
         )
         
         try:
@@ -262,6 +294,15 @@ class SniffApp:
             show_cursor()
             self.stop()
     
+    def _log_stats(self):
+        """Log stats định kỳ ở chế độ daemon"""
+        stats = self.capture.stats
+        packets, nbytes = stats.snapshot()
+        logger.info(
+            f"Stats: {packets} pkts, {nbytes} bytes, "
+            f"PPS: {stats.pps:.1f}, Dropped: {stats.dropped + stats.queue_dropped}"
+        )
+    
     def run_daemon(self):
         """Run as daemon (headless)"""
         self.setup()
@@ -269,17 +310,9 @@ class SniffApp:
         
         logger.info("Running in daemon mode (headless)")
         
-        # Main loop - just wait for shutdown
-        while not self._shutdown_requested:
-            time.sleep(1)
-            
-            # Log stats periodically
-            stats = self.capture.stats
-            if stats.packets > 0 and stats.packets % 10000 == 0:
-                logger.info(
-                    f"Stats: {stats.packets} pkts, {stats.bytes} bytes, "
-                    f"PPS: {stats.pps:.1f}, Dropped: {stats.dropped}"
-                )
+        # Main loop - block đến khi có signal, log stats mỗi 10s
+        while not self._shutdown_event.wait(timeout=10.0):
+            self._log_stats()
         
         self.stop()
 
@@ -488,35 +521,49 @@ def run_menu_mode(data_dir: str):
                 # Read and display packets
                 print(info(f"Đang đọc {filepath.name}..."))
                 
-                with PcapReader(str(filepath)) as reader:
-                    packets = list(reader)
+                # File được mmap (không có buffer read()); báo kernel đọc trước
+                # cả file vì bước đếm sẽ đi qua mọi record
+                with PcapReader(str(filepath), prefetch=True) as reader:
+                    # Chỉ copy 20 gói đầu để hiển thị, phần còn lại chỉ đếm
+                    # (không tạo cột/đối tượng theo số gói trong file)
+                    packets = [
+                        pkt._replace(data=bytes(pkt.data))
+                        for pkt in itertools.islice(reader, 20)
+                    ]
+                    total = len(packets) + reader.skip_remaining()
                 
                 if not packets:
                     print(red("File rỗng!"))
                     input("Nhấn Enter để tiếp tục...")
                     return
                 
-                print(success(f"Đọc được {len(packets)} gói"))
+                print(success(f"Đọc được {total} gói"))
                 print()
                 
                 # Show first 20 packets with details
                 print(bold("Các gói trong file:"))
                 print()
                 
-                from core.decoder import decode_packet
+                from core.decoder import decode_packet, decode_flow_key
                 
                 for i, pkt in enumerate(packets[:20], 1):
-                    # Decode packet to get protocol and addresses
+                    # Chỉ cần protocol + địa chỉ: IPv4 đi đường flow key (không tạo header object)
                     try:
-                        decoded = decode_packet(pkt.data)
-                        proto = decoded.protocol_name if decoded else 'UNKNOWN'
-                        src = decoded.src_addr or '-'
-                        dst = decoded.dst_addr or '-'
+                        flow = decode_flow_key(pkt.data)
+                        if flow is not None:
+                            src, dst, src_port, dst_port, proto_num = flow
+                            proto = PROTO_NAMES.get(proto_num, str(proto_num))
+                        else:
+                            decoded = decode_packet(pkt.data)
+                            proto = decoded.protocol_name if decoded else 'UNKNOWN'
+                            src = decoded.src_addr or '-'
+                            dst = decoded.dst_addr or '-'
+                            src_port, dst_port = decoded.src_port, decoded.dst_port
                         
-                        if decoded and decoded.src_port:
-                            src = f"{src}:{decoded.src_port}"
-                        if decoded and decoded.dst_port:
-                            dst = f"{dst}:{decoded.dst_port}"
+                        if src_port:
+                            src = f"{src}:{src_port}"
+                        if dst_port:
+                            dst = f"{dst}:{dst_port}"
                         
                         # Truncate long addresses
                         if len(src) > 25:
@@ -581,6 +628,8 @@ Examples:
                         help='Disable promiscuous mode')
     parser.add_argument('-b', '--buffer', choices=['low', 'balanced', 'fast', 'max'],
                         default='balanced', help='Buffer profile')
+    parser.add_argument('--cpu-profile', choices=list(CPU_PROFILES.keys()),
+                        default=DEFAULT_CPU_PROFILE, help='CPU pinning profile')
     parser.add_argument('-o', '--output', default=str(DEFAULT_DATA_DIR),
                         help='Output directory')
     parser.add_argument('-r', '--retention', type=int, default=DEFAULT_RETENTION_DAYS,
@@ -645,6 +694,7 @@ Examples:
         snaplen=args.snaplen,
         promisc=not args.no_promisc,
         buffer_profile=args.buffer,
+        cpu_profile=args.cpu_profile,
         retention_days=args.retention,
         daemon=args.daemon,
     )
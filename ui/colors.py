@@ -4,6 +4,8 @@ ANSI Color utilities và UI helpers
 
 import os
 import sys
+import signal
+import threading
 
 
 # ============================================================
@@ -140,60 +142,78 @@ def color(text: str, *codes) -> str:
     return f"{prefix}{text}{Colors.RESET}"
 
 
+# Prefix tính sẵn lúc import cho các helper hay dùng (không join/f-string mỗi lần gọi)
+_RESET = Colors.RESET
+_RED_PRE = Colors.RED
+_GREEN_PRE = Colors.GREEN
+_YELLOW_PRE = Colors.YELLOW
+_BLUE_PRE = Colors.BLUE
+_CYAN_PRE = Colors.CYAN
+_MAGENTA_PRE = Colors.MAGENTA
+_WHITE_PRE = Colors.WHITE
+_BOLD_PRE = Colors.BOLD
+_DIM_PRE = Colors.DIM
+_SUCCESS_PRE = Colors.GREEN + Colors.BOLD
+_ERROR_PRE = Colors.RED + Colors.BOLD
+_WARNING_PRE = Colors.YELLOW + Colors.BOLD
+_INFO_PRE = Colors.CYAN
+_HIGHLIGHT_PRE = Colors.BRIGHT_WHITE + Colors.BOLD
+
+
 def red(text: str) -> str:
-    return color(text, Colors.RED)
+    return _RED_PRE + text + _RESET if _color_enabled else text
 
 
 def green(text: str) -> str:
-    return color(text, Colors.GREEN)
+    return _GREEN_PRE + text + _RESET if _color_enabled else text
 
 
 def yellow(text: str) -> str:
-    return color(text, Colors.YELLOW)
+    return _YELLOW_PRE + text + _RESET if _color_enabled else text
 
 
 def blue(text: str) -> str:
-    return color(text, Colors.BLUE)
+    return _BLUE_PRE + text + _RESET if _color_enabled else text
 
 
 def cyan(text: str) -> str:
-    return color(text, Colors.CYAN)
+    return _CYAN_PRE + text + _RESET if _color_enabled else text
 
 
 def magenta(text: str) -> str:
-    return color(text, Colors.MAGENTA)
+    return _MAGENTA_PRE + text + _RESET if _color_enabled else text
 
 
 def white(text: str) -> str:
-    return color(text, Colors.WHITE)
+    return _WHITE_PRE + text + _RESET if _color_enabled else text
 
 
 def bold(text: str) -> str:
-    return color(text, Colors.BOLD)
+    return _BOLD_PRE + text + _RESET if _color_enabled else text
 
 
 def dim(text: str) -> str:
-    return color(text, Colors.DIM)
+    return _DIM_PRE + text + _RESET if _color_enabled else text
 
 
 def success(text: str) -> str:
-    return color(text, Colors.GREEN, Colors.BOLD)
+    return _SUCCESS_PRE + text + _RESET if _color_enabled else text
 
 
 def error(text: str) -> str:
-    return color(text, Colors.RED, Colors.BOLD)
+    return _ERROR_PRE + text + _RESET if _color_enabled else text
 
 
 def warning(text: str) -> str:
-    return color(text, Colors.YELLOW, Colors.BOLD)
+    return _WARNING_PRE + text + _RESET if _color_enabled else text
 
 
 def info(text: str) -> str:
-    return color(text, Colors.CYAN)
+    return _INFO_PRE + text + _RESET if _color_enabled else text
 
 
 def highlight(text: str) -> str:
-    return color(text, Colors.BRIGHT_WHITE, Colors.BOLD)
+    return _HIGHLIGHT_PRE + text + _RESET if _color_enabled else text
 
 
 # ============================================================
@@ -233,8 +253,8 @@ def clear_line():
         print(Screen.CLEAR_LINE, end='\r', flush=True)
 
 
-def get_terminal_size() -> tuple:
-    """Lấy kích thước terminal (columns, rows)"""
+def _query_terminal_size() -> tuple:
+    """Hỏi kernel kích thước terminal (ioctl TIOCGWINSZ)"""
     try:
         size = os.get_terminal_size()
         return (size.columns, size.lines)
@@ -242,6 +262,59 @@ def get_terminal_size() -> tuple:
         return (80, 24)  # Default
 
 
+_term_size = (80, 24)
+_winch_installed = False
+_winch_previous = None      # Handler SIGWINCH trước khi cài, để trả lại
+
+
+def _refresh_term_size(*_):
+    """Handler SIGWINCH: cập nhật cache khi terminal đổi kích thước"""
+    global _term_size
+    _term_size = _query_terminal_size()
+
+
+def install_resize_handler() -> bool:
+    """
+    Cài handler SIGWINCH để cache kích thước terminal (UI gọi khi bắt đầu)
+    Chỉ có trên POSIX và chỉ cài được từ main thread; False nếu không cài
+    """
+    global _term_size, _winch_installed, _winch_previous
+    if _winch_installed:
+        return True
+    if not hasattr(signal, 'SIGWINCH'):
+        return False
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    try:
+        _winch_previous = signal.signal(signal.SIGWINCH, _refresh_term_size)
+    except (ValueError, OSError):
+        return False
+    _term_size = _query_terminal_size()
+    _winch_installed = True
+    return True
+
+
+def restore_resize_handler():
+    """Trả lại handler SIGWINCH cũ (từ main thread; gọi lại nhiều lần vẫn an toàn)"""
+    global _winch_installed, _winch_previous
+    if not _winch_installed or threading.current_thread() is not threading.main_thread():
+        return
+    try:
+        signal.signal(signal.SIGWINCH, _winch_previous if _winch_previous is not None else signal.SIG_DFL)
+    except (ValueError, OSError):
+        pass
+    _winch_installed = False
+    _winch_previous = None
+
+
+def get_terminal_size() -> tuple:
+    """Lấy kích thước terminal (columns, rows), cache khi UI đã cài handler SIGWINCH"""
+    if _winch_installed:
+        return _term_size
+    # Chưa cài handler: hỏi trực tiếp mỗi lần
+    return _query_terminal_size()
+
+
 # ============================================================
 # UI Components
 # ============================================================
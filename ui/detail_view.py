@@ -17,24 +17,28 @@ from core.decoder import decode_packet, DecodedPacket, PacketInfo
 from core.pcap_writer import PcapWriter
 
 
+# Bảng 256 byte: ký tự in được giữ nguyên, còn lại thành '.'
+_ASCII_TABLE = bytearray(b'.' * 256)
+_ASCII_TABLE[32:127] = bytes(range(32, 127))
+_ASCII_TABLE = bytes(_ASCII_TABLE)
+
+
 def hexdump(data: bytes, bytes_per_line: int = 16) -> str:
     """
     Tạo hexdump string từ bytes
     Format: offset  hex bytes  |  ASCII
     """
+    data = bytes(data)
     lines = []
     for i in range(0, len(data), bytes_per_line):
         chunk = data[i:i + bytes_per_line]
         
-        # Hex phần
-        hex_part = ' '.join(f'{b:02x}' for b in chunk)
+        # Hex phần (bytes.hex có separator, chạy trong C)
+        hex_part = chunk.hex(' ')
         hex_part = hex_part.ljust(bytes_per_line * 3 - 1)
         
         # ASCII phần  
-        ascii_part = ''.join(
-            chr(b) if 32 <= b < 127 else '.'
-            for b in chunk
-        )
+        ascii_part = chunk.translate(_ASCII_TABLE).decode('ascii')
         
         lines.append(f'{i:08x}  {hex_part}  |{ascii_part}|')
     
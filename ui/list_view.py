@@ -12,7 +12,7 @@ import termios
 import tty
 import gc
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable
 from collections import deque, OrderedDict
 
 import os
@@ -22,10 +22,15 @@ from ui.colors import (
     clear_screen, print_header, print_divider,
     bold, cyan, green, yellow, red, dim, white, magenta,
     get_terminal_size, hide_cursor, show_cursor, clear_line,
+    install_resize_handler, restore_resize_handler,
     format_bytes, format_number, format_rate, format_duration,
     Colors, color
 )
 from core.decoder import decode_packet, DecodedPacket, PacketInfo
+from core.spsc import SPSCRing
+
+# Gói chưa decode: chỉ decode khi dòng thực sự được vẽ
+_PENDING = object()
 
 
 class LimitedDict:
@@ -59,6 +64,16 @@ class LimitedDict:
         with self._lock:
             return self._data.get(key, default)
     
+    def update_many(self, items):
+        """Thêm nhiều (key, value) với một lần lấy lock"""
+        with self._lock:
+            data = self._data
+            for key, value in items:
+                data[key] = value
+                data.move_to_end(key)
+            while len(data) > self.maxsize:
+                data.popitem(last=False)
+    
     def clear(self):
         with self._lock:
             self._data.clear()
@@ -100,12 +115,13 @@ class PacketListView:
     
     def __init__(
         self,
-        packet_queue: queue.Queue,
+        packet_queue: SPSCRing,
         on_quit: Callable,
         stats_callback: Callable[[], Dict[str, Any]],
         file_info_callback: Callable[[], Dict[str, Any]],
         on_pause: Optional[Callable[[bool], None]] = None,  # Callback khi pause/resume
         on_save_exit: Optional[Callable[[], None]] = None,  # Callback lưu file và thoát
+        on_sample_rate: Optional[Callable[[], int]] = None,  # Callback tăng tỉ lệ lấy mẫu
         cache_size: int = 5000,  # Giảm xuống để tiết kiệm RAM
     ):
         self.packet_queue = packet_queue
@@ -114,6 +130,7 @@ class PacketListView:
         self.file_info_callback = file_info_callback
         self.on_pause = on_pause  # Callback để pause capture engine
         self.on_save_exit = on_save_exit  # Callback lưu file và thoát
+        self.on_sample_rate = on_sample_rate  # Callback đổi tỉ lệ lấy mẫu, trả về tỉ lệ mới
         
         # Packet cache - giới hạn cả deque và map
         self.cache_size = cache_size
@@ -123,6 +140,7 @@ class PacketListView:
         # Display state
         self.paused = False
         self.running = False
+        self._drain_requested = False  # Input thread yêu cầu display thread xóa queue
         self.start_time = time.time()
         
         # Threading
@@ -251,6 +269,10 @@ class PacketListView:
                 f"Cache: {len(self.packets)}/{self.cache_size}",
             ]
             
+            sample_rate = stats.get('sample_rate', 1)
+            if sample_rate > 1:
+                parts.append(f"Mẫu: 1/{sample_rate}")
+            
             return dim(' | '.join(parts))
         except Exception:
             return dim("Stats: N/A")
@@ -272,7 +294,7 @@ class PacketListView:
         except Exception:
             return dim("File: N/A")
     
-    def _draw_screen(self, new_packets: List[tuple]):
+    def _draw_screen(self):
         """Vẽ màn hình"""
         try:
             term_width, term_height = get_terminal_size()
@@ -293,7 +315,15 @@ class PacketListView:
                 # Lấy packets mới nhất để hiển thị
                 display_packets = list(self.packets)[-available_lines:]
             
-            for pkt_info, decoded in display_packets:
+            for entry in display_packets:
+                pkt_info, decoded = entry
+                if decoded is _PENDING:
+                    # Decode lần đầu được vẽ, giữ lại cho các khung sau
+                    try:
+                        decoded = decode_packet(pkt_info.data)
+                    except Exception:
+                        decoded = None
+                    entry[1] = decoded
                 row = self._format_packet_row(pkt_info, decoded)
                 lines.append(row)
             
@@ -306,7 +336,7 @@ class PacketListView:
             lines.append(self._draw_stats_bar())
             
             # Control hints
-            lines.append(cyan("[Space] Dừng/Chạy, [S] Lưu & Thoát, [Q] Thoát"))
+            lines.append(cyan("[Space] Dừng/Chạy, [R] Lấy mẫu, [S] Lưu & Thoát, [Q] Thoát"))
             
             # Clear and draw
             sys.stdout.write('\033[H')  # Home
@@ -323,52 +353,49 @@ class PacketListView:
         clear_screen()
         
         last_draw = 0
-        new_packets = []
-        batch_size = 100  # Xử lý batch để giảm overhead
+        batch_size = 1024  # Số gói tối đa mỗi vòng (theo batch từ capture)
         
         while self.running:
             try:
-                # Khi PAUSED: drain TOÀN BỘ queue (discard tất cả)
+                # Khi PAUSED (hoặc vừa RESUME): drain TOÀN BỘ queue (discard tất cả)
+                if self._drain_requested:
+                    self._drain_requested = False
+                    self.packet_queue.clear()
+                
                 if self.paused:
-                    discarded = 0
-                    try:
-                        while True:
-                            self.packet_queue.get_nowait()
-                            discarded += 1
-                    except queue.Empty:
-                        pass
+                    self.packet_queue.clear()
                     # Sleep ngắn khi paused
                     time.sleep(0.05)
                     continue
                 
-                # Khi RUNNING: đọc batch và xử lý
+                # Khi RUNNING: queue chứa PacketBatch, xử lý theo cả batch.
+                # Chỉ phần đuôi lọt vào cache mới tạo PacketInfo; decode để
+                # đến lúc vẽ (mỗi khung chỉ vài chục dòng)
                 packets_read = 0
+                cache_size = self.cache_size
                 while packets_read < batch_size:
                     try:
-                        pkt_info = self.packet_queue.get_nowait()
-                        
-                        # Decode với error handling
-                        try:
-                            decoded = decode_packet(pkt_info.data)
-                        except Exception:
-                            decoded = None
-                        
-                        with self._lock:
-                            self.packets.append((pkt_info, decoded))
-                            self.packet_map[pkt_info.stt] = pkt_info
-                        
-                        new_packets.append((pkt_info, decoded))
-                        packets_read += 1
-                        self._packets_processed += 1
-                        
+                        batch = self.packet_queue.get_nowait()
                     except queue.Empty:
                         break
+                    
+                    count = batch.count
+                    entries = [
+                        [pkt_info, _PENDING]
+                        for pkt_info in batch.iter_rows(range(max(0, count - cache_size), count))
+                    ]
+                    
+                    with self._lock:
+                        self.packets.extend(entries)
+                    self.packet_map.update_many((entry[0].stt, entry[0]) for entry in entries)
+                    
+                    packets_read += count
+                    self._packets_processed += count
                 
                 # Vẽ lại màn hình (max 10 FPS)
                 now = time.time()
                 if now - last_draw >= 0.1:
-                    self._draw_screen(new_packets)
-                    new_packets.clear()
+                    self._draw_screen()
                     last_draw = now
                 
                 # Periodic garbage collection (mỗi 30 giây)
@@ -404,14 +431,15 @@ class PacketListView:
                                 pass
                         
                         # Khi RESUME: clear queue để không hiển thị packets cũ tích lũy
+                        # Queue là SPSC - chỉ display thread được đọc, nên chỉ đặt cờ
                         if not self.paused:
-                            # Clear queue - loại bỏ packets cũ tích lũy trong kernel buffer
-                            cleared = 0
+                            self._drain_requested = True
+                    elif ch.lower() == 'r':
+                        # Tăng tỉ lệ lấy mẫu khi UI không theo kịp (file PCAP vẫn đủ gói)
+                        if self.on_sample_rate:
                             try:
-                                while True:
-                                    self.packet_queue.get_nowait()
-                                    cleared += 1
-                            except queue.Empty:
+                                self.on_sample_rate()
+                            except Exception:
                                 pass
                     elif ch.lower() == 's':
                         # Save và Exit - lưu file hiện tại và thoát
@@ -452,6 +480,8 @@ class PacketListView:
         self._terminal_restored = False
         
         self._setup_terminal()
+        # Cache kích thước terminal cho mỗi frame (start() chạy ở main thread)
+        install_resize_handler()
         
         self._display_thread = threading.Thread(
             target=self._display_loop,
@@ -478,6 +508,8 @@ class PacketListView:
         if not self._terminal_restored:
             self._restore_terminal()
             show_cursor()
+        # Chỉ có tác dụng ở main thread; stop() từ input thread thì wait() trả lại
+        restore_resize_handler()
         
         # Clear memory
         self.packets.clear()
@@ -488,3 +520,4 @@ class PacketListView:
         """Chờ cho đến khi dừng"""
         while self.running:
             time.sleep(0.1)
+        restore_resize_handler()